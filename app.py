@@ -1,49 +1,353 @@
 import os
+import sys
+import atexit
+import functools
+import signal
+import tempfile
+import threading
+import time
+_BOOT_STARTED = time.monotonic()        # startup time is measured from the first line of app.py
+import click
 import pymysql
-from flask import Flask, render_template_string, request, jsonify
+from datetime import date, datetime
+from flask import Flask, Response, g, has_request_context, render_template_string, request, jsonify, stream_with_context
+from werkzeug.http import dump_cookie
+from werkzeug.middleware.proxy_fix import ProxyFix
+from db_pool import ConnectionPool
+from replicas import Replica, ReplicaRouter
+from feedback_writer import FeedbackWriter, QueueFull
+from cache import TTLCache
+from response_cache import LocalBackend, MmapBackend, RedisBackend, ResponseCache
+from json_provider import FastJSONProvider
+from static_page import PrecompressedPage
+from search import MusicianIndex
+import similar
+import catalog
+import columnar
+from metrics import Registry
+from health import DBHealthMonitor
+import export
+import migrations
+import feedback_search
+import feedback_stats
+import partitions
+from ratelimit import DuplicateFilter, MemoryStorage, RedisStorage, TokenBucketLimiter, parse_rate, retry_after_header
 
 app = Flask(__name__)
 
+# ─────────────────────────────────────────────────────────────────
+# METRICS  (Prometheus text format at /metrics)
+# Under gunicorn every worker publishes to METRICS_DIR (gunicorn.conf.py),
+# so a scrape of any worker reports the whole server.
+# ─────────────────────────────────────────────────────────────────
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+metrics = Registry()
+REQUEST_SECONDS = metrics.histogram(
+    "http_request_duration_seconds", "Request latency by route.", ("route", "method", "status"))
+REQUEST_ERRORS = metrics.counter(
+    "http_request_errors_total", "Requests that ended in a 5xx, by route.", ("route", "method"))
+DB_CONNECT_SECONDS = metrics.histogram(
+    "db_connect_seconds", "Time to open a new RDS connection.")
+DB_QUERY_SECONDS = metrics.histogram(
+    "db_query_seconds", "RDS statement execution time by statement type.", ("statement",))
+JSON_SECONDS = metrics.histogram(
+    "json_serialize_seconds", "Time spent encoding JSON responses.")
+TEMPLATE_SECONDS = metrics.histogram(
+    "template_render_seconds", "Time spent rendering HTML templates.", ("template",))
+
+
+class TimedDictCursor(pymysql.cursors.DictCursor):
+    """DictCursor that records each statement's execution time."""
+
+    def execute(self, query, args=None):
+        start = time.perf_counter()
+        try:
+            return super().execute(query, args)
+        finally:
+            DB_QUERY_SECONDS.observe(time.perf_counter() - start, query.lstrip()[:6].lower())
+
+
+class TimedJSONProvider(FastJSONProvider):
+    def encode(self, obj, pretty=False):
+        start = time.perf_counter()
+        try:
+            return super().encode(obj, pretty)
+        finally:
+            JSON_SECONDS.observe(time.perf_counter() - start)
+
+
+# orjson when installed, stdlib json otherwise; datetimes encoded natively
+app.json = TimedJSONProvider(app) if METRICS_ENABLED else FastJSONProvider(app)
+
+if METRICS_ENABLED:
+
+    @app.before_request
+    def _start_timer():
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop("request_start", None)
+        if start is not None:
+            route = request.url_rule.rule if request.url_rule else "<unmatched>"
+            REQUEST_SECONDS.observe(time.perf_counter() - start, route, request.method, str(response.status_code))
+            if response.status_code >= 500:
+                REQUEST_ERRORS.inc(route, request.method)
+        return response
+
 # ─────────────────────────────────────────────────────────────────
 # DATABASE CONNECTION
 # Values come from ECS Task Definition → Environment Variables
 # NEVER hardcode passwords! Use env variables ✅ (DevOps best practice)
 # ─────────────────────────────────────────────────────────────────
-def get_db_connection():
-    return pymysql.connect(
-        host=os.environ["DB_HOST"],        # RDS endpoint
+def db_address(host=None):
+    """(host, port) from ``host`` or DB_HOST — both accept ``host[:port]``."""
+    host, _, port = (host or os.environ["DB_HOST"]).partition(":")
+    return host, int(port or 3306)
+
+
+def _connect(host=None):
+    host, port = db_address(host)
+    start = time.perf_counter()
+    conn = pymysql.connect(
+        host=host,                         # RDS endpoint (or a read replica)
+        port=port,
         user=os.environ["DB_USER"],        # e.g. admin
         password=os.environ["DB_PASSWORD"],# from Secrets Manager or ECS env
         database=os.environ["DB_NAME"],    # e.g. musicdb
-        cursorclass=pymysql.cursors.DictCursor,
-        connect_timeout=5
+        cursorclass=TimedDictCursor if METRICS_ENABLED else pymysql.cursors.DictCursor,
+        connect_timeout=5,
+        autocommit=True,   # pooled conns must not carry a stale read snapshot between requests
+    )
+    DB_CONNECT_SECONDS.observe(time.perf_counter() - start)
+    return conn
+
+def _pool(connect):
+    return ConnectionPool(
+        connect,
+        max_size=int(os.environ.get("DB_POOL_SIZE", "10")),
+        max_idle=int(os.environ.get("DB_POOL_MAX_IDLE", "5")),
+        timeout=float(os.environ.get("DB_POOL_TIMEOUT", "5")),
+        recycle=int(os.environ.get("DB_POOL_RECYCLE", "3600")),
+    )
+
+# Connections are borrowed from a bounded pool and returned when the
+# request is done — no fresh RDS handshake per request.
+db_pool = _pool(_connect)
+
+# Optional read replicas: DB_READ_HOSTS=replica-1.xxx.rds.amazonaws.com,replica-2...
+DB_READ_HOSTS = [h.strip() for h in os.environ.get("DB_READ_HOSTS", "").split(",") if h.strip()]
+read_router = None
+if DB_READ_HOSTS:
+    read_router = ReplicaRouter(
+        [Replica(host, _pool(functools.partial(_connect, host))) for host in DB_READ_HOSTS],
+        strategy=os.environ.get("DB_READ_STRATEGY", "round_robin"),
+        cooldown=float(os.environ.get("DB_REPLICA_COOLDOWN", "30")),
+        acquire_timeout=float(os.environ.get("DB_READ_ACQUIRE_TIMEOUT", "0")),
+    )
+
+# After a write, this client's reads stay on the primary for a few
+# seconds so replica lag never hides what they just submitted.
+READ_PRIMARY_COOKIE = "read_primary_until"
+READ_YOUR_WRITES_WINDOW = float(os.environ.get("READ_YOUR_WRITES_WINDOW", "5"))
+
+def read_from_primary():
+    """True when this request must see its own writes (cookie or `X-Read-Primary: 1`)."""
+    if not has_request_context():
+        return False
+    if request.headers.get("X-Read-Primary") == "1":
+        return True
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+def read_primary_cookie():
+    """Set-Cookie value that pins the client's reads to the primary for the RYW window."""
+    return dump_cookie(READ_PRIMARY_COOKIE, f"{time.time() + READ_YOUR_WRITES_WINDOW:.3f}",
+                       max_age=int(READ_YOUR_WRITES_WINDOW) + 1, httponly=True, samesite="Lax")
+
+def get_db_connection(readonly=False):
+    """Use as `with get_db_connection() as conn:` — returns conn to the pool.
+
+    `readonly=True` reads may be served by a replica; they fall back to the
+    primary when no replica is reachable or the client must read its writes.
+    """
+    if readonly and read_router is not None and not read_from_primary():
+        leased = read_router.checkout()
+        if leased is not None:
+            pool, conn = leased
+            return pool.lease(conn)
+    return db_pool.connection()
+
+@app.after_request
+def _pin_reads_after_write(response):
+    if g.pop("db_write", False) and read_router is not None:
+        response.headers.add("Set-Cookie", read_primary_cookie())
+    return response
+
+# ─────────────────────────────────────────────────────────────────
+# RESPONSE CACHE
+# Encoded bodies for /feedbacks and /api/musicians. RESPONSE_CACHE_BACKEND
+# picks where they live: `local` (per process), `mmap` (shared by the
+# workers on this host) or `redis` (shared by every task). A feedback
+# insert invalidates the /feedbacks pages everywhere the backend reaches.
+# ─────────────────────────────────────────────────────────────────
+RESPONSE_CACHE_BACKEND = os.environ.get("RESPONSE_CACHE_BACKEND", "local")
+if RESPONSE_CACHE_BACKEND == "mmap":
+    _cache_backend = MmapBackend(
+        os.environ.get("RESPONSE_CACHE_PATH", "/dev/shm/musicapp-response-cache"),
+        slots=int(os.environ.get("RESPONSE_CACHE_SLOTS", "1024")),
+        slot_bytes=int(os.environ.get("RESPONSE_CACHE_SLOT_BYTES", str(128 * 1024))),
     )
+elif RESPONSE_CACHE_BACKEND == "redis":
+    import redis                                                   # optional dependency
+    _cache_backend = RedisBackend(redis.Redis.from_url(os.environ["RESPONSE_CACHE_REDIS_URL"], socket_timeout=0.2))
+else:
+    _cache_backend = LocalBackend(max_entries=int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "2048")))
+response_cache = ResponseCache(_cache_backend)
+
+FEEDBACK_CACHE_TTL = float(os.environ.get("FEEDBACK_CACHE_TTL", "5"))
+
+def invalidate_feedback_cache(*_):
+    response_cache.invalidate("feedbacks")
+
+# Moderator search results — TTL only: clearing on every insert would
+# empty it constantly under write-behind, and a few seconds stale is fine.
+feedback_search_cache = TTLCache(ttl=float(os.environ.get("FEEDBACK_SEARCH_CACHE_TTL", "30")), max_entries=512)
+
+# ─────────────────────────────────────────────────────────────────
+# WRITE-BEHIND FEEDBACK (optional)
+# FEEDBACK_WRITE_BEHIND=1 → POST /feedback queues the row and returns
+# 202; a background thread batch-inserts into RDS.
+# ─────────────────────────────────────────────────────────────────
+FEEDBACK_STATS_ENABLED = os.environ.get("FEEDBACK_STATS_ENABLED", "1") == "1"   # rollups for /feedbacks/stats
+
+def _release_failed_batch(rows):
+    # Never stored — let the client's retry through the dedupe window
+    for row in rows:
+        release_feedback(row)
+
+
+feedback_writer = None
+if os.environ.get("FEEDBACK_WRITE_BEHIND", "0") == "1":
+    feedback_writer = FeedbackWriter(
+        get_db_connection,
+        max_queue=int(os.environ.get("FEEDBACK_QUEUE_SIZE", "10000")),
+        batch_size=int(os.environ.get("FEEDBACK_BATCH_SIZE", "200")),
+        flush_interval=float(os.environ.get("FEEDBACK_FLUSH_INTERVAL", "0.5")),
+        on_flush=invalidate_feedback_cache,
+        before_commit=feedback_stats.record if FEEDBACK_STATS_ENABLED else None,
+        on_error=_release_failed_batch,
+    )
+    atexit.register(feedback_writer.shutdown)   # drain the queue on graceful shutdown
+
+metrics.gauge("db_pool_connections", "Pooled RDS connections by state.",
+              lambda: {(k,): v for k, v in db_pool.stats().items() if k in ("size", "idle", "in_use")},
+              ("state",))
+metrics.gauge("db_pool_events", "Pool lifetime event counts.",
+              lambda: {(k,): v for k, v in db_pool.stats().items()
+                       if k in ("created", "reused", "discarded", "timeouts", "waits")},
+              ("event",))
+metrics.gauge("response_cache_lookups", "Response cache lookups in this process by result.",
+              lambda: {(k,): v for k, v in response_cache.stats.items()}, ("result",))
+if read_router is not None:
+    metrics.gauge("db_replica_checkouts", "Reads served per read replica.",
+                  lambda: {(r.host,): r.checkouts for r in read_router.replicas}, ("host",))
+    metrics.gauge("db_replica_healthy", "1 if the replica is in rotation.",
+                  lambda: {(r["host"],): int(r["healthy"]) for r in read_router.stats()["replicas"]}, ("host",))
+    metrics.gauge("db_replica_fallbacks", "Reads sent to the primary because no replica was reachable.",
+                  lambda: read_router.fallbacks)
+if feedback_writer is not None:
+    metrics.gauge("feedback_queue_rows", "Write-behind queue state.",
+                  lambda: {(k,): v for k, v in feedback_writer.stats().items()}, ("state",))
+
+FEEDBACK_DURABLE_TIMEOUT = float(os.environ.get("FEEDBACK_DURABLE_TIMEOUT", "10"))
+
+# ─────────────────────────────────────────────────────────────────
+# FEEDBACK ABUSE PROTECTION
+# Token buckets per client IP and per email, plus a content-hash
+# dedupe window — rejected before anything touches RDS.
+# Behind the ALB set TRUSTED_PROXY_COUNT=1 so the client IP comes
+# from X-Forwarded-For instead of the load balancer's address; 0
+# means clients connect directly. Unset, every visitor could share
+# the proxy's address — one bucket for everyone — so the per-IP
+# limit stays off and only the per-email one applies.
+# ─────────────────────────────────────────────────────────────────
+_trusted_proxies = os.environ.get("TRUSTED_PROXY_COUNT", "").strip()
+TRUSTED_PROXY_COUNT = int(_trusted_proxies) if _trusted_proxies else None
+if TRUSTED_PROXY_COUNT:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXY_COUNT)
+
+RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "1") == "1"
+RATE_LIMIT_REDIS_URL = os.environ.get("RATE_LIMIT_REDIS_URL")   # shared buckets across workers/tasks
+if RATE_LIMIT_REDIS_URL:
+    import redis                                                   # optional dependency
+    rate_limit_storage = RedisStorage(redis.Redis.from_url(RATE_LIMIT_REDIS_URL, socket_timeout=0.2))
+else:
+    rate_limit_storage = MemoryStorage()
+ip_limiter = TokenBucketLimiter(rate_limit_storage, *parse_rate(os.environ.get("RATE_LIMIT_PER_IP", "10/60")))
+email_limiter = TokenBucketLimiter(rate_limit_storage, *parse_rate(os.environ.get("RATE_LIMIT_PER_EMAIL", "5/300")))
+if RATE_LIMIT_ENABLED and TRUSTED_PROXY_COUNT is None:
+    print("⚠️  TRUSTED_PROXY_COUNT not set — per-IP rate limit off "
+          "(set 1 behind the ALB, 0 when clients connect directly)")
+
+FEEDBACK_DEDUPE_WINDOW = float(os.environ.get("FEEDBACK_DEDUPE_WINDOW", "600"))
+feedback_dedupe = None
+if FEEDBACK_DEDUPE_WINDOW > 0:
+    feedback_dedupe = DuplicateFilter(
+        window=FEEDBACK_DEDUPE_WINDOW,
+        max_entries=int(os.environ.get("FEEDBACK_DEDUPE_MAX_ENTRIES", "10000")),
+    )
+
+FEEDBACK_REJECTED = metrics.counter(
+    "feedback_rejected_total", "POST /feedback submissions rejected before the database, by reason.",
+    ("reason",))
 
 # ─────────────────────────────────────────────────────────────────
-# AUTO-CREATE TABLE ON STARTUP
-# Runs once when the container starts
+# SCHEMA SETUP (deploy step)
+# `flask --app app migrate` applies versioned migrations once per
+# deploy — serving processes no longer block on RDS at boot.
 # ─────────────────────────────────────────────────────────────────
 def init_db():
+    """Apply pending migrations and seed the catalog; logs instead of raising."""
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cursor:
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS feedback (
-                    id         INT AUTO_INCREMENT PRIMARY KEY,
-                    name       VARCHAR(100)  NOT NULL,
-                    email      VARCHAR(150)  NOT NULL,
-                    message    TEXT          NOT NULL,
-                    created_at TIMESTAMP     DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-        conn.commit()
-        conn.close()
-        print("✅ Database table ready.")
+        with get_db_connection() as conn:
+            applied = migrations.migrate(conn, progress=_log_migration)
+            seeded = catalog.seed_if_empty(conn, MUSICIANS)
+        if seeded:
+            print(f"🎵 Seeded musicians table with {seeded} artists.")
+        print(f"✅ Database schema up to date ({len(applied)} migration(s) applied).")
     except Exception as e:
         print(f"⚠️  DB init warning: {e}")
 
+def _log_migration(m):
+    print(f"🗄️  Applied migration {m.version}: {m.name}")
+
+
+@app.cli.command("migrate")
+@click.option("--status", "show_status", is_flag=True, help="List applied and pending migrations only.")
+@click.option("--lock-timeout", default=60, show_default=True, help="Seconds to wait for a concurrent migrator.")
+def migrate_command(show_status, lock_timeout):
+    """Apply pending schema migrations and seed the catalog (run once per deploy)."""
+    with get_db_connection() as conn:
+        if show_status:
+            for m, applied in migrations.status(conn):
+                click.echo(f"{'✅' if applied else '⏳'} {m.version:>4}  {m.name}")
+            return
+        try:
+            applied = migrations.migrate(conn, lock_timeout=lock_timeout, progress=_log_migration)
+        except migrations.MigrationLockTimeout as e:
+            raise click.ClickException(str(e))
+        seeded = catalog.seed_if_empty(conn, MUSICIANS)
+    if seeded:
+        click.echo(f"🎵 Seeded musicians table with {seeded} artists.")
+    click.echo(f"✅ Database schema up to date ({len(applied)} migration(s) applied).")
+
 # ─────────────────────────────────────────────────────────────────
 # MUSICIAN DATA
+# Seed rows for the `musicians` table (and the fallback when RDS is
+# unreachable). Add artists with `flask --app app import-musicians`.
 # ─────────────────────────────────────────────────────────────────
 MUSICIANS = [
     {
@@ -132,6 +436,47 @@ MUSICIANS = [
     },
 ]
 
+# Handlers read the catalog through this cache, never straight from RDS.
+# Loaded catalogs are written once to a columnar file every worker maps
+# (CATALOG_COLUMNAR_PATH, "" = plain per-process lists of dicts).
+CATALOG_COLUMNAR_PATH = os.environ.get(
+    "CATALOG_COLUMNAR_PATH",
+    os.path.join(tempfile.gettempdir(), f"musicapp-catalog-{os.environ.get('DB_NAME', 'musicdb')}.bin"),
+)
+catalog_cache = catalog.CatalogCache(
+    lambda: get_db_connection(readonly=True), MUSICIANS, ttl=float(os.environ.get("CATALOG_CACHE_TTL", "300")),
+    columnar_path=CATALOG_COLUMNAR_PATH or None,
+)
+
+@app.cli.command("import-musicians")
+@click.argument("path")
+@click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]), help="Defaults to the file extension.")
+@click.option("--batch-size", default=1000, show_default=True)
+def import_musicians_command(path, fmt, batch_size):
+    """Bulk-load musicians from CSV or JSON Lines (upserts by name)."""
+    with get_db_connection() as conn:
+        total = catalog.import_musicians(
+            conn, catalog.iter_rows(path, fmt), batch_size=batch_size,
+            progress=lambda n: click.echo(f"  … {n} rows"),
+        )
+    click.echo(f"✅ Imported {total} musicians.")
+
+
+@app.cli.command("build-catalog-file")
+@click.option("--output", default=CATALOG_COLUMNAR_PATH, show_default=True, help="Columnar file to write.")
+def build_catalog_file_command(output):
+    """Prebuild the shared columnar catalog so workers start by mapping it."""
+    if not output:
+        raise click.ClickException("Set CATALOG_COLUMNAR_PATH or pass --output.")
+    with get_db_connection(readonly=True) as conn:
+        version = catalog.catalog_version(conn)
+        rows = catalog.load_catalog(conn)
+    columnar.write(output, rows, version, catalog.MUSICIAN_FIELDS)
+    click.echo(f"✅ Wrote {len(rows)} musicians ({os.path.getsize(output)} bytes) to {output}.")
+    if SIMILAR_TABLE_PATH and similar.available():
+        similar.shared(SIMILAR_TABLE_PATH, rows, k=SIMILAR_K, version=version)
+        click.echo(f"✅ Wrote the similar-musicians table to {SIMILAR_TABLE_PATH}.")
+
 # ─────────────────────────────────────────────────────────────────
 # HTML TEMPLATE
 # ─────────────────────────────────────────────────────────────────
@@ -237,6 +582,8 @@ HTML_TEMPLATE = """
     .fact-val { font-size: 0.88rem; font-weight: 700; }
     .chips { display: flex; flex-wrap: wrap; gap: 0.45rem; margin-top: 0.55rem; margin-bottom: 1.5rem; }
     .chip { background: var(--surface); border: 1px solid var(--border); border-radius: 50px; padding: 0.28rem 0.8rem; font-size: 0.76rem; color: var(--muted); }
+    button.chip { cursor: pointer; font-family: 'Lato', sans-serif; }
+    button.chip:hover { border-color: var(--accent); color: var(--accent); }
     .modal-close-row { display: flex; justify-content: flex-end; padding: 0 1.8rem 1.5rem; }
     .close-btn { background: var(--surface); border: 1px solid var(--border); color: var(--muted); padding: 0.55rem 1.3rem; border-radius: 50px; cursor: pointer; font-family: 'Lato', sans-serif; font-size: 0.8rem; letter-spacing: 1px; transition: all 0.2s; }
     .close-btn:hover { border-color: var(--accent); color: var(--accent); }
@@ -288,6 +635,7 @@ HTML_TEMPLATE = """
     .toast.error   { background: #1f0a0a; border-color: var(--red);   color: var(--red); }
     .toast.show { transform: translateY(0); opacity: 1; }
 
+    .grid-sentinel { height: 1px; }
     .empty { grid-column: 1/-1; text-align: center; padding: 4rem 2rem; color: var(--muted); }
     .empty-icon { font-size: 3rem; margin-bottom: 1rem; display: block; }
     .empty h3 { font-family: 'Bebas Neue', sans-serif; font-size: 1.8rem; letter-spacing: 2px; margin-bottom: 0.5rem; color: var(--text); }
@@ -322,8 +670,9 @@ HTML_TEMPLATE = """
   </div>
   <div class="filters" id="filters"></div>
 </div>
-<div class="stats-bar"><strong id="countDisplay">{{ musicians|length }}</strong> musicians found</div>
+<div class="stats-bar"><strong id="countDisplay">{{ initial.total }}</strong> musicians found</div>
 <div class="grid" id="grid"></div>
+<div class="grid-sentinel" id="gridSentinel"></div>
 
 <div class="section-divider"></div>
 
@@ -373,6 +722,10 @@ HTML_TEMPLATE = """
       <div class="facts-grid" id="mFacts"></div>
       <div class="modal-label">Known For</div>
       <div class="chips" id="mChips"></div>
+      <div id="mSimilarSection" hidden>
+        <div class="modal-label">Similar Artists</div>
+        <div class="chips" id="mSimilar"></div>
+      </div>
     </div>
     <div class="modal-close-row">
       <button class="close-btn" id="closeBtn">✕ Close</button>
@@ -387,59 +740,109 @@ HTML_TEMPLATE = """
 </footer>
 
 <script>
-const musicians = {{ musicians | tojson }};
-const genres = ['All', ...new Set(musicians.map(m => m.genre))];
-let activeGenre = 'All', searchVal = '';
+// Only the first page ships with the HTML; the rest is fetched from /api/musicians
+const initial = {{ initial | tojson }};
+const PAGE_SIZE = {{ page_size }};
+const byId = new Map();
+let items = [], genreList = [], total = 0, activeGenre = 'All', searchVal = '', loading = false, inflight = null;
 
-function renderFilters() {
-  document.getElementById('filters').innerHTML = genres.map(g =>
-    `<button class="filter-btn ${g===activeGenre?'active':''}" onclick="setGenre('${g}')">${g}</button>`
+function renderFilters(facets) {
+  genreList = ['All', ...facets.genre.map(f => f.value)];
+  if (!genreList.includes(activeGenre)) genreList.push(activeGenre);
+  document.getElementById('filters').innerHTML = genreList.map((g,i) =>
+    `<button class="filter-btn ${g===activeGenre?'active':''}" onclick="setGenre(genreList[${i}])">${esc(g)}</button>`
   ).join('');
 }
-function setGenre(g) { activeGenre=g; renderFilters(); renderGrid(); }
-
-function renderGrid() {
-  const q = searchVal.toLowerCase();
-  const filtered = musicians.filter(m => {
-    const mg = activeGenre==='All' || m.genre===activeGenre;
-    const ms = !q || m.name.toLowerCase().includes(q) || m.genre.toLowerCase().includes(q) || m.bio.toLowerCase().includes(q);
-    return mg && ms;
-  });
-  document.getElementById('countDisplay').textContent = filtered.length;
-  const grid = document.getElementById('grid');
-  if (!filtered.length) {
-    grid.innerHTML = `<div class="empty"><span class="empty-icon">🎵</span><h3>No Musicians Found</h3><p>Try a different search or filter.</p></div>`;
-    return;
-  }
-  grid.innerHTML = filtered.map((m,i) => `
-    <div class="card" style="animation-delay:${i*0.045}s" onclick="openModal(${musicians.indexOf(m)})">
+function setGenre(g) { activeGenre=g; loadPage(true); }
+
+function cardHtml(m, i) {
+  return `
+    <div class="card" style="animation-delay:${Math.min(i,12)*0.045}s" onclick="openModal(${m.id})">
       <div class="card-top">
-        <div class="avatar">${m.emoji}</div>
-        <div><div class="card-name">${m.name}</div><span class="card-genre">${m.genre}</span></div>
+        <div class="avatar">${esc(m.emoji)}</div>
+        <div><div class="card-name">${esc(m.name)}</div><span class="card-genre">${esc(m.genre)}</span></div>
       </div>
-      <div class="card-bio">${m.bio.substring(0,115).trim()}…</div>
+      <div class="card-bio">${esc(m.bio.substring(0,115).trim())}…</div>
       <div class="card-footer">
-        <span>🎵 ${m.instrument.split(',')[0].trim()}</span>
-        <span>📅 ${m.era}</span>
+        <span>🎵 ${esc(m.instrument.split(',')[0].trim())}</span>
+        <span>📅 ${esc(m.era)}</span>
       </div>
-    </div>
-  `).join('');
+    </div>`;
+}
+
+// Append a page of cards — existing cards are never re-rendered
+function showPage(data, reset) {
+  const grid = document.getElementById('grid');
+  if (reset) { items = []; byId.clear(); grid.innerHTML = ''; }
+  total = data.total;
+  document.getElementById('countDisplay').textContent = total;
+  data.musicians.forEach(m => byId.set(m.id, m));
+  items = items.concat(data.musicians);
+  if (!items.length) {
+    grid.innerHTML = `<div class="empty"><span class="empty-icon">🎵</span><h3>No Musicians Found</h3><p>Try a different search or filter.</p></div>`;
+    return;
+  }
+  grid.insertAdjacentHTML('beforeend', data.musicians.map(cardHtml).join(''));
 }
 
-function openModal(idx) {
-  const m = musicians[idx];
+async function loadPage(reset) {
+  if (!reset && (loading || items.length >= total)) return;
+  if (inflight) inflight.abort();
+  const ctrl = inflight = new AbortController();
+  loading = true;
+  const params = new URLSearchParams({limit: PAGE_SIZE, offset: reset ? 0 : items.length});
+  if (searchVal.trim()) params.set('q', searchVal.trim());
+  if (activeGenre !== 'All') params.set('genre', activeGenre);
+  try {
+    const res = await fetch('/api/musicians?' + params, {signal: ctrl.signal});
+    const data = await res.json();
+    showPage(data, reset);
+    if (reset) renderFilters(data.facets);
+  } catch (e) {
+    if (e.name !== 'AbortError') showToast('❌ Could not load musicians.', 'error');
+  } finally {
+    if (inflight === ctrl) { inflight = null; loading = false; }
+  }
+}
+
+// Infinite scroll: fetch the next page when the sentinel below the grid comes into view
+new IntersectionObserver(entries => {
+  if (entries.some(e => e.isIntersecting)) loadPage(false);
+}, {rootMargin: '400px'}).observe(document.getElementById('gridSentinel'));
+
+function openModal(id) {
+  const m = byId.get(id);
+  if (!m) return;
   document.getElementById('mAvatar').textContent = m.emoji;
   document.getElementById('mName').textContent = m.name;
   document.getElementById('mTagline').textContent = m.tagline;
   document.getElementById('mBio').textContent = m.bio;
-  document.getElementById('mTags').innerHTML = `<span class="tag tag-genre">${m.genre}</span><span class="tag tag-era">${m.era}</span>`;
+  document.getElementById('mTags').innerHTML = `<span class="tag tag-genre">${esc(m.genre)}</span><span class="tag tag-era">${esc(m.era)}</span>`;
   document.getElementById('mFacts').innerHTML = [
     {label:'Born',val:m.born},{label:'Era',val:m.era},
     {label:'Instrument',val:m.instrument},{label:'Genre',val:m.genre}
-  ].map(f=>`<div class="fact"><div class="fact-label">${f.label}</div><div class="fact-val">${f.val}</div></div>`).join('');
-  document.getElementById('mChips').innerHTML = m.known_for.map(k=>`<span class="chip">${k}</span>`).join('');
+  ].map(f=>`<div class="fact"><div class="fact-label">${f.label}</div><div class="fact-val">${esc(f.val)}</div></div>`).join('');
+  document.getElementById('mChips').innerHTML = m.known_for.map(k=>`<span class="chip">${esc(k)}</span>`).join('');
   document.getElementById('modalOverlay').classList.add('open');
   document.body.style.overflow='hidden';
+  loadSimilar(id);
+}
+// Precomputed neighbours — one small request per modal
+let similarFor = null;
+async function loadSimilar(id) {
+  const section = document.getElementById('mSimilarSection');
+  section.hidden = true;
+  similarFor = id;
+  try {
+    const res = await fetch(`/api/musicians/${id}/similar?limit=5`);
+    if (!res.ok) return;
+    const data = await res.json();
+    if (similarFor !== id) return;          // another modal opened meanwhile
+    data.similar.forEach(s => { if (!byId.has(s.id)) byId.set(s.id, s); });
+    document.getElementById('mSimilar').innerHTML = data.similar.map(s =>
+      `<button class="chip" onclick="openModal(${s.id})">${esc(s.emoji)} ${esc(s.name)}</button>`).join('');
+    section.hidden = !data.similar.length;
+  } catch (e) { /* optional extra — the modal is complete without it */ }
 }
 function closeModal() {
   document.getElementById('modalOverlay').classList.remove('open');
@@ -448,7 +851,12 @@ function closeModal() {
 document.getElementById('modalOverlay').addEventListener('click',function(e){if(e.target===this)closeModal();});
 document.getElementById('closeBtn').addEventListener('click',closeModal);
 document.addEventListener('keydown',e=>{if(e.key==='Escape')closeModal();});
-document.getElementById('searchInput').addEventListener('input',function(){searchVal=this.value;renderGrid();});
+let searchTimer;
+document.getElementById('searchInput').addEventListener('input',function(){
+  searchVal=this.value;
+  clearTimeout(searchTimer);
+  searchTimer=setTimeout(()=>loadPage(true),250);   // debounce: one request per pause in typing
+});
 
 let toastTimer;
 function showToast(msg,type='success'){
@@ -485,13 +893,13 @@ async function submitFeedback(){
 
 async function loadFeedbacks(){
   try {
-    const res=await fetch('/feedbacks');
+    const res=await fetch('/feedbacks?limit=6');
     const data=await res.json();
     const list=document.getElementById('feedbackList');
     if(!data.feedbacks||!data.feedbacks.length){
       list.innerHTML='<div class="feedback-empty">No feedback yet. Be the first! 🎵</div>';return;
     }
-    list.innerHTML=data.feedbacks.slice(0,6).map(f=>`
+    list.innerHTML=data.feedbacks.map(f=>`
       <div class="feedback-card">
         <div class="feedback-card-top">
           <div>
@@ -509,7 +917,7 @@ async function loadFeedbacks(){
 function esc(s){return String(s).replace(/&/g,'&amp;').replace(/</g,'&lt;').replace(/>/g,'&gt;');}
 function fmtDate(d){if(!d)return'';return new Date(d).toLocaleDateString('en-US',{month:'short',day:'numeric',year:'numeric'});}
 
-renderFilters(); renderGrid(); loadFeedbacks();
+renderFilters(initial.facets); showPage(initial, true); loadFeedbacks();
 </script>
 </body>
 </html>
@@ -519,72 +927,587 @@ renderFilters(); renderGrid(); loadFeedbacks();
 # ROUTES
 # ─────────────────────────────────────────────────────────────────
 
+# Index page is rendered + compressed once per data version, then
+# served from memory (304 when the browser already has it).
+_index_page = None
+_index_lock = threading.Lock()
+INDEX_CACHE_CONTROL = os.environ.get("INDEX_CACHE_CONTROL", "no-cache")
+INDEX_PAGE_SIZE = int(os.environ.get("INDEX_PAGE_SIZE", "24"))   # cards embedded in the HTML
+
+def get_index_page():
+    global _index_page
+    # Keyed on the index that renders it — while a rebuild runs that is still the previous version
+    search_index = get_search_index()
+    if _index_page is None or _index_page[0] != search_index.version:
+        with _index_lock:
+            if _index_page is None or _index_page[0] != search_index.version:
+                first = search_index.search(limit=INDEX_PAGE_SIZE)
+                initial = {"musicians": first["results"], "total": first["total"],
+                           "facets": {"genre": first["facets"]["genre"]}}
+                with TEMPLATE_SECONDS.time("index"):
+                    html = render_template_string(HTML_TEMPLATE, initial=initial, page_size=INDEX_PAGE_SIZE)
+                _index_page = (search_index.version, PrecompressedPage(html, cache_control=INDEX_CACHE_CONTROL))
+    return _index_page[1]
+
+
 @app.route("/")
 def index():
-    return render_template_string(HTML_TEMPLATE, musicians=MUSICIANS)
+    return get_index_page().response(request)
+
+
+def _check_db():
+    with get_db_connection():       # checkout pings the pooled connection
+        pass
+
+# RDS is pinged in the background; probes only read the cached result
+db_health = DBHealthMonitor(_check_db, interval=float(os.environ.get("HEALTH_CHECK_INTERVAL", "10")))
+
+BOOT_SECONDS = None
+
+def mark_booted():
+    """Record import → ready-to-serve time for this process (once)."""
+    global BOOT_SECONDS
+    if BOOT_SECONDS is None:
+        BOOT_SECONDS = time.monotonic() - _BOOT_STARTED
+        print(f"🚀 Ready to serve in {BOOT_SECONDS * 1000:.0f} ms (pid {os.getpid()})")
+
+metrics.gauge("app_startup_seconds", "Seconds from importing app.py to serving requests.",
+              lambda: {} if BOOT_SECONDS is None else BOOT_SECONDS)
+
+
+@app.route("/livez")
+def livez():
+    """Liveness — the process is up and serving. Never touches the database."""
+    return jsonify({"status": "ok"})
+
+
+@app.route("/readyz")
+def readyz():
+    """Readiness — 503 until the background DB check has succeeded recently."""
+    db_health.start()
+    status = db_health.status()
+    return jsonify({"status": "ready" if status["ok"] else "unavailable", **status}), \
+        200 if status["ok"] else 503
 
 
 @app.route("/health")
 def health():
-    """Health check — also verifies RDS connectivity"""
-    db_status = "ok"
-    try:
-        conn = get_db_connection()
-        conn.close()
-    except Exception as e:
-        db_status = f"error: {str(e)}"
-    return jsonify({"status": "ok", "db": db_status, "app": "Musician Directory", "version": "2.0.0"})
+    """Health check — reports the cached RDS status, no connection per probe"""
+    db_health.start()
+    status = db_health.status()
+    startup = None if BOOT_SECONDS is None else round(BOOT_SECONDS, 3)
+    body = {"status": "ok", "db": status["db"], "db_checked_age_seconds": status["age_seconds"],
+            "pool": db_pool.stats(), "startup_seconds": startup,
+            "app": "Musician Directory", "version": "2.0.0"}
+    if read_router is not None:
+        body["read_replicas"] = read_router.stats()
+    return jsonify(body)
+
+
+MUSICIANS_CACHE_TTL = float(os.environ.get("CATALOG_CACHE_TTL", "300"))
+MUSICIANS_PAGE_SIZE = 50
+MUSICIANS_MAX_PAGE_SIZE = 200
+
+# Rebuilt once per catalog version, by one thread; the previous version
+# keeps answering in the meantime. Only the very first build is waited on.
+_search_index = None
+_search_lock = threading.Lock()
+
+def _build_search_index(current):
+    global _search_index
+    with _search_lock:
+        if _search_index is None or _search_index.version != current.version:
+            _search_index = MusicianIndex(current.musicians, version=current.version)
+
+
+def get_search_index():
+    """Search index for the current catalog — possibly one version behind while it rebuilds."""
+    current = catalog_cache.get()
+    index = _search_index
+    if index is None:
+        _build_search_index(current)
+    elif index.version != current.version and not _search_lock.locked():
+        threading.Thread(target=_build_search_index, args=(current,),
+                         name="search-index", daemon=True).start()
+    return _search_index
+
+
+@app.route("/metrics")
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
 
 
 @app.route("/api/musicians")
 def api_musicians():
-    return jsonify({"musicians": MUSICIANS, "total": len(MUSICIANS)})
+    """Search + filter the catalog: ?q= &genre= &era= &instrument= &limit= &offset="""
+    try:
+        limit = min(max(int(request.args.get("limit", MUSICIANS_PAGE_SIZE)), 1), MUSICIANS_MAX_PAGE_SIZE)
+        offset = max(int(request.args.get("offset", 0)), 0)
+    except ValueError:
+        return jsonify({"error": "limit and offset must be integers."}), 400
+
+    filters = {f: request.args.get(f, "").strip() for f in ("genre", "era", "instrument")}
+    if filters["genre"] == "All":
+        filters["genre"] = ""
+    q = request.args.get("q", "").strip()
+
+    # The catalog only changes between versions, so the encoded body can be reused
+    search_index = get_search_index()
+
+    def render():
+        result = search_index.search(q=q, limit=limit, offset=offset, **filters)
+        return app.json.encode({
+            "musicians": result["results"], "total": result["total"], "facets": result["facets"],
+            "limit": limit, "offset": offset,
+        }) + b"\n"
+
+    key = (search_index.version, q, limit, offset, *filters.values())
+    body = response_cache.get_or_compute("musicians", key, render, ttl=MUSICIANS_CACHE_TTL)
+    return Response(body, mimetype="application/json")
+
+
+# Neighbour tables are rebuilt per catalog version. Small catalogs
+# build inline; big ones in the background while the previous
+# version keeps answering. One process builds into SIMILAR_TABLE_PATH
+# and every worker maps it ("" = each process builds its own).
+SIMILAR_K = int(os.environ.get("SIMILAR_K", "10"))
+SIMILAR_SYNC_BUILD_MAX = int(os.environ.get("SIMILAR_SYNC_BUILD_MAX", "5000"))
+SIMILAR_TABLE_PATH = os.environ.get(
+    "SIMILAR_TABLE_PATH",
+    os.path.join(tempfile.gettempdir(), f"musicapp-similar-{os.environ.get('DB_NAME', 'musicdb')}.bin"),
+)
+_similar_index = None
+_similar_lock = threading.Lock()
+
+def _build_similar_index(current):
+    global _similar_index
+    with _similar_lock:
+        if _similar_index is not None and _similar_index.version == current.version:
+            return
+        if SIMILAR_TABLE_PATH and current.version != "seed":     # the seed list's version names no content
+            _similar_index = similar.shared(
+                SIMILAR_TABLE_PATH, current.musicians, k=SIMILAR_K, version=current.version, previous=_similar_index)
+        else:
+            _similar_index = similar.SimilarityIndex.build(
+                current.musicians, k=SIMILAR_K, version=current.version, previous=_similar_index)
+
+
+def get_similar_index():
+    """Neighbour table for the current catalog — possibly one version behind while it rebuilds."""
+    current = catalog_cache.get()
+    index = _similar_index
+    if index is None or index.version != current.version:
+        if index is None and len(current.musicians) <= SIMILAR_SYNC_BUILD_MAX:
+            _build_similar_index(current)
+        elif not _similar_lock.locked():
+            threading.Thread(target=_build_similar_index, args=(current,),
+                             name="similar-index", daemon=True).start()
+    return _similar_index
+
+
+@app.route("/api/musicians/<int:musician_id>/similar")
+def similar_musicians(musician_id):
+    """The `?limit=` (default and max SIMILAR_K) musicians most like this one, best first."""
+    if not similar.available():
+        return jsonify({"error": "Similar musicians need numpy on the server."}), 503
+    try:
+        limit = min(max(int(request.args.get("limit", SIMILAR_K)), 1), SIMILAR_K)
+    except ValueError:
+        return jsonify({"error": "limit must be an integer."}), 400
+    index = get_similar_index()
+    if index is None:
+        return jsonify({"error": "Similar musicians are still being computed."}), 503, {"Retry-After": "5"}
+    matches = index.similar(musician_id, limit)
+    if matches is None:
+        return jsonify({"error": "Musician not found."}), 404
+    return jsonify({"id": musician_id,
+                    "similar": [{**m, "score": score} for m, score in matches]})
+
+
+# Validation, SQL and payload shaping are shared with the async
+# handlers in asgi.py so both paths answer identically.
+INSERT_FEEDBACK_SQL = "INSERT INTO feedback (name, email, message) VALUES (%s, %s, %s)"
+FEEDBACK_SAVED = {"success": True, "message": "Feedback saved to RDS successfully."}
+FEEDBACK_QUEUED = {"success": True, "message": "Feedback queued."}
+FEEDBACK_MISSING_FIELDS = {"error": "All fields are required."}
+FEEDBACK_BUSY = {"error": "Server busy, please retry shortly."}
+FEEDBACK_DURABLE_TIMED_OUT = {"error": "Timed out waiting for the database; feedback is still queued."}
+FEEDBACK_RATE_LIMITED = {"error": "Too many submissions, please slow down."}
+FEEDBACK_DUPLICATE = {"error": "This feedback was already received."}
+FEEDBACKS_BAD_ARGS = {"error": "Invalid limit or before cursor.", "feedbacks": []}
+FEEDBACKS_PAGE_SIZE = 50
+FEEDBACKS_MAX_PAGE_SIZE = 200
+
+
+def parse_feedback(form):
+    """(name, email, message) from the posted form, or None if any is blank."""
+    name    = form.get("name", "").strip()
+    email   = form.get("email", "").strip()
+    message = form.get("message", "").strip()
+    if not name or not email or not message:
+        return None
+    return name, email, message
+
+
+def guard_feedback(row, client_ip):
+    """(payload, status, headers) if the submission must be rejected, else None.
+
+    A submission that passes is remembered by the dedupe filter — call
+    ``release_feedback(row)`` if it then fails to reach the database.
+    """
+    if RATE_LIMIT_ENABLED:
+        checks = [(email_limiter, f"email:{row[1].lower()}")]
+        if TRUSTED_PROXY_COUNT is not None:           # client_ip is only meaningful once the hops are known
+            checks.insert(0, (ip_limiter, f"ip:{client_ip}"))
+        for limiter, key in checks:
+            try:
+                allowed, retry_after = limiter.hit(key)
+            except Exception:
+                allowed = True          # shared store down — fail open rather than block feedback
+            if not allowed:
+                FEEDBACK_REJECTED.inc("rate_limited")
+                return FEEDBACK_RATE_LIMITED, 429, {"Retry-After": retry_after_header(retry_after)}
+    if feedback_dedupe is not None and not feedback_dedupe.check_and_mark(row[1], row[2]):
+        FEEDBACK_REJECTED.inc("duplicate")
+        return FEEDBACK_DUPLICATE, 409, {}
+    return None
+
+
+def release_feedback(row):
+    if feedback_dedupe is not None:
+        feedback_dedupe.forget(row[1], row[2])
+
+
+def parse_feedbacks_args(args):
+    """(limit, cursor_key) from /feedbacks query args — raises ValueError if invalid.
+
+    `?before=<created_at>,<id>` is the next_cursor of the previous page.
+    """
+    limit = min(max(int(args.get("limit", FEEDBACKS_PAGE_SIZE)), 1), FEEDBACKS_MAX_PAGE_SIZE)
+    before = args.get("before")
+    if not before:
+        return limit, None
+    created_at, _, row_id = before.rpartition(",")
+    return limit, (datetime.fromisoformat(created_at), int(row_id))
+
+
+def feedbacks_query(cursor_key, limit):
+    """Keyset page on (created_at, id); fetches one extra row to detect more pages."""
+    if cursor_key is None:
+        return (
+            "SELECT id, name, email, message, created_at FROM feedback "
+            "ORDER BY created_at DESC, id DESC LIMIT %s",
+            (limit + 1,)
+        )
+    return (
+        "SELECT id, name, email, message, created_at FROM feedback "
+        "WHERE created_at < %s OR (created_at = %s AND id < %s) "
+        "ORDER BY created_at DESC, id DESC LIMIT %s",
+        (cursor_key[0], cursor_key[0], cursor_key[1], limit + 1)
+    )
+
+
+def feedbacks_payload(data, limit):
+    """created_at stays a datetime — the JSON provider encodes it."""
+    has_more = len(data) > limit
+    data = data[:limit]
+    next_cursor = f"{data[-1]['created_at']},{data[-1]['id']}" if has_more else None
+    return {"feedbacks": data, "total": len(data), "next_cursor": next_cursor}
 
 
 @app.route("/feedback", methods=["POST"])
 def submit_feedback():
     """Receive user feedback and INSERT into Amazon RDS (MySQL)"""
-    name    = request.form.get("name", "").strip()
-    email   = request.form.get("email", "").strip()
-    message = request.form.get("message", "").strip()
+    row = parse_feedback(request.form)
+    if row is None:
+        return jsonify(FEEDBACK_MISSING_FIELDS), 400
+    rejected = guard_feedback(row, request.remote_addr)
+    if rejected is not None:
+        payload, status, headers = rejected
+        return jsonify(payload), status, headers
 
-    if not name or not email or not message:
-        return jsonify({"error": "All fields are required."}), 400
+    if feedback_writer is not None:
+        return _queue_feedback(row)
 
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cursor:
-            cursor.execute(
-                "INSERT INTO feedback (name, email, message) VALUES (%s, %s, %s)",
-                (name, email, message)
-            )
-        conn.commit()
-        conn.close()
-        return jsonify({"success": True, "message": "Feedback saved to RDS successfully."})
+        with get_db_connection() as conn:
+            conn.begin()                    # the row and its rollup counts commit together
+            with conn.cursor() as cursor:
+                cursor.execute(INSERT_FEEDBACK_SQL, row)
+                if FEEDBACK_STATS_ENABLED:
+                    feedback_stats.record(cursor, [row])
+            conn.commit()
+    except Exception as e:
+        release_feedback(row)
+        return jsonify({"error": str(e)}), 500
+    # Committed — a cache problem from here on must not make the client retry the insert
+    invalidate_feedback_cache()
+    g.db_write = True
+    return jsonify(FEEDBACK_SAVED)
+
+
+def _queue_feedback(row):
+    """Write-behind path — `?durable=1` waits until the batch is committed."""
+    try:
+        ticket = feedback_writer.submit(row)
+    except QueueFull:
+        release_feedback(row)
+        return jsonify(FEEDBACK_BUSY), 503, {"Retry-After": "1"}
+    g.db_write = True
+
+    if request.args.get("durable") != "1":
+        return jsonify(FEEDBACK_QUEUED), 202
+    try:
+        if not ticket.wait(FEEDBACK_DURABLE_TIMEOUT):
+            return jsonify(FEEDBACK_DURABLE_TIMED_OUT), 504
     except Exception as e:
+        release_feedback(row)
         return jsonify({"error": str(e)}), 500
+    return jsonify(FEEDBACK_SAVED)
 
 
 @app.route("/feedbacks")
 def view_feedbacks():
-    """Return all feedback rows from RDS — used by frontend + admin"""
+    """Return feedback rows from RDS, newest first — used by frontend + admin
+
+    Keyset-paginated on (created_at, id): pass `next_cursor` back as
+    `?before=` for the next page. The first page is served from cache.
+    """
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cursor:
-            cursor.execute(
-                "SELECT id, name, email, message, created_at FROM feedback ORDER BY created_at DESC LIMIT 50"
-            )
-            data = cursor.fetchall()
-        conn.close()
-        for row in data:
-            if row.get("created_at"):
-                row["created_at"] = str(row["created_at"])
-        return jsonify({"feedbacks": data, "total": len(data)})
+        limit, cursor_key = parse_feedbacks_args(request.args)
+    except ValueError:
+        return jsonify(FEEDBACKS_BAD_ARGS), 400
+
+    def load():
+        with get_db_connection(readonly=True) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(*feedbacks_query(cursor_key, limit))
+                data = cursor.fetchall()
+        return app.json.encode(feedbacks_payload(data, limit)) + b"\n"
+
+    try:
+        # Clients reading their own writes skip the cache — it may hold a replica's older view
+        if cursor_key is None and not read_from_primary():
+            body = response_cache.get_or_compute("feedbacks", limit, load, ttl=FEEDBACK_CACHE_TTL)
+        else:
+            body = load()
     except Exception as e:
         return jsonify({"error": str(e), "feedbacks": []}), 500
+    return Response(body, mimetype="application/json")
+
+
+@app.route("/feedbacks/search")
+def search_feedbacks():
+    """Moderator search: `?q=` keywords (FULLTEXT, best match first) and/or `?email=`.
+
+    Pass `next_cursor` back as `?after=` for the next page.
+    """
+    try:
+        match, email, limit, after = feedback_search.parse_search_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid search: {e}", "feedbacks": []}), 400
+
+    key = (match, email, limit, after)
+    payload = feedback_search_cache.get(key, None)
+    if payload is None:
+        try:
+            with get_db_connection(readonly=True) as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(*feedback_search.search_query(match, email, limit, after))
+                    rows = cursor.fetchall()
+        except Exception as e:
+            return jsonify({"error": str(e), "feedbacks": []}), 500
+        payload = feedback_search.search_payload(rows, limit)
+        feedback_search_cache.set(key, payload)
+    return jsonify(payload)
+
+
+# ─────────────────────────────────────────────────────────────────
+# FEEDBACK STATISTICS (dashboards)
+# Reads the hourly / per-submitter rollups — never the raw table.
+# ─────────────────────────────────────────────────────────────────
+feedback_stats_cache = TTLCache(ttl=float(os.environ.get("FEEDBACK_STATS_CACHE_TTL", "10")), max_entries=64)
+
+
+@app.route("/feedbacks/stats")
+def view_feedback_stats():
+    """Feedback volume per day and per hour for `?days=` (default 14) plus the `?top=` submitters."""
+    try:
+        days = min(max(int(request.args.get("days", 14)), 1), feedback_stats.MAX_DAYS)
+        top = min(max(int(request.args.get("top", 10)), 1), feedback_stats.MAX_TOP)
+    except ValueError:
+        return jsonify({"error": "days and top must be integers."}), 400
+
+    payload = feedback_stats_cache.get((days, top), None)
+    if payload is None:
+        try:
+            with get_db_connection(readonly=True) as conn:
+                payload = feedback_stats.read_stats(conn, days=days, top=top)
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+        feedback_stats_cache.set((days, top), payload)
+    return jsonify(payload)
+
+
+@app.cli.command("backfill-feedback-stats")
+@click.option("--batch-size", default=50_000, show_default=True, help="Feedback ids aggregated per transaction.")
+def backfill_feedback_stats_command(batch_size):
+    """Rebuild the feedback rollups from existing rows, in batched id ranges."""
+    with get_db_connection() as conn, get_db_connection() as snapshot_conn:
+        total = feedback_stats.backfill(
+            conn, snapshot_conn, batch_size=batch_size,
+            progress=lambda n, upto, watermark: click.echo(f"  … id {upto}/{watermark} ({n} rows)"),
+        )
+    click.echo(f"✅ Rebuilt feedback stats from {total} rows.")
+
+
+# ─────────────────────────────────────────────────────────────────
+# FEEDBACK EXPORT (NDJSON / CSV, streamed)
+# Uses its own unpooled connection: an unbuffered cursor pins the
+# connection until the last row is read.
+# ─────────────────────────────────────────────────────────────────
+EXPORT_TOKEN = os.environ.get("EXPORT_TOKEN")
+
+def get_export_connection():
+    """Unpooled connection for a long export — on a replica when one is reachable."""
+    if read_router is not None:
+        for replica in read_router.candidates():
+            try:
+                return _connect(replica.host)
+            except Exception as e:
+                read_router.mark_down(replica, e)
+    return _connect()
+
+
+def parse_export_args(args):
+    """(fmt, since_id, since) — raises ValueError on bad input."""
+    fmt = args.get("format", "ndjson")
+    if fmt not in export.FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(export.FORMATS)}")
+    since_id = int(args["since_id"]) if args.get("since_id") else None
+    since = datetime.fromisoformat(args["since"]) if args.get("since") else None
+    return fmt, since_id, since
+
+
+def stream_feedback(fmt, since_id=None, since=None):
+    conn = get_export_connection()
+    rows = export.iter_rows(conn, since_id, since)
+    try:
+        yield from export.encode(rows, fmt)
+    finally:
+        # Also runs if the client disconnects mid-stream: the connection goes
+        # first, so the unbuffered cursor is dropped instead of drained.
+        conn.close()
+        rows.close()
+
+
+@app.route("/feedbacks/export")
+def export_feedbacks():
+    """Stream every feedback row: ?format=ndjson|csv &since_id= &since=<timestamp>"""
+    if not EXPORT_TOKEN:
+        # The whole table, emails included — never served unauthenticated
+        return jsonify({"error": "Not found."}), 404
+    if request.headers.get("Authorization") != f"Bearer {EXPORT_TOKEN}":
+        return jsonify({"error": "Unauthorized."}), 401
+    try:
+        fmt, since_id, since = parse_export_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return Response(
+        stream_with_context(stream_feedback(fmt, since_id, since)),
+        mimetype=export.FORMATS[fmt],
+        headers={"Content-Disposition": f"attachment; filename=feedback.{fmt}",
+                 "Cache-Control": "no-store"},
+    )
+
+
+@app.cli.command("export-feedback")
+@click.option("--format", "fmt", type=click.Choice(list(export.FORMATS)), default="ndjson", show_default=True)
+@click.option("--since-id", type=int, help="Only rows with id greater than this.")
+@click.option("--since", type=click.DateTime(), help="Only rows created at or after this time.")
+@click.option("--output", type=click.File("wb"), default="-", help="File to write (default stdout).")
+def export_feedback_command(fmt, since_id, since, output):
+    """Stream the feedback table to a file as NDJSON or CSV."""
+    for chunk in stream_feedback(fmt, since_id, since):
+        output.write(chunk)
+
+
+# ─────────────────────────────────────────────────────────────────
+# FEEDBACK PARTITIONING + ARCHIVAL (opt-in, see partitions.py)
+# Old months leave the hot table as gzipped NDJSON files; the
+# rollups in feedback_stats keep their counts.
+# ─────────────────────────────────────────────────────────────────
+FEEDBACK_ARCHIVE_DIR = os.environ.get("FEEDBACK_ARCHIVE_DIR", "archive")
+FEEDBACK_RETENTION_MONTHS = int(os.environ.get("FEEDBACK_RETENTION_MONTHS", "12"))
+
+
+@app.cli.command("partition-feedback")
+@click.option("--months-ahead", default=3, show_default=True, help="Future monthly partitions to create.")
+@click.option("--drop-fulltext", is_flag=True, help="Drop the FULLTEXT index MySQL won't partition (disables ?q= search).")
+@click.option("--print-sql", is_flag=True, help="Print the ALTER for an online schema-change tool instead of running it.")
+def partition_feedback_command(months_ahead, drop_fulltext, print_sql):
+    """Convert the feedback table to monthly RANGE partitions on created_at (rebuilds the table)."""
+    with get_db_connection() as conn:
+        try:
+            sql = partitions.partition_table(conn, months_ahead, drop_fulltext, dry_run=print_sql)
+        except partitions.PartitioningError as e:
+            raise click.ClickException(str(e))
+    if print_sql:
+        click.echo(sql)
+    else:
+        click.echo("✅ feedback is now partitioned by month.")
+
+
+@app.cli.command("maintain-feedback-partitions")
+@click.option("--months-ahead", default=3, show_default=True, help="Months that must already have a partition.")
+def maintain_feedback_partitions_command(months_ahead):
+    """Pre-create upcoming monthly partitions (cheap — run daily from cron)."""
+    with get_db_connection() as conn:
+        try:
+            created = partitions.ensure_future_partitions(conn, months_ahead)
+        except partitions.PartitioningError as e:
+            raise click.ClickException(str(e))
+    click.echo(f"✅ Created partitions: {', '.join(created)}" if created else "✅ Future partitions already exist.")
+
+
+@app.cli.command("archive-feedback")
+@click.option("--older-than-months", default=FEEDBACK_RETENTION_MONTHS, show_default=True,
+              help="Archive months that ended before this many months ago.")
+@click.option("--dir", "directory", default=FEEDBACK_ARCHIVE_DIR, show_default=True,
+              type=click.Path(file_okay=False), help="Where the .ndjson.gz files go.")
+@click.option("--batch-size", default=5000, show_default=True, help="Rows per delete (unpartitioned table only).")
+def archive_feedback_command(older_than_months, directory, batch_size):
+    """Move old feedback to gzipped NDJSON files, then remove it from the table.
+
+    Partitioned: each whole old month is streamed out and its partition
+    dropped. Unpartitioned: rows go out in small delete batches.
+    """
+    os.makedirs(directory, exist_ok=True)
+    before = partitions.add_months(partitions.month_start(date.today()), -older_than_months)
+    with get_db_connection() as conn:
+        with conn.cursor() as cursor:
+            partitioned = bool(partitions.list_partitions(cursor))
+        if partitioned:
+            done = partitions.archive_partitions(
+                conn, _connect, directory, before,
+                progress=lambda name, n, path: click.echo(f"  📦 {name}: {n} rows → {path}"),
+            )
+            total = sum(n for _, n in done)
+        else:
+            total = partitions.archive_rows(
+                conn, directory, before, batch_size=batch_size,
+                progress=lambda _, n, path: click.echo(f"  … {n} rows → {path}"),
+            )
+    invalidate_feedback_cache()
+    click.echo(f"✅ Archived {total} feedback rows created before {before}.")
 
 
 # ─────────────────────────────────────────────────────────────────
 if __name__ == "__main__":
-    init_db()   # Create table if not exists
+    # Turn `docker stop` (SIGTERM) into a normal exit so atexit drains the feedback queue
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    # Dev convenience: migrate in the background so the server binds immediately
+    threading.Thread(target=init_db, name="init-db", daemon=True).start()
+    db_health.start()
+    mark_booted()
     app.run(host="0.0.0.0", port=5000, debug=False)
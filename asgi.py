@@ -0,0 +1,258 @@
+import asyncio
+import functools
+import io
+import os
+from urllib.parse import parse_qsl
+
+from asgiref.wsgi import WsgiToAsgi
+from werkzeug.datastructures import MultiDict
+from werkzeug.formparser import FormDataParser
+from werkzeug.http import parse_options_header
+
+import app as flask_app
+import feedback_stats
+from feedback_writer import QueueFull
+
+# ─────────────────────────────────────────────────────────────────
+# ASGI ENTRY POINT (optional async feedback path)
+# POST /feedback and GET /feedbacks run on the event loop with an
+# aiomysql pool, so a slow RDS parks coroutines instead of threads.
+# Every other route is the regular Flask app, run in a thread pool.
+#
+#   pip install -r requirements-async.txt
+#   gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker asgi:application
+# ─────────────────────────────────────────────────────────────────
+
+MAX_FEEDBACK_BODY = int(os.environ.get("MAX_FEEDBACK_BODY", str(64 * 1024)))
+
+
+class AsyncFeedbackApp:
+    def __init__(self, wsgi_app):
+        self.wsgi = WsgiToAsgi(wsgi_app)
+        self.pool = None
+        self._pool_lock = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] == "http":
+            path, method = scope["path"], scope["method"]
+            if path == "/feedback" and method == "POST":
+                return await self.submit_feedback(scope, receive, send)
+            if path == "/feedbacks" and method == "GET":
+                return await self.view_feedbacks(scope, receive, send)
+        await self.wsgi(scope, receive, send)
+
+    # ── async MySQL pool ────────────────────────────────────────
+    async def get_pool(self):
+        if self.pool is None:
+            if self._pool_lock is None:
+                self._pool_lock = asyncio.Lock()
+            async with self._pool_lock:
+                if self.pool is None:
+                    import aiomysql
+                    host, port = flask_app.db_address()
+                    self.pool = await aiomysql.create_pool(
+                        host=host,
+                        port=port,
+                        user=os.environ["DB_USER"],
+                        password=os.environ["DB_PASSWORD"],
+                        db=os.environ["DB_NAME"],
+                        cursorclass=aiomysql.DictCursor,
+                        connect_timeout=5,
+                        autocommit=True,
+                        minsize=int(os.environ.get("ASYNC_DB_POOL_MIN", "1")),
+                        maxsize=int(os.environ.get("ASYNC_DB_POOL_SIZE", "20")),
+                        pool_recycle=int(os.environ.get("DB_POOL_RECYCLE", "3600")),
+                    )
+        return self.pool
+
+    async def close_pool(self):
+        if self.pool is not None:
+            self.pool.close()
+            await self.pool.wait_closed()
+            self.pool = None
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                flask_app.mark_booted()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.close_pool()
+                if flask_app.feedback_writer is not None:
+                    await asyncio.get_running_loop().run_in_executor(None, flask_app.feedback_writer.shutdown)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    # ── handlers (mirror app.submit_feedback / app.view_feedbacks) ──
+    async def submit_feedback(self, scope, receive, send):
+        body = await _read_body(receive, MAX_FEEDBACK_BODY)
+        if body is None:
+            return await _send_json(send, {"error": "Request body too large."}, 413)
+        row = flask_app.parse_feedback(_parse_form(scope, body))
+        if row is None:
+            return await _send_json(send, flask_app.FEEDBACK_MISSING_FIELDS, 400)
+        rejected = await _call(flask_app.RATE_LIMIT_REDIS_URL, flask_app.guard_feedback, row, _client_ip(scope))
+        if rejected is not None:
+            payload, status, headers = rejected
+            return await _send_json(send, payload, status, _raw_headers(headers))
+
+        if flask_app.feedback_writer is not None:
+            return await self._queue_feedback(scope, send, row)
+
+        try:
+            pool = await self.get_pool()
+            async with pool.acquire() as conn:
+                await conn.begin()
+                async with conn.cursor() as cursor:
+                    await cursor.execute(flask_app.INSERT_FEEDBACK_SQL, row)
+                    if flask_app.FEEDBACK_STATS_ENABLED:
+                        for sql, args in feedback_stats.record_statements([row]):
+                            await cursor.executemany(sql, args)
+                await conn.commit()
+        except Exception as e:
+            flask_app.release_feedback(row)
+            return await _send_json(send, {"error": str(e)}, 500)
+        # Committed — nothing after this may turn the write into an error
+        await _call(_cache_blocks(), flask_app.invalidate_feedback_cache)
+        await _send_json(send, flask_app.FEEDBACK_SAVED, extra_headers=_written_headers())
+
+    async def _queue_feedback(self, scope, send, row):
+        try:
+            ticket = flask_app.feedback_writer.submit(row)
+        except QueueFull:
+            flask_app.release_feedback(row)
+            return await _send_json(send, flask_app.FEEDBACK_BUSY, 503, [(b"retry-after", b"1")])
+        if _query_args(scope).get("durable") != "1":
+            return await _send_json(send, flask_app.FEEDBACK_QUEUED, 202, _written_headers())
+        loop = asyncio.get_running_loop()
+        try:
+            done = await loop.run_in_executor(None, ticket.wait, flask_app.FEEDBACK_DURABLE_TIMEOUT)
+        except Exception as e:
+            flask_app.release_feedback(row)
+            return await _send_json(send, {"error": str(e)}, 500)
+        if not done:
+            return await _send_json(send, flask_app.FEEDBACK_DURABLE_TIMED_OUT, 504)
+        await _send_json(send, flask_app.FEEDBACK_SAVED, extra_headers=_written_headers())
+
+    async def view_feedbacks(self, scope, receive, send):
+        try:
+            limit, cursor_key = flask_app.parse_feedbacks_args(_query_args(scope))
+        except ValueError:
+            return await _send_json(send, flask_app.FEEDBACKS_BAD_ARGS, 400)
+
+        cache = flask_app.response_cache
+        body, generation = await _call(_cache_blocks(), _cached_page, cache, cursor_key, limit)
+        if body is not None:
+            return await _send_body(send, body)
+
+        try:
+            pool = await self.get_pool()
+            async with pool.acquire() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(*flask_app.feedbacks_query(cursor_key, limit))
+                    data = list(await cursor.fetchall())
+        except Exception as e:
+            return await _send_json(send, {"error": str(e), "feedbacks": []}, 500)
+
+        body = _encode(flask_app.feedbacks_payload(data, limit))
+        if cursor_key is None and generation is not None:      # None: cache backend unavailable
+            await _call(_cache_blocks(), cache.set, "feedbacks", limit, body,
+                        flask_app.FEEDBACK_CACHE_TTL, generation)
+        await _send_body(send, body)
+
+
+def _cached_page(cache, cursor_key, limit):
+    """(cached first page or None, generation to store a fresh one under)."""
+    body = cache.get("feedbacks", limit) if cursor_key is None else None
+    return body, cache.generation("feedbacks")
+
+
+# ── tiny ASGI helpers ───────────────────────────────────────────
+async def _call(blocking, fn, *args):
+    """``fn(*args)``, in the default executor when it may block the loop (Redis, flock)."""
+    if not blocking:
+        return fn(*args)
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(fn, *args))
+
+
+def _cache_blocks():
+    # mmap takes a flock, Redis a network round trip; the local LRU is a dict lookup
+    return flask_app.response_cache.backend.shared
+
+
+async def _read_body(receive, limit):
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > limit:
+            return None
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+def _headers(scope):
+    return {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope.get("headers", [])}
+
+
+def _raw_headers(headers):
+    return [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()]
+
+
+def _written_headers():
+    """Pin this client's next reads to the primary, as the Flask side does after a write."""
+    if flask_app.read_router is None:
+        return []
+    return [(b"set-cookie", flask_app.read_primary_cookie().encode("latin-1"))]
+
+
+def _client_ip(scope):
+    """Same client address ProxyFix gives the Flask side under TRUSTED_PROXY_COUNT."""
+    hops = flask_app.TRUSTED_PROXY_COUNT
+    if hops:
+        forwarded = [ip.strip() for ip in _headers(scope).get("x-forwarded-for", "").split(",") if ip.strip()]
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    client = scope.get("client")
+    return client[0] if client else None
+
+
+def _query_args(scope):
+    return MultiDict(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True))
+
+
+def _parse_form(scope, body):
+    """Same form decoding Flask uses (urlencoded + multipart)."""
+    mimetype, options = parse_options_header(_headers(scope).get("content-type", ""))
+    _, form, _ = FormDataParser().parse(io.BytesIO(body), mimetype, len(body), options)
+    return form
+
+
+def _encode(payload):
+    # Serialize with Flask's JSON provider so bodies match jsonify() byte for byte
+    return (flask_app.app.json.dumps(payload, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+async def _send_json(send, payload, status=200, extra_headers=()):
+    await _send_body(send, _encode(payload), status, extra_headers)
+
+
+async def _send_body(send, body, status=200, extra_headers=()):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            *extra_headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+application = AsyncFeedbackApp(flask_app.app)
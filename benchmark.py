@@ -0,0 +1,345 @@
+"""Load-test / benchmark harness for every route in app.py.
+
+In-process (default) — drives the Flask app through its test client with
+the real connection pool on a SQLite stand-in, so numbers are reproducible
+on a laptop or in CI:
+
+    python benchmark.py --requests 2000 --concurrency 8 --output bench.json
+    python benchmark.py --compare bench.json          # fail on p95 regressions
+
+Against a running server (local MySQL behind it) over HTTP:
+
+    python benchmark.py --url http://localhost:5000 --concurrency 32
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+# name -> (method, path, form data)
+ROUTES = {
+    "index":          ("GET",  "/", None),
+    "api_musicians":  ("GET",  "/api/musicians", None),
+    "search":         ("GET",  "/api/musicians?q=jazz&limit=10", None),
+    "health":         ("GET",  "/health", None),
+    "post_feedback":  ("POST", "/feedback", {"name": "Bench", "email": "bench@example.com", "message": "load test"}),
+    "feedbacks":      ("GET",  "/feedbacks", None),
+}
+
+
+# ─────────────────────────────────────────────────────────────────
+# CLIENTS
+# ─────────────────────────────────────────────────────────────────
+class InProcessClient:
+    """Flask test client wired to a pooled SQLite stand-in for RDS."""
+
+    def __init__(self, pool_size):
+        self._tmp = tempfile.TemporaryDirectory()
+        # Every benchmark POST is the same client and body — don't measure 429/409s
+        os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+        os.environ.setdefault("FEEDBACK_DEDUPE_WINDOW", "0")
+        os.environ.setdefault("CATALOG_COLUMNAR_PATH", os.path.join(self._tmp.name, "catalog.bin"))
+        import app as musicapp
+        import sqlite_standin
+        from db_pool import ConnectionPool
+
+        path = os.path.join(self._tmp.name, "bench.db")
+        sqlite_standin.create_schema(path, musicapp.MUSICIANS)
+        musicapp.db_pool = ConnectionPool(sqlite_standin.connect_factory(path), max_size=pool_size)
+        self.app = musicapp.app
+        self._local = threading.local()
+
+    def request(self, method, path, data):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        resp = client.open(path, method=method, data=data, headers={"Accept-Encoding": "gzip"})
+        resp.close()
+        return resp.status_code
+
+    def close(self):
+        self._tmp.cleanup()
+
+
+class HTTPClient:
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+
+    def request(self, method, path, data):
+        body = urllib.parse.urlencode(data).encode() if data else None
+        req = urllib.request.Request(self.base_url + path, data=body, method=method,
+                                     headers={"Accept-Encoding": "gzip"})
+        try:
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                resp.read()
+                return resp.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    def close(self):
+        pass
+
+
+# ─────────────────────────────────────────────────────────────────
+# MEASUREMENT
+# ─────────────────────────────────────────────────────────────────
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def run_route(client, method, path, data, requests, concurrency):
+    latencies, errors = [], 0
+    lock = threading.Lock()
+
+    def one(_):
+        nonlocal errors
+        start = time.perf_counter()
+        status = client.request(method, path, data)
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            if status >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    ms = [v * 1000 for v in latencies]
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / wall, 1),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "max_ms": round(ms[-1], 3),
+    }
+
+
+def measure_allocations(client, method, path, data, samples):
+    """Mean bytes allocated (peak) and blocks retained per request — single-threaded."""
+    tracemalloc.start()
+    peaks, retained = [], []
+    try:
+        for _ in range(samples):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            client.request(method, path, data)
+            after, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(after - before)
+    finally:
+        tracemalloc.stop()
+    return {
+        "alloc_peak_bytes": int(statistics.fmean(peaks)),
+        "alloc_retained_bytes": int(statistics.fmean(retained)),
+    }
+
+
+# ─────────────────────────────────────────────────────────────────
+# CATALOG MEMORY (list of dicts vs columnar mmap file)
+# ─────────────────────────────────────────────────────────────────
+def synthetic_catalog(n):
+    """``n`` seed-like musicians whose strings are separate objects, as rows from the DB are."""
+    from app import MUSICIANS
+    fresh = lambda s: s.encode().decode()           # noqa: E731 — a new str, not the interned literal
+    for i in range(n):
+        m = MUSICIANS[i % len(MUSICIANS)]
+        row = {"id": i + 1, **{k: fresh(v) for k, v in m.items() if isinstance(v, str)}}
+        row["name"] = f"{m['name']} {i}"
+        row["bio"] = f"{m['bio']} ({i})"
+        row["known_for"] = [fresh(k) for k in m["known_for"]]
+        yield row
+
+
+def _private_anon_kb():
+    """Private dirty KB outside file mappings — where copy-on-write copies land.
+
+    A mapped file's pages are page cache and stay shared, even when tmpfs
+    reports them as dirty.
+    """
+    total, anonymous = 0, False
+    with open("/proc/self/smaps") as f:
+        for line in f:
+            first = line.split(None, 1)[0]
+            if "-" in first and not first.endswith(":"):          # mapping header: "addr-addr perms … [path]"
+                fields = line.split()
+                anonymous = len(fields) < 6 or fields[5].startswith("[")
+            elif anonymous and first == "Private_Dirty:":
+                total += int(line.split()[1])
+    return total
+
+
+def _scan(rows):
+    """What serving does to every row: read each field (refcounts touched on dicts)."""
+    for m in rows:
+        for v in m.values():
+            len(v) if isinstance(v, (str, list)) else v
+
+
+def forked_dirty_kb(rows, workers):
+    """Mean private memory (KB) each forked worker copies by scanning the inherited catalog."""
+    if not hasattr(os, "fork") or not os.path.exists("/proc/self/smaps"):
+        return None
+    results = []
+    for _ in range(workers):
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:                                   # worker: measure, report, exit
+            os.close(read_end)
+            before = _private_anon_kb()
+            _scan(rows)
+            os.write(write_end, str(_private_anon_kb() - before).encode())
+            os._exit(0)
+        os.close(write_end)
+        with os.fdopen(read_end) as r:
+            results.append(int(r.read() or 0))
+        os.waitpid(pid, 0)
+    return int(statistics.fmean(results))
+
+
+def measure_catalog_memory(n, workers):
+    import catalog
+    import columnar
+
+    def traced(build):
+        tracemalloc.start()
+        try:
+            value = build()
+            return value, tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+    results = {"musicians": n}
+    # Columnar first, streamed straight to the file: no dicts exist yet to skew its numbers
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "catalog.bin")
+        columnar.write(path, synthetic_catalog(n), "bench", catalog.MUSICIAN_FIELDS)
+        mapped, mapped_bytes = traced(lambda: columnar.ColumnarCatalog.open(path))
+        results["columnar"] = {"heap_bytes": mapped_bytes, "file_bytes": os.path.getsize(path),
+                               "worker_dirty_kb": forked_dirty_kb(mapped, workers)}
+        mapped.close()
+    dicts, dict_bytes = traced(lambda: list(synthetic_catalog(n)))
+    results["list_of_dicts"] = {"heap_bytes": dict_bytes, "worker_dirty_kb": forked_dirty_kb(dicts, workers)}
+    for name, r in (("list of dicts", results["list_of_dicts"]), ("columnar mmap", results["columnar"])):
+        extra = f"  file {r['file_bytes'] / 1e6:>7.1f} MB (shared)" if "file_bytes" in r else ""
+        dirty = "n/a" if r["worker_dirty_kb"] is None else f"{r['worker_dirty_kb'] / 1024:.1f} MB"
+        print(f"{name:<15} heap {r['heap_bytes'] / 1e6:>7.1f} MB{extra}  copied per worker after a scan: {dirty}")
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+def run(args):
+    client = HTTPClient(args.url) if args.url else InProcessClient(args.pool_size)
+    results = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "mode": "http" if args.url else "in-process",
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "routes": {},
+    }
+    try:
+        for name in args.routes:
+            method, path, data = ROUTES[name]
+            for _ in range(args.warmup):
+                client.request(method, path, data)
+            stats = run_route(client, method, path, data, args.requests, args.concurrency)
+            if not args.url and args.alloc_samples:
+                stats.update(measure_allocations(client, method, path, data, args.alloc_samples))
+            results["routes"][name] = stats
+            print(f"{name:<15} {stats['throughput_rps']:>9} req/s  p50 {stats['p50_ms']:>8} ms  "
+                  f"p95 {stats['p95_ms']:>8} ms  p99 {stats['p99_ms']:>8} ms  errors {stats['errors']}")
+    finally:
+        client.close()
+    return results
+
+
+def compare(baseline, current, max_regression):
+    """Print p95/throughput deltas; return names of routes whose p95 regressed too much."""
+    regressed = []
+    print(f"\n{'route':<15} {'p95 before':>11} {'p95 after':>10} {'Δ':>8}   {'rps Δ':>8}")
+    for name, now in current["routes"].items():
+        before = baseline.get("routes", {}).get(name)
+        if not before:
+            continue
+        delta = (now["p95_ms"] - before["p95_ms"]) / before["p95_ms"] if before["p95_ms"] else 0.0
+        rps = (now["throughput_rps"] - before["throughput_rps"]) / before["throughput_rps"] \
+            if before["throughput_rps"] else 0.0
+        flag = "  ⚠️" if delta > max_regression else ""
+        print(f"{name:<15} {before['p95_ms']:>11} {now['p95_ms']:>10} {delta:>+8.1%}   {rps:>+8.1%}{flag}")
+        if delta > max_regression:
+            regressed.append(name)
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per route")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--pool-size", type=int, default=10, help="DB pool size (in-process mode)")
+    parser.add_argument("--alloc-samples", type=int, default=50,
+                        help="Requests traced with tracemalloc per route (0 disables)")
+    parser.add_argument("--routes", nargs="+", choices=sorted(ROUTES), default=list(ROUTES))
+    parser.add_argument("--output", help="Write JSON results here")
+    parser.add_argument("--compare", help="Baseline JSON to diff against")
+    parser.add_argument("--max-regression", type=float, default=0.20,
+                        help="Allowed p95 slowdown vs baseline before exiting non-zero")
+    parser.add_argument("--catalog-memory", type=int, metavar="N",
+                        help="Instead: compare catalog memory for N musicians, list of dicts vs columnar")
+    parser.add_argument("--workers", type=int, default=2, help="Forked workers for --catalog-memory")
+    args = parser.parse_args(argv)
+
+    if args.catalog_memory:
+        results = measure_catalog_memory(args.catalog_memory, args.workers)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=2)
+        return 0
+    results = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📄 Results written to {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            regressed = compare(json.load(f), results, args.max_regression)
+        if regressed:
+            print(f"\n❌ p95 regressed more than {args.max_regression:.0%}: {', '.join(regressed)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
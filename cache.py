@@ -0,0 +1,72 @@
+import threading
+import time
+from collections import OrderedDict
+
+# ─────────────────────────────────────────────────────────────────
+# IN-PROCESS TTL CACHE
+# Small, thread-safe, LRU-bounded cache for hot read paths.
+# ─────────────────────────────────────────────────────────────────
+
+MISSING = object()
+
+
+class TTLCache:
+    """Entries expire ``ttl`` seconds after being set; oldest evicted past ``max_entries``."""
+
+    def __init__(self, ttl, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data = OrderedDict()       # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.generation = 0              # bumped by clear(); guards against stale re-fills
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=MISSING):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl=None, generation=None):
+        """Store ``value``; skipped if ``generation`` is given and a clear() happened since."""
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def add(self, key, value, ttl=None):
+        """Set only if ``key`` is absent or expired — atomic. Returns True if stored."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                return False
+            self._data[key] = (now + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.generation += 1
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,243 @@
+import csv
+import json
+import threading
+import time
+import unicodedata
+from collections import namedtuple
+
+import columnar
+
+# ─────────────────────────────────────────────────────────────────
+# MUSICIAN CATALOG (RDS)
+# `musicians` + `musician_known_for` tables, a streaming bulk
+# importer, and a version-checked in-process cache for the handlers.
+# ─────────────────────────────────────────────────────────────────
+
+MUSICIAN_FIELDS = ("name", "emoji", "genre", "era", "born", "instrument", "tagline", "bio")
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS musicians (
+        id         INT AUTO_INCREMENT PRIMARY KEY,
+        name       VARCHAR(200)  NOT NULL,
+        emoji      VARCHAR(16)   NOT NULL DEFAULT '',
+        genre      VARCHAR(100)  NOT NULL DEFAULT '',
+        era        VARCHAR(50)   NOT NULL DEFAULT '',
+        born       VARCHAR(100)  NOT NULL DEFAULT '',
+        instrument VARCHAR(200)  NOT NULL DEFAULT '',
+        tagline    VARCHAR(255)  NOT NULL DEFAULT '',
+        bio        TEXT          NOT NULL,
+        updated_at TIMESTAMP     DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        UNIQUE KEY uq_musicians_name (name),
+        KEY idx_musicians_genre (genre)
+    ) DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS musician_known_for (
+        musician_id INT           NOT NULL,
+        position    SMALLINT      NOT NULL,
+        title       VARCHAR(255)  NOT NULL,
+        PRIMARY KEY (musician_id, position),
+        FOREIGN KEY (musician_id) REFERENCES musicians(id) ON DELETE CASCADE
+    ) DEFAULT CHARSET=utf8mb4
+    """,
+]
+
+_UPSERT_SQL = (
+    f"INSERT INTO musicians ({', '.join(MUSICIAN_FIELDS)}) "
+    f"VALUES ({', '.join(['%s'] * len(MUSICIAN_FIELDS))}) "
+    "ON DUPLICATE KEY UPDATE "
+    + ", ".join(f"{f} = VALUES({f})" for f in MUSICIAN_FIELDS[1:])
+    + ", updated_at = CURRENT_TIMESTAMP"      # bump even if only known_for changed
+)
+
+
+def create_tables(cursor):
+    for ddl in SCHEMA:
+        cursor.execute(ddl)
+
+
+# ── input readers (streaming — one row in memory at a time) ─────
+def iter_csv(path):
+    """CSV with a header row; ``known_for`` is a ``|``-separated list."""
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            known_for = row.get("known_for") or ""
+            row["known_for"] = [k.strip() for k in known_for.split("|") if k.strip()]
+            yield row
+
+
+def iter_jsonl(path):
+    """One JSON object per line (same keys as the MUSICIANS seed list)."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_rows(path, fmt=None):
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    return iter_csv(path) if fmt == "csv" else iter_jsonl(path)
+
+
+# ── bulk import ─────────────────────────────────────────────────
+def name_key(name):
+    """Case- and accent-insensitive form of ``name``, as uq_musicians_name compares it.
+
+    MySQL's default utf8mb4 collation treats "Björk" and "BJORK" as the
+    same key, and SELECT returns whichever spelling was stored first.
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def _flush(conn, batch):
+    names = [m["name"] for m in batch]
+    with conn.cursor() as cursor:
+        conn.begin()
+        cursor.executemany(
+            _UPSERT_SQL,
+            [tuple((m.get(f) or "") for f in MUSICIAN_FIELDS) for m in batch]
+        )
+        placeholders = ", ".join(["%s"] * len(names))
+        cursor.execute(f"SELECT id, name FROM musicians WHERE name IN ({placeholders})", names)
+        ids = {name_key(r["name"]): r["id"] for r in cursor.fetchall()}
+        cursor.execute(
+            f"DELETE FROM musician_known_for WHERE musician_id IN ({placeholders})",
+            [ids[name_key(n)] for n in names]
+        )
+        known_for = [
+            (ids[name_key(m["name"])], pos, title)
+            for m in batch for pos, title in enumerate(m.get("known_for") or [])
+        ]
+        if known_for:
+            cursor.executemany(
+                "INSERT INTO musician_known_for (musician_id, position, title) VALUES (%s, %s, %s)",
+                known_for
+            )
+    conn.commit()
+
+
+def import_musicians(conn, rows, batch_size=1000, progress=None):
+    """Upsert musicians (keyed by name) in batched transactions. Returns rows imported.
+
+    Memory stays bounded by ``batch_size`` no matter how long ``rows`` is.
+    """
+    total, batch = 0, {}
+    for row in rows:
+        name = (row.get("name") or "").strip()
+        if not name:
+            continue
+        row["name"] = name
+        batch[name_key(name)] = row     # last one wins if a batch repeats a name (in any spelling)
+        if len(batch) >= batch_size:
+            _flush(conn, list(batch.values()))
+            total += len(batch)
+            batch = {}
+            if progress:
+                progress(total)
+    if batch:
+        _flush(conn, list(batch.values()))
+        total += len(batch)
+        if progress:
+            progress(total)
+    return total
+
+
+def seed_if_empty(conn, musicians):
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM musicians LIMIT 1")
+        if cursor.fetchone():
+            return 0
+    return import_musicians(conn, [dict(m) for m in musicians])
+
+
+# ── reads ───────────────────────────────────────────────────────
+def catalog_version(conn):
+    """Cheap change probe — row count + newest updated_at."""
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) AS n, MAX(updated_at) AS updated FROM musicians")
+        row = cursor.fetchone()
+    return f"{row['n']}:{row['updated']}"
+
+
+def load_catalog(conn):
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT id, {', '.join(MUSICIAN_FIELDS)} FROM musicians ORDER BY id")
+        musicians = cursor.fetchall()
+        cursor.execute("SELECT musician_id, title FROM musician_known_for ORDER BY musician_id, position")
+        known_for = {}
+        for row in cursor.fetchall():
+            known_for.setdefault(row["musician_id"], []).append(row["title"])
+    for m in musicians:
+        m["known_for"] = known_for.get(m["id"], [])
+    return musicians
+
+
+Catalog = namedtuple("Catalog", "musicians version")
+
+
+class CatalogCache:
+    """Serves the catalog from memory; re-probes RDS every ``ttl`` seconds.
+
+    One request refreshes while the others keep serving the current copy.
+    Falls back to the ``fallback`` seed list while the DB is unreachable.
+    ``musicians`` is a list of dicts, or a ``ColumnarCatalog`` when
+    ``columnar_path`` is set — handlers only rely on the Sequence API.
+    """
+
+    def __init__(self, get_connection, fallback, ttl=300, retry=30, columnar_path=None):
+        self._get_connection = get_connection
+        self.columnar_path = columnar_path      # set: serve from a shared mmap'd file (columnar.py)
+        self._fallback = Catalog(
+            [{"id": i, **m} for i, m in enumerate(fallback, start=1)], "seed"
+        )
+        self.ttl = ttl
+        self.retry = retry
+        self._catalog = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self._catalog is not None and time.monotonic() < self._expires:
+            return self._catalog
+        if self._catalog is None:
+            with self._lock:
+                if self._catalog is None:
+                    self._refresh()
+        elif self._lock.acquire(blocking=False):
+            try:
+                self._refresh()
+            finally:
+                self._lock.release()
+        return self._catalog
+
+    def _refresh(self):
+        try:
+            with self._get_connection() as conn:
+                version = catalog_version(conn)
+                if self._catalog is None or version != self._catalog.version:
+                    musicians = self._load(conn, version)
+                    self._catalog = Catalog(musicians, version) if musicians else self._fallback
+            self._expires = time.monotonic() + self.ttl
+        except Exception as e:
+            if self._catalog is None:
+                print(f"⚠️  Catalog load failed, serving seed data: {e}")
+                self._catalog = self._fallback
+            self._expires = time.monotonic() + self.retry
+
+    def _load(self, conn, version):
+        if not self.columnar_path:
+            return load_catalog(conn)
+        # Another worker may already have written this version — then no rows are fetched at all
+        shared = columnar.open_version(self.columnar_path, version)
+        if shared is None or shared.fields != list(MUSICIAN_FIELDS):
+            musicians = load_catalog(conn)
+            if not musicians:
+                return musicians
+            columnar.write(self.columnar_path, musicians, version, MUSICIAN_FIELDS)
+            shared = columnar.ColumnarCatalog.open(self.columnar_path)
+        return shared
+
+    def invalidate(self):
+        self._expires = 0.0
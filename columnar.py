@@ -0,0 +1,164 @@
+import mmap
+import os
+import struct
+from collections.abc import Sequence
+
+# ─────────────────────────────────────────────────────────────────
+# COLUMNAR CATALOG FILE
+# The musician catalog as one immutable, mmap-able buffer: a column
+# of string ids per field, known_for as offsets into a flat id list,
+# and every distinct string stored once in a shared string table.
+# Workers map the same file, so the page cache holds one physical
+# copy and no Python objects exist until a row is read.
+#
+#   header | version + field names | ids (i64) | a u32 column per field
+#   | known_for offsets (u32, n+1) | known_for ids (u32)
+#   | string offsets (u64, m+1) | UTF-8 string data
+# ─────────────────────────────────────────────────────────────────
+
+MAGIC = b"MUSICOL1"
+_HEADER = struct.Struct("<8sIIII")          # magic, rows, strings, known_for entries, meta bytes
+
+
+def _pad(n):
+    return -n % 8
+
+
+class _Writer:
+    def __init__(self):
+        self.ids = {}
+        self.offsets = [0]
+        self.data = bytearray()
+
+    def intern(self, value):
+        value = value or ""
+        sid = self.ids.get(value)
+        if sid is None:
+            sid = self.ids[value] = len(self.offsets) - 1
+            self.data += value.encode("utf-8")
+            self.offsets.append(len(self.data))
+        return sid
+
+
+def write(path, musicians, version, fields):
+    """Write ``musicians`` (catalog row dicts, ordered) as a columnar file, atomically.
+
+    ``fields`` name the string columns; ``id`` and ``known_for`` are always
+    stored. Readers of the old file keep their mapping.
+    """
+    strings = _Writer()
+    ids, known_offsets, known_ids = [], [0], []
+    columns = {f: [] for f in fields}
+    for m in musicians:
+        ids.append(int(m["id"]))
+        for f in fields:
+            columns[f].append(strings.intern(m.get(f)))
+        known_ids.extend(strings.intern(k) for k in m.get("known_for") or ())
+        known_offsets.append(len(known_ids))
+
+    n = len(ids)
+    meta = "\0".join([str(version), *fields]).encode("utf-8")
+    parts = [_HEADER.pack(MAGIC, n, len(strings.offsets) - 1, len(known_ids), len(meta)), meta]
+    parts.append(bytes(_pad(_HEADER.size + len(meta))))
+    parts.append(struct.pack(f"<{n}q", *ids))
+    for f in fields:
+        parts.append(struct.pack(f"<{n}I", *columns[f]))
+    parts.append(struct.pack(f"<{n + 1}I", *known_offsets))
+    parts.append(struct.pack(f"<{len(known_ids)}I", *known_ids))
+    parts.append(bytes(_pad(4 * (len(fields) * n + n + 1 + len(known_ids)))))
+    parts.append(struct.pack(f"<{len(strings.offsets)}Q", *strings.offsets))
+    parts.append(bytes(strings.data))
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        for part in parts:
+            f.write(part)
+    os.replace(tmp, path)
+    return n
+
+
+class ColumnarCatalog(Sequence):
+    """Read-only rows over a columnar buffer; ``catalog[i]`` builds that one row's dict."""
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        view = memoryview(buffer)
+        magic, n, n_strings, n_known, meta_len = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError("not a columnar catalog file")
+        at = _HEADER.size
+        self.version, *self.fields = bytes(view[at:at + meta_len]).decode("utf-8").split("\0")
+        at += meta_len + _pad(_HEADER.size + meta_len)
+
+        def section(fmt, count, size):
+            nonlocal at
+            column = view[at:at + count * size].cast(fmt)
+            at += count * size
+            return column
+
+        self.ids = section("q", n, 8)
+        self._columns = {f: section("I", n, 4) for f in self.fields}
+        self._known_offsets = section("I", n + 1, 4)
+        self._known_ids = section("I", n_known, 4)
+        at += _pad(at)
+        self._string_offsets = section("Q", n_strings + 1, 8)
+        self._strings = view[at:]
+        self._len = n
+
+    @classmethod
+    def open(cls, path):
+        with open(path, "rb") as f:
+            # Read-only shared mapping: every process shares the page-cache copy
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def string(self, sid):
+        start, end = self._string_offsets[sid], self._string_offsets[sid + 1]
+        return str(self._strings[start:end], "utf-8")
+
+    def value(self, row, field):
+        """One field of one row without building the dict."""
+        if field == "id":
+            return self.ids[row]
+        if field == "known_for":
+            return [self.string(s) for s in
+                    self._known_ids[self._known_offsets[row]:self._known_offsets[row + 1]]]
+        return self.string(self._columns[field][row])
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(self._len))]
+        if row < 0:
+            row += self._len
+        if not 0 <= row < self._len:
+            raise IndexError(row)
+        musician = {"id": self.ids[row]}
+        for f in self.fields:
+            musician[f] = self.string(self._columns[f][row])
+        musician["known_for"] = self.value(row, "known_for")
+        return musician
+
+    def close(self):
+        for name in ("ids", "_known_offsets", "_known_ids", "_string_offsets", "_strings"):
+            getattr(self, name).release()
+        for column in self._columns.values():
+            column.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+
+def open_version(path, version):
+    """The catalog at ``path`` if it holds ``version``, else None."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return None
+            magic, _, _, _, meta_len = _HEADER.unpack(header)
+            if magic != MAGIC or f.read(meta_len).decode("utf-8").split("\0")[0] != str(version):
+                return None
+    except (OSError, struct.error, UnicodeDecodeError):
+        return None
+    return ColumnarCatalog.open(path)
@@ -0,0 +1,167 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# ─────────────────────────────────────────────────────────────────
+# MYSQL CONNECTION POOL
+# Bounded, thread-safe pool so requests reuse RDS connections
+# instead of paying a TCP + auth handshake every time.
+# ─────────────────────────────────────────────────────────────────
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the timeout."""
+
+
+class ConnectionPool:
+    """Borrow/return pool around a ``connect()`` factory (e.g. pymysql.connect).
+
+    - ``max_size``  — hard cap on open connections (idle + checked out)
+    - ``max_idle``  — extra idle connections above this are closed on return
+    - ``timeout``   — seconds to wait for a free slot before PoolTimeout
+    - ``recycle``   — close connections older than this many seconds
+    """
+
+    def __init__(self, connect, max_size=10, max_idle=5, timeout=5.0, recycle=3600):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self._connect = connect
+        self.max_size = max_size
+        self.max_idle = min(max_idle, max_size)
+        self.timeout = timeout
+        self.recycle = recycle
+        self._idle = deque()             # (conn, created_at)
+        self._created = {}               # id(conn) -> created_at, for checked-out conns
+        self._size = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._stats = {"created": 0, "reused": 0, "discarded": 0, "timeouts": 0, "waits": 0}
+
+    # ── checkout ────────────────────────────────────────────────
+    def acquire(self, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn, created = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    conn = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeout(f"no DB connection available within {timeout}s")
+                self._stats["waits"] += 1
+                self._cond.wait(remaining)
+
+        if conn is not None:
+            if self._is_usable(conn, created):
+                self._created[id(conn)] = created
+                with self._cond:
+                    self._stats["reused"] += 1
+                return conn
+            self._close_quietly(conn)
+            with self._cond:
+                self._stats["discarded"] += 1
+
+        # Open a fresh connection in the slot we reserved above
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        self._created[id(conn)] = time.monotonic()
+        with self._cond:
+            self._stats["created"] += 1
+        return conn
+
+    def _is_usable(self, conn, created):
+        if self.recycle and time.monotonic() - created > self.recycle:
+            return False
+        try:
+            conn.ping(reconnect=True)   # liveness check — reconnects if RDS dropped us
+            return True
+        except Exception:
+            return False
+
+    # ── checkin ─────────────────────────────────────────────────
+    def release(self, conn, discard=False):
+        created = self._created.pop(id(conn), time.monotonic())
+        with self._cond:
+            if discard or len(self._idle) >= self.max_idle:
+                self._size -= 1
+                self._stats["discarded"] += 1
+                close = True
+            else:
+                self._idle.append((conn, created))
+                close = False
+            self._cond.notify()
+        if close:
+            self._close_quietly(conn)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """``with pool.connection() as conn:`` — rolls back and returns on error."""
+        with self.lease(self.acquire(timeout)) as conn:
+            yield conn
+
+    @contextmanager
+    def lease(self, conn):
+        """Return an already-acquired ``conn`` when the block ends — rolls back on error."""
+        try:
+            yield conn
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                self.release(conn, discard=True)
+                raise
+            self.release(conn)
+            raise
+        else:
+            self.release(conn)
+
+    # ── housekeeping ────────────────────────────────────────────
+    def close(self):
+        """Close all idle connections; checked-out ones are still returned normally."""
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    def reset(self):
+        """Forget connections inherited across fork() without closing them.
+
+        Closing would send COM_QUIT over a socket the parent still owns,
+        so a freshly forked worker just starts with an empty pool.
+        """
+        with self._cond:
+            self._idle = deque()
+            self._created = {}
+            self._size = 0
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                **self._stats,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "max_size": self.max_size,
+                "max_idle": self.max_idle,
+            }
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+
+import pymysql
+
+# ─────────────────────────────────────────────────────────────────
+# FEEDBACK EXPORT
+# Streams the whole feedback table with an unbuffered server-side
+# cursor — memory stays flat no matter how many rows there are.
+# ─────────────────────────────────────────────────────────────────
+
+EXPORT_COLUMNS = ("id", "name", "email", "message", "created_at")
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+FETCH_SIZE = 1000
+CHUNK_BYTES = 64 * 1024
+
+
+def export_query(since_id=None, since=None):
+    """Rows in id order; ``since_id``/``since`` are watermarks for incremental pulls."""
+    clauses, args = [], []
+    if since_id is not None:
+        clauses.append("id > %s")
+        args.append(since_id)
+    if since is not None:
+        clauses.append("created_at >= %s")
+        args.append(since)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    return f"SELECT {', '.join(EXPORT_COLUMNS)} FROM feedback{where} ORDER BY id", tuple(args)
+
+
+def iter_rows(conn, since_id=None, since=None):
+    """Yield dict rows from an SSDictCursor, ``FETCH_SIZE`` at a time."""
+    return iter_unbuffered(conn, *export_query(since_id, since))
+
+
+def iter_unbuffered(conn, sql, args=()):
+    """Dict rows of ``sql`` streamed from the server.
+
+    Closing an unbuffered cursor reads every row still in flight, so the
+    cursor is only closed once exhausted — to abandon the stream, close
+    ``conn`` first (the server then stops sending).
+    """
+    cursor = conn.cursor(pymysql.cursors.SSDictCursor)
+    cursor.execute(sql, args)
+    while True:
+        rows = cursor.fetchmany(FETCH_SIZE)
+        if not rows:
+            break
+        yield from rows
+    cursor.close()
+
+
+def _ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, default=str, ensure_ascii=False) + "\n"
+
+
+def _csv(rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        writer.writerow([row[c] for c in EXPORT_COLUMNS])
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def encode(rows, fmt):
+    """Serialized rows batched into ~64 KB byte chunks (fewer, larger socket writes)."""
+    lines = _ndjson(rows) if fmt == "ndjson" else _csv(rows)
+    chunk, size = [], 0
+    for line in lines:
+        data = line.encode("utf-8")
+        chunk.append(data)
+        size += len(data)
+        if size >= CHUNK_BYTES:
+            yield b"".join(chunk)
+            chunk, size = [], 0
+    yield b"".join(chunk)
@@ -0,0 +1,80 @@
+import re
+
+# ─────────────────────────────────────────────────────────────────
+# FEEDBACK SEARCH (moderation)
+# Keyword search over `feedback.message` via the FULLTEXT index
+# (migration 4) and exact email lookups via idx_feedback_email
+# (migration 5). Pages are keyset cursors on (score, id).
+# ─────────────────────────────────────────────────────────────────
+
+SEARCH_COLUMNS = "id, name, email, message, created_at"
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+MIN_TERM_LENGTH = 3         # InnoDB innodb_ft_min_token_size — shorter words aren't indexed
+MAX_TERMS = 8
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def boolean_query(q):
+    """``"late  delivery!"`` → ``"+late +delivery"`` — every word required.
+
+    Operators typed by the user are dropped, so input can't change the
+    query's meaning or trigger a full-index scan with a bare ``*``.
+    """
+    terms = [t for t in _TERM_RE.findall((q or "").lower()) if len(t) >= MIN_TERM_LENGTH]
+    terms = list(dict.fromkeys(terms))[:MAX_TERMS]
+    return " ".join(f"+{t}" for t in terms)
+
+
+def parse_search_args(args):
+    """(match, email, limit, after) from query args — raises ValueError if invalid.
+
+    ``after`` is the ``next_cursor`` of the previous page: ``"<score>,<id>"``.
+    """
+    q = args.get("q", "").strip()
+    email = args.get("email", "").strip().lower() or None
+    match = boolean_query(q)
+    if q and not match:
+        raise ValueError(f"search words must be at least {MIN_TERM_LENGTH} characters")
+    if not match and not email:
+        raise ValueError("q or email is required")
+    limit = min(max(int(args.get("limit", PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    after = args.get("after")
+    if after:
+        score, _, row_id = after.partition(",")
+        after = (float(score), int(row_id))
+    return match or None, email, limit, after or None
+
+
+def search_query(match, email, limit, after=None):
+    """SQL + args for one page, best match first; fetches one extra row to detect more pages.
+
+    Without a keyword, rows match on email alone and come back newest
+    first with a constant score of 0.
+    """
+    if match is None:
+        sql = f"SELECT {SEARCH_COLUMNS}, 0 AS score FROM feedback WHERE email = %s"
+        args = [email]
+        if after is not None:
+            sql += " AND id < %s"
+            args.append(after[1])
+        return sql + " ORDER BY id DESC LIMIT %s", tuple(args + [limit + 1])
+
+    against = "MATCH(message) AGAINST (%s IN BOOLEAN MODE)"
+    sql = f"SELECT {SEARCH_COLUMNS}, {against} AS score FROM feedback WHERE {against}"
+    args = [match, match]
+    if email is not None:
+        sql += " AND email = %s"
+        args.append(email)
+    if after is not None:
+        sql += " HAVING score < %s OR (score = %s AND id < %s)"
+        args += [after[0], after[0], after[1]]
+    return sql + " ORDER BY score DESC, id DESC LIMIT %s", tuple(args + [limit + 1])
+
+
+def search_payload(rows, limit):
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = f"{float(rows[-1]['score'])!r},{rows[-1]['id']}" if has_more else None
+    return {"feedbacks": rows, "total": len(rows), "next_cursor": next_cursor}
@@ -0,0 +1,160 @@
+import random
+from collections import Counter
+from datetime import date, timedelta
+
+# ─────────────────────────────────────────────────────────────────
+# FEEDBACK STATISTICS (rollups)
+# Per-hour counts and per-email totals, bumped in the same transaction
+# as each insert (or write-behind batch), so /feedbacks/stats never
+# scans the raw feedback table. Each hour is spread over SLOTS rows so
+# concurrent inserts don't queue on one row lock; reads sum them. `flask --app app backfill-feedback-stats`
+# rebuilds them from a consistent snapshot in batched id ranges.
+# ─────────────────────────────────────────────────────────────────
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS feedback_daily_stats (
+        day         DATE          NOT NULL,
+        hour        TINYINT       NOT NULL,
+        slot        TINYINT       NOT NULL DEFAULT 0,
+        submissions INT UNSIGNED  NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, hour, slot)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS feedback_submitter_stats (
+        email       VARCHAR(150)  NOT NULL PRIMARY KEY,
+        submissions INT UNSIGNED  NOT NULL DEFAULT 0,
+        last_at     TIMESTAMP     NULL,
+        KEY idx_submitter_stats_submissions (submissions, email)
+    )
+    """,
+]
+
+# NOW() is fixed for the whole statement, so the bucket matches the
+# created_at the same transaction just wrote.
+_BUMP_HOUR_SQL = (
+    "INSERT INTO feedback_daily_stats (day, hour, slot, submissions) VALUES (DATE(NOW()), HOUR(NOW()), %s, %s) "
+    "ON DUPLICATE KEY UPDATE submissions = submissions + VALUES(submissions)"
+)
+_BUMP_SUBMITTER_SQL = (
+    "INSERT INTO feedback_submitter_stats (email, submissions, last_at) VALUES (%s, %s, NOW()) "
+    "ON DUPLICATE KEY UPDATE submissions = submissions + VALUES(submissions), last_at = VALUES(last_at)"
+)
+_ADD_HOUR_SQL = (
+    "INSERT INTO feedback_daily_stats (day, hour, submissions) VALUES (%s, %s, %s) "
+    "ON DUPLICATE KEY UPDATE submissions = submissions + VALUES(submissions)"
+)
+_ADD_SUBMITTER_SQL = (
+    "INSERT INTO feedback_submitter_stats (email, submissions, last_at) VALUES (%s, %s, %s) "
+    "ON DUPLICATE KEY UPDATE submissions = submissions + VALUES(submissions), "
+    "last_at = GREATEST(COALESCE(last_at, VALUES(last_at)), VALUES(last_at))"
+)
+SLOTS = 16          # rows per hour — the row lock is held until commit, so one row serialises inserts
+MAX_DAYS = 366
+MAX_TOP = 100
+
+
+def create_tables(cursor):
+    for ddl in SCHEMA:
+        cursor.execute(ddl)
+
+
+def _email_counts(rows):
+    """(name, email, message) rows → sorted [(email, n)] — a stable lock order across writers."""
+    return sorted(Counter(email.strip().lower() for _, email, _ in rows).items())
+
+
+# ── incremental path ────────────────────────────────────────────
+def record_statements(rows):
+    """[(sql, [args, ...])] that count ``rows`` — shared by the sync and async handlers."""
+    return [
+        (_BUMP_HOUR_SQL, [(random.randrange(SLOTS), len(rows))]),
+        (_BUMP_SUBMITTER_SQL, _email_counts(rows)),
+    ]
+
+
+def record(cursor, rows):
+    """Bump the rollups for freshly inserted ``rows``; call inside the insert's transaction."""
+    for sql, args in record_statements(rows):
+        cursor.executemany(sql, args)
+
+
+# ── reads ───────────────────────────────────────────────────────
+def read_stats(conn, days=14, top=10, today=None):
+    """Hourly + daily volume for the last ``days`` days and the ``top`` submitters."""
+    since = (today or date.today()) - timedelta(days=days - 1)
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT day, hour, SUM(submissions) AS submissions FROM feedback_daily_stats "
+            "WHERE day >= %s GROUP BY day, hour ORDER BY day, hour", (since,)
+        )
+        hourly = cursor.fetchall()
+        cursor.execute(
+            "SELECT email, submissions, last_at FROM feedback_submitter_stats "
+            "ORDER BY submissions DESC, email DESC LIMIT %s", (top,)
+        )
+        submitters = cursor.fetchall()
+
+    hourly = [{**row, "submissions": int(row["submissions"])} for row in hourly]   # SUM() is a Decimal on MySQL
+    daily = {}
+    for row in hourly:
+        daily[row["day"]] = daily.get(row["day"], 0) + row["submissions"]
+    return {
+        "since": since,
+        "daily": [{"day": d, "submissions": n} for d, n in daily.items()],
+        "hourly": hourly,
+        "top_submitters": submitters,
+        "total": sum(daily.values()),
+    }
+
+
+# ── backfill ────────────────────────────────────────────────────
+def backfill(conn, snapshot_conn, batch_size=50_000, progress=None):
+    """Rebuild both rollups from the feedback table; returns rows counted.
+
+    ``snapshot_conn`` is a second connection to the same database. While
+    ``conn`` holds the freshly cleared rollups locked — any insert that
+    has not bumped them yet waits — ``snapshot_conn`` opens a consistent
+    snapshot: exactly the rows whose bumps were just cleared. Batches read
+    that snapshot in primary-key ranges and write in one small transaction
+    each, so rows committed later — even with a lower id — are left to the
+    live insert path and never counted twice. Counts read low until the
+    backfill finishes.
+    """
+    with conn.cursor() as cursor, snapshot_conn.cursor() as snapshot:
+        conn.begin()
+        cursor.execute("DELETE FROM feedback_daily_stats")
+        cursor.execute("DELETE FROM feedback_submitter_stats")
+        snapshot_conn.begin()
+        snapshot.execute("SELECT COALESCE(MAX(id), 0) AS max_id FROM feedback")    # snapshot starts here
+        watermark = snapshot.fetchone()["max_id"]
+        conn.commit()
+
+        try:
+            counted, low = 0, 0
+            while low < watermark:
+                high = min(low + batch_size, watermark)
+                snapshot.execute(
+                    "SELECT DATE(created_at) AS day, HOUR(created_at) AS hour, COUNT(*) AS n "
+                    "FROM feedback WHERE id > %s AND id <= %s GROUP BY 1, 2", (low, high)
+                )
+                hours = snapshot.fetchall()
+                snapshot.execute(
+                    "SELECT LOWER(TRIM(email)) AS email, COUNT(*) AS n, MAX(created_at) AS last_at "
+                    "FROM feedback WHERE id > %s AND id <= %s GROUP BY 1", (low, high)
+                )
+                emails = snapshot.fetchall()
+                conn.begin()
+                if hours:
+                    cursor.executemany(_ADD_HOUR_SQL, [(r["day"], r["hour"], r["n"]) for r in hours])
+                if emails:
+                    cursor.executemany(_ADD_SUBMITTER_SQL, sorted((r["email"], r["n"], r["last_at"]) for r in emails))
+                conn.commit()
+                counted += sum(r["n"] for r in hours)
+                low = high
+                if progress:
+                    progress(counted, low, watermark)
+        finally:
+            snapshot_conn.commit()          # read-only — just ends the snapshot
+    return counted
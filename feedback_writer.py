@@ -0,0 +1,189 @@
+import os
+import queue
+import threading
+import time
+
+# ─────────────────────────────────────────────────────────────────
+# WRITE-BEHIND FEEDBACK INGESTION
+# Requests drop validated feedback into a bounded queue; a background
+# thread writes it to RDS in multi-row batches (one round trip +
+# one commit per batch instead of per submission).
+# ─────────────────────────────────────────────────────────────────
+
+INSERT_SQL = "INSERT INTO feedback (name, email, message) VALUES (%s, %s, %s)"
+
+
+class QueueFull(Exception):
+    """Raised when the write-behind queue is at capacity (backpressure)."""
+
+
+class Ticket:
+    """Handle returned by submit() — lets a caller wait until the row is committed."""
+
+    __slots__ = ("_event", "error")
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.error = None
+
+    def _resolve(self, error=None):
+        self.error = error
+        self._event.set()
+
+    @property
+    def done(self):
+        return self._event.is_set()
+
+    def wait(self, timeout=None):
+        """True once committed; False on timeout. Re-raises a write failure."""
+        if not self._event.wait(timeout):
+            return False
+        if self.error is not None:
+            raise self.error
+        return True
+
+
+class FeedbackWriter:
+    """Bounded queue + flusher thread, flushing on ``batch_size`` or ``flush_interval``."""
+
+    def __init__(self, get_connection, max_queue=10000, batch_size=200,
+                 flush_interval=0.5, max_retries=3, on_flush=None, before_commit=None, on_error=None):
+        self._get_connection = get_connection
+        self._queue = queue.Queue(maxsize=max_queue)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.on_flush = on_flush
+        self.on_error = on_error                # (rows) — a batch given up on after max_retries
+        self.before_commit = before_commit      # (cursor, rows) — runs in the batch's transaction
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stopping = False
+        self._stats = {"queued": 0, "written": 0, "batches": 0, "rejected": 0, "failed": 0}
+
+    # ── producer side ───────────────────────────────────────────
+    def submit(self, row):
+        """Queue ``(name, email, message)``; raises QueueFull instead of blocking."""
+        if self._stopping:
+            raise QueueFull("writer is shutting down")
+        self._ensure_started()
+        ticket = Ticket()
+        try:
+            self._queue.put_nowait((row, ticket))
+        except queue.Full:
+            self._stats["rejected"] += 1
+            raise QueueFull("feedback queue is full") from None
+        self._stats["queued"] += 1
+        return ticket
+
+    def _ensure_started(self):
+        # Started lazily and per-PID so a forked worker gets its own flusher
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="feedback-writer", daemon=True)
+                self._thread.start()
+
+    # ── consumer side ───────────────────────────────────────────
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                if self._stopping:
+                    return
+                continue
+            if first is None:           # shutdown sentinel
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        item = self._queue.get(timeout=remaining)
+                    else:
+                        item = self._queue.get_nowait()   # take what's already queued, don't wait
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+            if stop:
+                self._drain()
+                return
+
+    def _drain(self):
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+        if batch:
+            self._flush(batch)
+
+    def _flush(self, batch):
+        rows = [row for row, _ in batch]
+        error = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self._get_connection() as conn:
+                    if self.before_commit:
+                        conn.begin()
+                    with conn.cursor() as cursor:
+                        cursor.executemany(INSERT_SQL, rows)   # one multi-row INSERT
+                        if self.before_commit:
+                            self.before_commit(cursor, rows)
+                    conn.commit()
+                error = None
+                break
+            except Exception as e:
+                error = e
+                time.sleep(min(0.1 * 2 ** attempt, 2.0))
+        if error is not None:
+            self._stats["failed"] += len(batch)
+            print(f"⚠️  Feedback write-behind failed for {len(batch)} rows: {error}")
+            if self.on_error:
+                try:
+                    self.on_error(rows)
+                except Exception as e:
+                    print(f"⚠️  Feedback on_error hook failed: {e}")
+        else:
+            self._stats["written"] += len(batch)
+            self._stats["batches"] += 1
+            if self.on_flush:
+                try:
+                    self.on_flush(rows)
+                except Exception as e:
+                    print(f"⚠️  Feedback on_flush hook failed: {e}")
+        for _, ticket in batch:
+            ticket._resolve(error)
+
+    # ── lifecycle ───────────────────────────────────────────────
+    def shutdown(self, timeout=10.0):
+        """Stop accepting rows and flush everything already queued."""
+        self._stopping = True
+        thread = self._thread
+        if thread is None or self._pid != os.getpid() or not thread.is_alive():
+            self._drain()
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass                    # flusher still sees _stopping once it empties the queue
+        thread.join(timeout)
+
+    def stats(self):
+        return {**self._stats, "pending": self._queue.qsize(), "capacity": self._queue.maxsize}
@@ -0,0 +1,59 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+# ─────────────────────────────────────────────────────────────────
+# GUNICORN — pre-fork, multi-worker serving for wsgi:application
+# Every knob is overridable from the ECS task definition env vars.
+# ─────────────────────────────────────────────────────────────────
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+worker_class = "gthread"
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", "5"))
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", "0"))
+preload_app = True          # import app.py once in the master, workers share it copy-on-write
+accesslog = "-"
+errorlog = "-"
+
+# Workers publish metric snapshots here so /metrics on any worker shows the whole server
+METRICS_DIR = os.environ.get("METRICS_DIR", os.path.join(tempfile.gettempdir(), f"musicapp-metrics-{bind.rsplit(':', 1)[1]}"))
+METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", "1"))
+
+
+def on_starting(server):
+    """Schema setup is a deploy step (`flask --app app migrate`); MIGRATE_ON_START=1
+    restores the old behaviour of migrating in the master before forking."""
+    shutil.rmtree(METRICS_DIR, ignore_errors=True)     # counts from a previous server run
+    if os.environ.get("MIGRATE_ON_START", "0") == "1":
+        import app
+        app.init_db()
+        app.db_pool.close()     # don't hand the master's connections to forked workers
+
+
+def post_fork(server, worker):
+    """Each worker starts with its own empty DB pool and health monitor."""
+    import app
+    if app.METRICS_ENABLED:
+        app.metrics.share(METRICS_DIR, METRICS_FLUSH_INTERVAL)
+    app.db_pool.reset()
+    if app.read_router is not None:
+        app.read_router.reset()
+    app.db_health.start()
+    app.mark_booted()
+
+
+def worker_exit(server, worker):
+    """Graceful shutdown: flush queued feedback, then close pooled connections."""
+    import app
+    app.metrics.retire()        # final counts move to the archive, so they stay in the totals
+    if app.feedback_writer is not None:
+        app.feedback_writer.shutdown()
+    app.db_pool.close()
+    if app.read_router is not None:
+        app.read_router.close()
@@ -0,0 +1,64 @@
+import os
+import threading
+import time
+
+# ─────────────────────────────────────────────────────────────────
+# BACKGROUND DB HEALTH MONITOR
+# One thread per worker pings RDS on an interval; probes just read
+# the last result, so ALB/ECS health checks never touch the database.
+# ─────────────────────────────────────────────────────────────────
+
+
+class DBHealthMonitor:
+    def __init__(self, check, interval=10.0):
+        self._check = check             # callable that raises if the DB is unhealthy
+        self.interval = interval
+        self.stale_after = interval * 3
+        self._status = {"ok": False, "db": "pending", "checked_at": None, "latency_ms": None}
+        self._checked_mono = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def start(self):
+        """Idempotent, fork-aware: each worker process runs its own monitor thread."""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._stop = threading.Event()
+                self._thread = threading.Thread(target=self._run, name="db-health", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.check_now()
+            self._stop.wait(self.interval)
+
+    def check_now(self):
+        start = time.perf_counter()
+        try:
+            self._check()
+            ok, db = True, "ok"
+        except Exception as e:
+            ok, db = False, f"error: {e}"
+        self._checked_mono = time.monotonic()
+        self._status = {
+            "ok": ok, "db": db, "checked_at": time.time(),
+            "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+
+    def status(self):
+        """Last result plus its age; ``ok`` turns False if the monitor has gone stale."""
+        status = dict(self._status)
+        age = None if self._checked_mono is None else time.monotonic() - self._checked_mono
+        status["age_seconds"] = None if age is None else round(age, 3)
+        if age is not None and age > self.stale_after:
+            status["ok"] = False
+            status["db"] = f"stale: last check {age:.0f}s ago"
+        return status
@@ -0,0 +1,60 @@
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date
+
+from flask.json.provider import DefaultJSONProvider
+
+try:                        # optional accelerated encoder — stdlib json is the fallback
+    import orjson
+except ImportError:
+    orjson = None
+
+# ─────────────────────────────────────────────────────────────────
+# FAST JSON PROVIDER
+# Drop-in for Flask's DefaultJSONProvider: encodes straight to bytes
+# (orjson when installed) and handles datetimes itself, so handlers
+# no longer stringify rows by hand.
+# ─────────────────────────────────────────────────────────────────
+
+
+def _default(o):
+    if isinstance(o, date):                 # datetime too — "2026-01-01 10:00:00", as str() gives
+        return str(o)
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    default = staticmethod(_default)
+
+    def encode(self, obj, pretty=False):
+        """``obj`` as UTF-8 JSON bytes."""
+        if orjson is not None:
+            option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            if pretty:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, default=self.default, option=option)
+        return json.dumps(
+            obj, default=self.default, ensure_ascii=self.ensure_ascii, sort_keys=self.sort_keys,
+            indent=2 if pretty else None, separators=None if pretty else (",", ":"),
+        ).encode("utf-8")
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and set(kwargs) <= {"separators", "indent"}:
+            return self.encode(obj, pretty=bool(kwargs.get("indent"))).decode("utf-8")
+        kwargs.setdefault("default", self.default)
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(self.encode(obj, pretty) + b"\n", mimetype=self.mimetype)
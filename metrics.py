@@ -0,0 +1,325 @@
+import fcntl
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# ─────────────────────────────────────────────────────────────────
+# METRICS
+# Minimal Prometheus-style counters / histograms / gauges rendered in
+# the text exposition format. One lock per metric, no allocations on
+# the hot path beyond the label tuple — cheap enough to leave on.
+#
+# Under gunicorn each worker has its own registry; with ``share(dir)``
+# every worker snapshots it to ``dir`` once a second and a scrape of
+# any worker sums counters and histograms over all of them (gauges
+# get a ``pid`` label instead — pool sizes don't add up meaningfully).
+# Exited workers are folded into one ``archive.json`` so the directory
+# doesn't grow with every recycled worker and a reused pid can't
+# overwrite a dead worker's counts.
+# ─────────────────────────────────────────────────────────────────
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + list(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _fmt(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+    @staticmethod
+    def merge(total, value):
+        return total + value
+
+    def render(self, values=None):
+        lines = self._header()
+        items = (self.snapshot() if values is None else values).items()
+        for labels, value in items:
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_fmt(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}           # labels -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value, *labels):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[i] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, *labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def count(self, *labels):
+        series = self._series.get(labels)
+        return sum(series[:-1]) if series else 0
+
+    def snapshot(self):
+        with self._lock:
+            return {labels: list(series) for labels, series in self._series.items()}
+
+    @staticmethod
+    def merge(total, series):
+        return [a + b for a, b in zip(total, series)]
+
+    def render(self, values=None):
+        lines = self._header()
+        items = (self.snapshot() if values is None else values).items()
+        for labels, series in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += n
+                le = f'le="{_fmt(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, [le])} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_fmt(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class GaugeFunc(_Metric):
+    """Gauge read at scrape time — ``fn()`` returns a number or {label values tuple: number}."""
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, fn, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self.fn = fn
+
+    def snapshot(self):
+        try:
+            values = self.fn()
+        except Exception:
+            return {}
+        return values if isinstance(values, dict) else {(): values}
+
+    def render(self, per_process=None):
+        """``per_process`` ({pid: snapshot}) renders every worker's values with a ``pid`` label."""
+        lines = self._header()
+        if per_process is None:
+            per_process = {None: self.snapshot()}
+        for pid, values in per_process.items():
+            extra = [] if pid is None else [f'pid="{pid}"']
+            for labels, value in values.items():
+                lines.append(f"{self.name}{_labels(self.labelnames, labels, extra)} {_fmt(value)}")
+        return lines
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self.directory = None           # set by share(): snapshots of every worker live here
+        self._flush_lock = threading.Lock()
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, *args, **kwargs):
+        return self.register(Counter(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs):
+        return self.register(Histogram(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs):
+        return self.register(GaugeFunc(*args, **kwargs))
+
+    # ── multi-process (gunicorn workers) ────────────────────────
+    def share(self, directory, interval=1.0):
+        """Publish this process's values to ``directory`` and aggregate everyone's on render.
+
+        Call once per worker after fork. Files left by workers that died
+        without ``retire()`` (SIGKILL, timeout) — including one whose pid
+        this process now has — are folded into the archive first.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        with self._archive_lock(fcntl.LOCK_EX):
+            stale = [pid for pid in self._pids() if pid == os.getpid() or not _alive(pid)]
+            self._fold(stale)
+        self.flush()
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.flush()
+                except OSError:
+                    pass
+
+        threading.Thread(target=loop, name="metrics-flush", daemon=True).start()
+
+    def _path(self, pid):
+        return os.path.join(self.directory, f"metrics-{pid}.json")
+
+    def flush(self):
+        with self._flush_lock:
+            if self.directory is not None:
+                self._write(self._path(os.getpid()), {m.name: m.snapshot() for m in self._metrics})
+
+    @contextmanager
+    def _archive_lock(self, mode):
+        with open(os.path.join(self.directory, "archive.lock"), "a") as f:
+            fcntl.flock(f, mode)
+            yield
+
+    def _pids(self):
+        pids = []
+        for path in glob.glob(os.path.join(self.directory, "metrics-*.json")):
+            try:
+                pids.append(int(os.path.basename(path)[len("metrics-"):-len(".json")]))
+            except ValueError:
+                continue                # a stray file
+        return pids
+
+    @staticmethod
+    def _read(path):
+        """{metric name: {labels: value}}, or None if missing or mid-write."""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (ValueError, OSError):
+            return None
+        return {name: {tuple(labels): value for labels, value in series} for name, series in data.items()}
+
+    @staticmethod
+    def _write(path, values):
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({name: [[list(labels), value] for labels, value in series.items()]
+                       for name, series in values.items()}, f)
+        os.replace(tmp, path)
+
+    def _fold(self, pids):
+        """Add these workers' counters and histograms to the archive and drop their files.
+
+        Caller holds the exclusive archive lock, so a scrape sees a worker
+        either in its own file or in the archive, never both.
+        """
+        if not pids:
+            return
+        archive_path = os.path.join(self.directory, "archive.json")
+        archive = self._read(archive_path) or {}
+        for pid in pids:
+            for metric in self._metrics:
+                if isinstance(metric, GaugeFunc):
+                    continue
+                totals = archive.setdefault(metric.name, {})
+                for labels, value in (self._read(self._path(pid)) or {}).get(metric.name, {}).items():
+                    totals[labels] = metric.merge(totals[labels], value) if labels in totals else value
+        self._write(archive_path, archive)
+        for pid in pids:
+            try:
+                os.remove(self._path(pid))
+            except FileNotFoundError:
+                pass
+
+    def retire(self):
+        """Final flush on worker exit: fold this process's counts into the archive."""
+        with self._flush_lock:
+            if self.directory is None:
+                return
+            with self._archive_lock(fcntl.LOCK_EX):
+                self._write(self._path(os.getpid()), {m.name: m.snapshot() for m in self._metrics})
+                self._fold([os.getpid()])
+            self.directory = None       # the flush thread must not publish a file nobody reaps
+
+    def _load(self):
+        """({pid: {metric name: {labels: value}}} for live files, archived totals)."""
+        with self._archive_lock(fcntl.LOCK_SH):
+            workers = {}
+            for pid in self._pids():
+                values = self._read(self._path(pid))
+                if values is not None:          # a worker mid-write
+                    workers[pid] = values
+            archived = self._read(os.path.join(self.directory, "archive.json")) or {}
+        return workers, archived
+
+    def render(self):
+        if self.directory is None:
+            lines = []
+            for metric in self._metrics:
+                lines.extend(metric.render())
+            return "\n".join(lines) + "\n"
+
+        self.flush()                    # this worker's numbers are never stale
+        workers, archived = self._load()
+        lines = []
+        for metric in self._metrics:
+            if isinstance(metric, GaugeFunc):
+                lines.extend(metric.render({pid: values.get(metric.name, {})
+                                            for pid, values in sorted(workers.items()) if _alive(pid)}))
+                continue
+            totals = dict(archived.get(metric.name, {}))
+            for values in workers.values():
+                for labels, value in values.get(metric.name, {}).items():
+                    totals[labels] = metric.merge(totals[labels], value) if labels in totals else value
+            lines.extend(metric.render(totals))
+        return "\n".join(lines) + "\n"
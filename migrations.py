@@ -0,0 +1,148 @@
+from collections import namedtuple
+
+import catalog
+import feedback_stats
+
+# ─────────────────────────────────────────────────────────────────
+# SCHEMA MIGRATIONS
+# Ordered, versioned schema changes recorded in `schema_migrations`.
+# Run once per deploy (`flask --app app migrate`), not on every boot.
+# Each step is idempotent so databases created by the old init_db()
+# adopt the history without errors.
+# ─────────────────────────────────────────────────────────────────
+
+MIGRATIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version    INT           PRIMARY KEY,
+        name       VARCHAR(200)  NOT NULL,
+        applied_at TIMESTAMP     DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+LOCK_NAME = "musicapp_schema_migrations"     # MySQL named lock — one migrator at a time
+
+Migration = namedtuple("Migration", "version name apply")
+MIGRATIONS = []
+
+
+class MigrationLockTimeout(RuntimeError):
+    pass
+
+
+def migration(version, name):
+    def register(fn):
+        MIGRATIONS.append(Migration(version, name, fn))
+        MIGRATIONS.sort(key=lambda m: m.version)
+        return fn
+    return register
+
+
+def ensure_index(cursor, table, name, columns, kind="INDEX"):
+    """MySQL has no CREATE INDEX IF NOT EXISTS — check information_schema first."""
+    cursor.execute(
+        "SELECT 1 FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s LIMIT 1",
+        (table, name)
+    )
+    if not cursor.fetchone():
+        cursor.execute(f"CREATE {kind} {name} ON {table} {columns}")
+
+
+# ── history ─────────────────────────────────────────────────────
+@migration(1, "create feedback table")
+def _feedback_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS feedback (
+            id         INT AUTO_INCREMENT PRIMARY KEY,
+            name       VARCHAR(100)  NOT NULL,
+            email      VARCHAR(150)  NOT NULL,
+            message    TEXT          NOT NULL,
+            created_at TIMESTAMP     DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+@migration(2, "index feedback on (created_at, id)")
+def _feedback_created_at_index(cursor):
+    # /feedbacks pages newest-first on (created_at, id) — avoid a filesort
+    ensure_index(cursor, "feedback", "idx_feedback_created_at", "(created_at, id)")
+
+
+@migration(3, "musician catalog tables")
+def _catalog_tables(cursor):
+    catalog.create_tables(cursor)
+
+
+@migration(4, "FULLTEXT index on feedback.message")
+def _feedback_message_fulltext(cursor):
+    # /feedbacks/search — MATCH(message) AGAINST (...). Note: MySQL can't
+    # partition a table that has a FULLTEXT index.
+    ensure_index(cursor, "feedback", "ftx_feedback_message", "(message)", kind="FULLTEXT INDEX")
+
+
+@migration(5, "index feedback on (email, id)")
+def _feedback_email_index(cursor):
+    # /feedbacks/search?email= — equality on email, newest id first
+    ensure_index(cursor, "feedback", "idx_feedback_email", "(email, id)")
+
+
+@migration(6, "feedback rollup tables")
+def _feedback_stats_tables(cursor):
+    # Empty on creation — fill with `flask --app app backfill-feedback-stats`
+    feedback_stats.create_tables(cursor)
+
+
+@migration(7, "spread hourly feedback rollups over slot rows")
+def _feedback_stats_slots(cursor):
+    # One row per hour made every insert wait on the same row lock; existing counts become slot 0
+    cursor.execute(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_schema = DATABASE() AND table_name = 'feedback_daily_stats' AND column_name = 'slot'"
+    )
+    if not cursor.fetchone():
+        cursor.execute(
+            "ALTER TABLE feedback_daily_stats ADD COLUMN slot TINYINT NOT NULL DEFAULT 0 AFTER hour, "
+            "DROP PRIMARY KEY, ADD PRIMARY KEY (day, hour, slot)"
+        )
+
+
+# ── runner ──────────────────────────────────────────────────────
+def applied_versions(cursor):
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row["version"] for row in cursor.fetchall()}
+
+
+def status(conn):
+    """[(Migration, applied: bool)] in version order."""
+    with conn.cursor() as cursor:
+        cursor.execute(MIGRATIONS_TABLE)
+        applied = applied_versions(cursor)
+    return [(m, m.version in applied) for m in MIGRATIONS]
+
+
+def migrate(conn, lock_timeout=60, progress=None):
+    """Apply pending migrations in order; returns the ones applied this run.
+
+    Holds a MySQL named lock so two tasks deploying at once don't race —
+    the second waits, then finds nothing left to do.
+    """
+    done = []
+    with conn.cursor() as cursor:
+        cursor.execute(MIGRATIONS_TABLE)
+        cursor.execute("SELECT GET_LOCK(%s, %s) AS locked", (LOCK_NAME, lock_timeout))
+        if (cursor.fetchone() or {}).get("locked") != 1:
+            raise MigrationLockTimeout(f"another migration holds {LOCK_NAME!r}")
+        try:
+            applied = applied_versions(cursor)
+            for m in MIGRATIONS:
+                if m.version in applied:
+                    continue
+                m.apply(cursor)         # MySQL DDL commits implicitly — record right after
+                cursor.execute(
+                    "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (m.version, m.name))
+                conn.commit()
+                done.append(m)
+                if progress:
+                    progress(m)
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+    return done
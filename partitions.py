@@ -0,0 +1,261 @@
+import gzip
+import os
+import zlib
+from collections import namedtuple
+from datetime import date, datetime
+
+import export
+
+# ─────────────────────────────────────────────────────────────────
+# FEEDBACK PARTITIONING + ARCHIVAL (opt-in)
+# Monthly RANGE partitions on created_at keep the hot table small:
+# future months are pre-created, old months are streamed to gzipped
+# NDJSON and dropped — a metadata-only change, no row-by-row delete.
+#
+# MySQL can't partition a table with a FULLTEXT index, so converting
+# means dropping ftx_feedback_message: /feedbacks/search then only
+# supports ?email=. Unpartitioned tables can still be archived, in
+# small delete batches.
+# ─────────────────────────────────────────────────────────────────
+
+TABLE = "feedback"
+FULLTEXT_INDEX = "ftx_feedback_message"
+MAXVALUE = "pmax"
+
+Partition = namedtuple("Partition", "name upper rows")     # upper: exclusive bound as a date, None for pmax
+
+
+class PartitioningError(RuntimeError):
+    pass
+
+
+def month_start(d):
+    return date(d.year, d.month, 1)
+
+
+def add_months(d, months):
+    index = d.year * 12 + d.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    """Partition holding ``month`` — p202610 for October 2026."""
+    return f"p{month.year:04d}{month.month:02d}"
+
+
+def _bound(month):
+    # created_at is a TIMESTAMP, which RANGE partitioning only accepts through UNIX_TIMESTAMP()
+    return f"VALUES LESS THAN (UNIX_TIMESTAMP('{add_months(month, 1):%Y-%m-%d} 00:00:00'))"
+
+
+def _definitions(first, last):
+    months, month = [], month_start(first)
+    while month <= last:
+        months.append(f"PARTITION {partition_name(month)} {_bound(month)}")
+        month = add_months(month, 1)
+    return months
+
+
+def partition_sql(first_month, months_ahead, today=None):
+    """ALTER TABLE that converts feedback to monthly partitions, ``first_month`` → today + ahead.
+
+    The partitioning column must be part of every unique key, so the
+    primary key becomes (id, created_at) — id stays AUTO_INCREMENT.
+    """
+    last = add_months(month_start(today or date.today()), months_ahead)
+    partitions = _definitions(first_month, last) + [f"PARTITION {MAXVALUE} VALUES LESS THAN MAXVALUE"]
+    return (
+        f"ALTER TABLE {TABLE} "
+        "MODIFY created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+        "DROP PRIMARY KEY, ADD PRIMARY KEY (id, created_at) "
+        "PARTITION BY RANGE (UNIX_TIMESTAMP(created_at)) (\n    "
+        + ",\n    ".join(partitions) + "\n)"
+    )
+
+
+def list_partitions(cursor):
+    """[Partition] in order, or [] if the table isn't partitioned."""
+    cursor.execute(
+        # Bounds decoded by MySQL, in the same session time zone that encoded them
+        "SELECT partition_name AS name, table_rows AS `rows`, "
+        "CASE WHEN partition_description = 'MAXVALUE' THEN NULL "
+        "ELSE DATE(FROM_UNIXTIME(partition_description)) END AS upper "
+        "FROM information_schema.partitions "
+        "WHERE table_schema = DATABASE() AND table_name = %s AND partition_name IS NOT NULL "
+        "ORDER BY partition_ordinal_position", (TABLE,)
+    )
+    return [Partition(row["name"], row["upper"], row["rows"]) for row in cursor.fetchall()]
+
+
+def partition_table(conn, months_ahead=3, drop_fulltext=False, dry_run=False, today=None):
+    """One-off conversion; returns the partitioning ALTER.
+
+    It rebuilds the table — on a large one run it in a quiet window, or
+    take the ``dry_run`` SQL to an online schema-change tool.
+    """
+    with conn.cursor() as cursor:
+        if list_partitions(cursor):
+            raise PartitioningError("feedback is already partitioned")
+        cursor.execute(
+            "SELECT 1 FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s LIMIT 1",
+            (TABLE, FULLTEXT_INDEX)
+        )
+        has_fulltext = cursor.fetchone() is not None
+        if has_fulltext and not drop_fulltext:
+            raise PartitioningError(
+                f"MySQL can't partition a table with a FULLTEXT index — pass --drop-fulltext to "
+                f"drop {FULLTEXT_INDEX} (keyword search in /feedbacks/search stops working)")
+        cursor.execute(f"SELECT MIN(created_at) AS oldest FROM {TABLE}")
+        oldest = cursor.fetchone()["oldest"]
+        first = month_start(oldest.date() if oldest else (today or date.today()))
+        sql = partition_sql(first, months_ahead, today)
+        if dry_run:
+            return sql
+        if has_fulltext:
+            cursor.execute(f"ALTER TABLE {TABLE} DROP INDEX {FULLTEXT_INDEX}")
+        cursor.execute(sql)
+    return sql
+
+
+def ensure_future_partitions(conn, months_ahead=3, today=None):
+    """Split the empty catch-all partition so the next ``months_ahead`` months exist.
+
+    REORGANIZE of an empty pmax is metadata-only — cheap enough for a
+    daily cron. Returns the partition names created.
+    """
+    with conn.cursor() as cursor:
+        partitions = list_partitions(cursor)
+        if not partitions:
+            raise PartitioningError("feedback isn't partitioned — run partition-feedback first")
+        bounded = [p for p in partitions if p.upper is not None]
+        next_month = bounded[-1].upper if bounded else month_start(today or date.today())
+        last = add_months(month_start(today or date.today()), months_ahead)
+        new = _definitions(next_month, last)
+        if not new:
+            return []
+        cursor.execute(
+            f"ALTER TABLE {TABLE} REORGANIZE PARTITION {MAXVALUE} INTO (\n    "
+            + ",\n    ".join(new + [f"PARTITION {MAXVALUE} VALUES LESS THAN MAXVALUE"]) + "\n)"
+        )
+    return [d.split()[1] for d in new]
+
+
+# ── archival ────────────────────────────────────────────────────
+def _write_archive(path, rows):
+    """Stream ``rows`` to ``path`` as gzipped NDJSON; returns the row count.
+
+    Written to a temp file, fsynced and renamed, so a crash never leaves a
+    truncated archive behind a dropped partition.
+    """
+    count = 0
+
+    def counted(rows):
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as gz:
+            for chunk in export.encode(counted(rows), "ndjson"):
+                gz.write(chunk)
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp, path)
+    return count
+
+
+def archive_partitions(conn, open_conn, directory, before, progress=None):
+    """Archive + drop every monthly partition entirely older than ``before``.
+
+    ``open_conn`` opens the unbuffered connection the rows stream through.
+    Returns [(partition name, rows archived)].
+    """
+    with conn.cursor() as cursor:
+        old = [p for p in list_partitions(cursor) if p.upper is not None and p.upper <= before]
+    done = []
+    for partition in old:
+        path = os.path.join(directory, f"{TABLE}-{partition.name}.ndjson.gz")
+        stream_conn = open_conn()
+        try:
+            rows = _iter_partition(stream_conn, partition.name)
+            count = _write_archive(path, rows)
+        finally:
+            stream_conn.close()
+        with conn.cursor() as cursor:
+            # Metadata-only; the brief metadata lock is the only lock taken
+            cursor.execute(f"ALTER TABLE {TABLE} DROP PARTITION {partition.name}")
+        done.append((partition.name, count))
+        if progress:
+            progress(partition.name, count, path)
+    return done
+
+
+def _iter_partition(conn, name):
+    return export.iter_unbuffered(
+        conn, f"SELECT {', '.join(export.EXPORT_COLUMNS)} FROM {TABLE} PARTITION ({name}) ORDER BY id")
+
+
+def _intact_length(path):
+    """Bytes at the start of ``path`` that form complete gzip members.
+
+    A crash mid-append leaves a torn member after them; its rows were
+    never deleted, so the re-run truncates it and archives them again.
+    """
+    intact = offset = 0
+    member = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            while chunk:
+                member.decompress(chunk)
+                if not member.eof:
+                    offset += len(chunk)
+                    break
+                offset += len(chunk) - len(member.unused_data)
+                intact = offset
+                chunk = member.unused_data
+                member = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    return intact
+
+
+def archive_rows(conn, directory, before, batch_size=5000, progress=None):
+    """Unpartitioned fallback: move rows older than ``before`` out in small batches.
+
+    Each batch is appended as its own complete gzip member and fsynced
+    before its DELETE commits, so rows are never lost — a crash may at
+    worst archive a batch twice. Returns rows archived.
+    """
+    path = os.path.join(directory, f"{TABLE}-before-{before:%Y-%m-%d}.ndjson.gz")
+    cutoff = datetime(before.year, before.month, before.day)
+    total = 0
+    with open(path, "ab") as raw:
+        intact = _intact_length(path)
+        if intact < raw.tell():
+            print(f"⚠️  {path}: dropping {raw.tell() - intact} bytes of an interrupted batch")
+            raw.truncate(intact)
+            raw.seek(intact)
+        while True:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT {', '.join(export.EXPORT_COLUMNS)} FROM {TABLE} "
+                    "WHERE created_at < %s ORDER BY created_at, id LIMIT %s", (cutoff, batch_size)
+                )
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                with gzip.GzipFile(fileobj=raw, mode="wb") as gz:      # closing writes the trailer
+                    for chunk in export.encode(rows, "ndjson"):
+                        gz.write(chunk)
+                raw.flush()
+                os.fsync(raw.fileno())
+                cursor.execute(
+                    f"DELETE FROM {TABLE} WHERE id IN ({', '.join(['%s'] * len(rows))})",
+                    [r["id"] for r in rows]
+                )
+                conn.commit()
+            total += len(rows)
+            if progress:
+                progress(None, total, path)
+    return total
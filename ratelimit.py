@@ -0,0 +1,104 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from cache import TTLCache
+
+# ─────────────────────────────────────────────────────────────────
+# RATE LIMITING + DUPLICATE SUPPRESSION
+# Token buckets keyed by client IP / email, and a short-window content
+# hash cache — abusive or repeated submissions never reach RDS.
+# ─────────────────────────────────────────────────────────────────
+
+
+def parse_rate(spec):
+    """``"10/60"`` → (capacity=10, refill per second=10/60)."""
+    count, _, seconds = spec.partition("/")
+    capacity = float(count)
+    return capacity, capacity / float(seconds or 1)
+
+
+class MemoryStorage:
+    """Per-process bucket state, LRU-bounded so a flood of keys can't grow it forever."""
+
+    def __init__(self, max_keys=100_000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()           # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate, cost=1.0):
+        """Spend ``cost`` tokens; returns (allowed, seconds until enough tokens)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (cost - tokens) / rate
+
+
+class RedisStorage:
+    """Shared bucket state across workers/tasks — ``client`` is a redis-py client."""
+
+    _SCRIPT = """
+    local capacity, rate, cost, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + (now - updated) * rate)
+    local allowed = 0
+    if tokens >= cost then tokens = tokens - cost; allowed = 1 end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, client, prefix="ratelimit:"):
+        self.prefix = prefix
+        self._script = client.register_script(self._SCRIPT)
+
+    def take(self, key, capacity, rate, cost=1.0):
+        allowed, tokens = self._script(keys=[self.prefix + key], args=[capacity, rate, cost, time.time()])
+        tokens = float(tokens)
+        return bool(allowed), 0.0 if allowed else (cost - tokens) / rate
+
+
+class TokenBucketLimiter:
+    def __init__(self, storage, capacity, rate):
+        self.storage = storage
+        self.capacity = capacity
+        self.rate = rate
+
+    def hit(self, key):
+        """(allowed, retry_after_seconds) for one request by ``key``."""
+        return self.storage.take(key, self.capacity, self.rate)
+
+
+class DuplicateFilter:
+    """Rejects an exact (email, message) resubmission within ``window`` seconds."""
+
+    def __init__(self, window=600, max_entries=10_000):
+        self._seen = TTLCache(ttl=window, max_entries=max_entries)
+
+    @staticmethod
+    def fingerprint(email, message):
+        normalized = f"{email.strip().lower()}\0{' '.join(message.split())}"
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def check_and_mark(self, email, message):
+        """True if this content is new (and now remembered), False if it's a repeat."""
+        return self._seen.add(self.fingerprint(email, message), True)
+
+    def forget(self, email, message):
+        """Un-mark content whose write failed so the user can retry."""
+        self._seen.delete(self.fingerprint(email, message))
+
+
+def retry_after_header(seconds):
+    return str(max(1, math.ceil(seconds)))
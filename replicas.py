@@ -0,0 +1,111 @@
+import itertools
+import threading
+import time
+
+from db_pool import PoolTimeout
+
+# ─────────────────────────────────────────────────────────────────
+# READ REPLICA ROUTING
+# Read-only queries go to RDS read replicas (DB_READ_HOSTS), picked
+# round-robin or by lowest checkout latency. A replica that fails to
+# connect sits out for a cooldown; with none reachable, callers fall
+# back to the primary.
+# ─────────────────────────────────────────────────────────────────
+
+STRATEGIES = ("round_robin", "least_latency")
+
+
+class Replica:
+    def __init__(self, host, pool):
+        self.host = host
+        self.pool = pool
+        self.latency = None             # EWMA of checkout time (ping / connect), seconds
+        self.down_until = 0.0
+        self.error = None
+        self.checkouts = 0
+        self.failures = 0
+
+
+class ReplicaRouter:
+    def __init__(self, replicas, strategy="round_robin", cooldown=30.0, smoothing=0.2, acquire_timeout=0.0):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"strategy must be one of {STRATEGIES}")
+        self.replicas = list(replicas)
+        self.strategy = strategy
+        self.cooldown = cooldown
+        self.acquire_timeout = acquire_timeout  # a full replica pool is skipped, not waited on
+        self.smoothing = smoothing
+        self.fallbacks = 0              # reads that had to go to the primary
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    def candidates(self):
+        """Healthy replicas (or ones whose cooldown is over) in preference order."""
+        now = time.monotonic()
+        healthy = [r for r in self.replicas if r.down_until <= now]
+        if self.strategy == "least_latency":
+            # Unmeasured replicas sort first so each one gets probed
+            return sorted(healthy, key=lambda r: -1.0 if r.latency is None else r.latency)
+        if not healthy:
+            return []
+        start = next(self._turn) % len(healthy)
+        return healthy[start:] + healthy[:start]
+
+    def checkout(self):
+        """(pool, conn) from the preferred reachable replica, or None → use the primary."""
+        for replica in self.candidates():
+            start = time.perf_counter()
+            try:
+                conn = replica.pool.acquire(timeout=self.acquire_timeout)
+            except PoolTimeout:
+                continue                # busy, not broken — try the next one
+            except Exception as e:
+                self.mark_down(replica, e)
+                continue
+            self._observe(replica, time.perf_counter() - start)
+            return replica.pool, conn
+        with self._lock:
+            self.fallbacks += 1
+        return None
+
+    def mark_down(self, replica, error):
+        with self._lock:
+            replica.down_until = time.monotonic() + self.cooldown
+            replica.error = str(error)
+            replica.failures += 1
+        print(f"⚠️  Read replica {replica.host} unavailable for {self.cooldown:.0f}s: {error}")
+
+    def _observe(self, replica, seconds):
+        with self._lock:
+            replica.checkouts += 1
+            replica.error = None
+            replica.latency = seconds if replica.latency is None else (
+                replica.latency + self.smoothing * (seconds - replica.latency))
+
+    # ── housekeeping (mirrors ConnectionPool) ───────────────────
+    def close(self):
+        for replica in self.replicas:
+            replica.pool.close()
+
+    def reset(self):
+        for replica in self.replicas:
+            replica.pool.reset()
+
+    def stats(self):
+        now = time.monotonic()
+        return {
+            "strategy": self.strategy,
+            "fallbacks": self.fallbacks,
+            "replicas": [
+                {
+                    "host": r.host,
+                    "healthy": r.down_until <= now,
+                    "latency_ms": None if r.latency is None else round(r.latency * 1000, 2),
+                    "checkouts": r.checkouts,
+                    "failures": r.failures,
+                    "error": r.error,
+                    "pool": r.pool.stats(),
+                }
+                for r in self.replicas
+            ],
+        }
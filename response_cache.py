@@ -0,0 +1,346 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+
+from cache import TTLCache
+
+# ─────────────────────────────────────────────────────────────────
+# RESPONSE CACHE
+# Encoded response bodies behind a pluggable backend:
+#   local — per-process LRU (default)
+#   mmap  — one shared-memory file for every worker on the host
+#   redis — a network cache shared by every task
+# Invalidation bumps a per-namespace generation stored in the backend,
+# so one insert invalidates every worker at once. Concurrent misses
+# for the same key are coalesced into a single computation.
+# ─────────────────────────────────────────────────────────────────
+
+
+class LocalBackend:
+    shared = False
+
+    def __init__(self, max_entries=2048):
+        self._values = TTLCache(ttl=60, max_entries=max_entries)
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self._values.get(key, None)
+
+    def set(self, key, value, ttl):
+        self._values.set(key, value, ttl=ttl)
+
+    def add(self, key, value, ttl):
+        return self._values.add(key, value, ttl=ttl)
+
+    def delete(self, key):
+        self._values.delete(key)
+
+    def counter(self, key):
+        return self._counters.get(key, 0)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+
+class MmapBackend:
+    """Direct-mapped slots in a shared file (e.g. under /dev/shm).
+
+    Every slot holds one entry; a colliding key simply replaces it, as in
+    any cache. Writers take an exclusive ``flock`` and readers a shared
+    one; values bigger than a slot are not cached.
+    """
+
+    shared = True
+    _HEADER = struct.Struct("<8sII")            # magic, slots, slot_bytes
+    _COUNTER = struct.Struct("<16sq")           # key digest, value
+    _ENTRY = struct.Struct("<16sdI")            # key digest, expires (wall clock), length
+    MAGIC = b"MUSICRC1"
+    COUNTERS = 64
+
+    def __init__(self, path, slots=1024, slot_bytes=128 * 1024):
+        self.path = path
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.max_value = slot_bytes - self._ENTRY.size
+        self._counters_at = self._HEADER.size
+        self._slots_at = self._counters_at + self.COUNTERS * self._COUNTER.size
+        self.size = self._slots_at + slots * slot_bytes
+        self._pid = None
+        self._open()
+
+    def _open(self):
+        # Per process: an inherited fd would share the parent's flock
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_size != self.size:
+                os.ftruncate(fd, 0)             # new or differently sized — start empty
+                os.ftruncate(fd, self.size)
+                os.pwrite(fd, self._HEADER.pack(self.MAGIC, self.slots, self.slot_bytes), 0)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        self._fd = fd
+        self._map = mmap.mmap(fd, self.size)
+        self._thread_lock = threading.Lock()    # flock doesn't exclude threads sharing the fd
+        self._pid = os.getpid()
+
+    def _locked(self, exclusive):
+        if self._pid != os.getpid():
+            self._open()
+        return _FileLock(self._fd, self._thread_lock, exclusive)
+
+    @staticmethod
+    def _digest(key):
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+    def _slot(self, digest):
+        return self._slots_at + int.from_bytes(digest[:8], "little") % self.slots * self.slot_bytes
+
+    def _read(self, digest, now):
+        at = self._slot(digest)
+        stored, expires, length = self._ENTRY.unpack_from(self._map, at)
+        if stored != digest or expires <= now:
+            return None
+        start = at + self._ENTRY.size
+        return self._map[start:start + length]
+
+    def _write(self, digest, value, ttl):
+        at = self._slot(digest)
+        self._ENTRY.pack_into(self._map, at, digest, time.time() + ttl, len(value))
+        start = at + self._ENTRY.size
+        self._map[start:start + len(value)] = value
+
+    def get(self, key):
+        digest = self._digest(key)
+        with self._locked(exclusive=False):
+            return self._read(digest, time.time())
+
+    def set(self, key, value, ttl):
+        if len(value) > self.max_value:
+            return
+        digest = self._digest(key)
+        with self._locked(exclusive=True):
+            self._write(digest, value, ttl)
+
+    def add(self, key, value, ttl):
+        digest = self._digest(key)
+        with self._locked(exclusive=True):
+            if self._read(digest, time.time()) is not None:
+                return False
+            self._write(digest, value, ttl)
+            return True
+
+    def delete(self, key):
+        digest = self._digest(key)
+        with self._locked(exclusive=True):
+            at = self._slot(digest)
+            if self._ENTRY.unpack_from(self._map, at)[0] == digest:
+                self._ENTRY.pack_into(self._map, at, bytes(16), 0.0, 0)
+
+    def _find_counter(self, digest, claim):
+        for i in range(self.COUNTERS):
+            at = self._counters_at + i * self._COUNTER.size
+            stored, value = self._COUNTER.unpack_from(self._map, at)
+            if stored == digest:
+                return at, value
+            if stored == bytes(16) and claim:
+                self._COUNTER.pack_into(self._map, at, digest, 0)
+                return at, 0
+        if claim:
+            raise RuntimeError("response cache counter table is full")
+        return None, 0
+
+    def counter(self, key):
+        with self._locked(exclusive=False):
+            return self._find_counter(self._digest(key), claim=False)[1]
+
+    def incr(self, key):
+        digest = self._digest(key)
+        with self._locked(exclusive=True):
+            at, value = self._find_counter(digest, claim=True)
+            self._COUNTER.pack_into(self._map, at, digest, value + 1)
+            return value + 1
+
+
+class _FileLock:
+    def __init__(self, fd, thread_lock, exclusive):
+        self._fd = fd
+        self._thread_lock = thread_lock
+        self._mode = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        fcntl.flock(self._fd, self._mode)
+
+    def __exit__(self, *exc):
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+        return False
+
+
+class RedisBackend:
+    """Any redis-py compatible client (get / set(ex|px, nx) / incr / delete)."""
+
+    shared = True
+
+    def __init__(self, client, prefix="musicapp:rc:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, value, px=max(1, int(ttl * 1000)))
+
+    def add(self, key, value, ttl):
+        return bool(self.client.set(self.prefix + key, value, px=max(1, int(ttl * 1000)), nx=True))
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def counter(self, key):
+        return int(self.client.get(self.prefix + key) or 0)
+
+    def incr(self, key):
+        return self.client.incr(self.prefix + key)
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResponseCache:
+    """Cached bytes per (namespace, key) over one backend.
+
+    A failing backend (Redis down, say) never fails the request: errors
+    are logged and counted, lookups become misses and values are computed
+    without being stored.
+    """
+
+    ERROR_LOG_INTERVAL = 30.0           # seconds between repeated backend-error warnings
+
+    def __init__(self, backend, default_ttl=30.0, lock_ttl=10.0, poll_interval=0.02):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self.lock_ttl = lock_ttl            # cross-process compute lock; also the longest a follower waits
+        self.poll_interval = poll_interval
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        self._logged_error_at = None
+        self.stats = {"hit": 0, "miss": 0, "coalesced": 0, "error": 0}
+
+    def _call(self, op, *args, default=None):
+        """``backend.op(*args)``, or ``default`` if the backend fails."""
+        try:
+            return getattr(self.backend, op)(*args)
+        except Exception as e:
+            self.stats["error"] += 1
+            now = time.monotonic()
+            if self._logged_error_at is None or now - self._logged_error_at >= self.ERROR_LOG_INTERVAL:
+                self._logged_error_at = now
+                print(f"⚠️  Response cache backend {op} failed, serving uncached: {e}")
+            return default
+
+    # ── keys + generations ──────────────────────────────────────
+    def generation(self, namespace):
+        """Current generation of ``namespace``, or None if the backend can't say."""
+        return self._call("counter", f"gen:{namespace}")
+
+    def invalidate(self, namespace):
+        """Drop every cached entry in ``namespace`` — in every process sharing the backend."""
+        self._call("incr", f"gen:{namespace}")
+
+    @staticmethod
+    def _key(namespace, generation, key):
+        return f"{namespace}:{generation}:{key!r}"
+
+    # ── plain get / set (async callers) ─────────────────────────
+    def get(self, namespace, key):
+        generation = self.generation(namespace)
+        value = None if generation is None else self._call("get", self._key(namespace, generation, key))
+        self.stats["hit" if value is not None else "miss"] += 1
+        return value
+
+    def set(self, namespace, key, value, ttl=None, generation=None):
+        """Store under ``generation`` (read before computing) so a value computed across an
+        invalidation lands under the old generation and is never served."""
+        generation = self.generation(namespace) if generation is None else generation
+        if generation is not None:
+            self._call("set", self._key(namespace, generation, key), value, ttl or self.default_ttl)
+
+    # ── single-flight ───────────────────────────────────────────
+    def get_or_compute(self, namespace, key, compute, ttl=None):
+        """Cached bytes for ``key``, else ``compute()`` — once, however many callers miss together."""
+        generation = self.generation(namespace)
+        if generation is None:
+            self.stats["miss"] += 1
+            return compute()
+        full_key = self._key(namespace, generation, key)
+        value = self._call("get", full_key)
+        if value is not None:
+            self.stats["hit"] += 1
+            return value
+
+        with self._flights_lock:
+            flight = self._flights.get(full_key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[full_key] = _Flight()
+        if not leader:
+            self.stats["coalesced"] += 1
+            if not flight.done.wait(self.lock_ttl):
+                return compute()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        self.stats["miss"] += 1
+        try:
+            flight.value = self._compute_once(full_key, compute, ttl or self.default_ttl)
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                self._flights.pop(full_key, None)
+            flight.done.set()
+
+    def _compute_once(self, full_key, compute, ttl):
+        # Other processes: whoever takes the lock computes, the rest poll for its result
+        # until it appears — or the lock goes away without one (the leader failed, or
+        # the value didn't fit the backend), and they compute it themselves.
+        lock_key = f"lock:{full_key}"
+        shared = self.backend.shared
+        owns_lock = shared and self._call("add", lock_key, b"1", self.lock_ttl, default=None)
+        if shared and owns_lock is False:
+            deadline = time.monotonic() + self.lock_ttl
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                locked = self._call("get", lock_key) is not None   # read first: the leader sets, then unlocks
+                value = self._call("get", full_key)
+                if value is not None:
+                    return value
+                if not locked:
+                    break
+        try:
+            value = compute()
+            if value is not None:
+                self._call("set", full_key, value, ttl)
+            return value
+        finally:
+            if owns_lock:
+                self._call("delete", lock_key)
@@ -0,0 +1,141 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Sequence
+
+# ─────────────────────────────────────────────────────────────────
+# MUSICIAN SEARCH
+# Inverted token index + per-field facet index, built once from the
+# catalog. Queries touch only the postings for their tokens.
+# ─────────────────────────────────────────────────────────────────
+
+# Hits in short, specific fields rank above hits buried in the bio
+FIELD_WEIGHTS = {
+    "name": 8.0, "genre": 4.0, "known_for": 3.0, "tagline": 2.0,
+    "instrument": 2.0, "era": 1.0, "born": 1.0, "bio": 1.0,
+}
+FACET_FIELDS = ("genre", "era", "instrument")
+PREFIX_PENALTY = 0.5        # "beeth" still finds Beethoven, but exact tokens win
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Lower-case, accent-folded alphanumeric tokens."""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return _TOKEN_RE.findall(text)
+
+
+def facet_values(field, musician):
+    value = musician.get(field) or ""
+    if field == "instrument":       # "Vocals, Piano" → two facet values
+        return [v.strip() for v in value.split(",") if v.strip()]
+    return [value] if value else []
+
+
+class MusicianIndex:
+    def __init__(self, musicians, version=None):
+        self.version = version                            # catalog version this index was built from
+        # A catalog Sequence (list or ColumnarCatalog) is kept as-is: rows are read on demand
+        self.docs = musicians if isinstance(musicians, Sequence) else list(musicians)
+        postings = defaultdict(dict)                      # token -> {doc_id: score}
+        self.facets = {f: defaultdict(set) for f in FACET_FIELDS}   # field -> value.lower() -> doc_ids
+        self.facet_labels = {f: {} for f in FACET_FIELDS}           # field -> value.lower() -> display value
+
+        for doc_id, m in enumerate(self.docs):
+            for field, weight in FIELD_WEIGHTS.items():
+                value = m.get(field)
+                if isinstance(value, (list, tuple)):
+                    value = " ".join(value)
+                for token in tokenize(value or ""):
+                    postings[token][doc_id] = postings[token].get(doc_id, 0.0) + weight
+            for field in FACET_FIELDS:
+                for value in facet_values(field, m):
+                    key = value.lower()
+                    self.facets[field][key].add(doc_id)
+                    self.facet_labels[field].setdefault(key, value)
+
+        self.postings = dict(postings)
+        self.vocabulary = sorted(self.postings)
+        # No query and no filters — the landing page — is answered from these
+        self._all = frozenset(range(len(self.docs)))
+        self._all_facets = {field: self._facet_counts(field, self._all) for field in FACET_FIELDS}
+
+    # ── query ───────────────────────────────────────────────────
+    def _match_token(self, token):
+        """Scores for docs containing ``token`` exactly or as a prefix of a word."""
+        scores = dict(self.postings.get(token, ()))
+        i = bisect_left(self.vocabulary, token)
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(token):
+            word = self.vocabulary[i]
+            if word != token:
+                for doc_id, score in self.postings[word].items():
+                    scores[doc_id] = max(scores.get(doc_id, 0.0), score * PREFIX_PENALTY)
+            i += 1
+        return scores
+
+    def _text_matches(self, q):
+        """doc_id -> score for docs matching every query token; None means no text query."""
+        tokens = tokenize(q or "")
+        if not tokens:
+            return None
+        scores = None
+        for token in dict.fromkeys(tokens):
+            matched = self._match_token(token)
+            if scores is None:
+                scores = matched
+            else:
+                scores = {d: s + matched[d] for d, s in scores.items() if d in matched}
+            if not scores:
+                return {}
+        return scores
+
+    def _facet_filter(self, field, value):
+        return self.facets[field].get(value.lower(), set())
+
+    def _facet_counts(self, field, pool):
+        counts = [
+            {"value": self.facet_labels[field][key], "count": len(doc_ids & pool)}
+            for key, doc_ids in self.facets[field].items()
+        ]
+        return sorted((c for c in counts if c["count"]), key=lambda c: (-c["count"], c["value"]))
+
+    def search(self, q=None, limit=20, offset=0, **filters):
+        """Ranked results plus facet counts. ``filters`` keys are FACET_FIELDS."""
+        filters = {f: v for f, v in filters.items() if f in FACET_FIELDS and v}
+        scores = self._text_matches(q)
+        if scores is None and not filters:
+            return {
+                "results": self.docs[offset:offset + limit],
+                "total": len(self.docs),
+                "facets": {field: list(counts) for field, counts in self._all_facets.items()},
+            }
+        base = self._all if scores is None else set(scores)
+
+        filtered = {f: self._facet_filter(f, v) for f, v in filters.items()}
+        matched = base
+        for doc_ids in filtered.values():
+            matched = matched & doc_ids
+
+        # Disjunctive facet counts: each facet ignores its own filter so
+        # the UI can still show the other options for that field.
+        facets = {}
+        for field in FACET_FIELDS:
+            pool = base
+            for other, doc_ids in filtered.items():
+                if other != field:
+                    pool = pool & doc_ids
+            facets[field] = self._facet_counts(field, pool)
+
+        if scores is None:
+            ranked = sorted(matched)
+        else:
+            ranked = sorted(matched, key=lambda d: (-scores[d], d))
+        page = ranked[offset:offset + limit]
+        return {
+            "results": [self.docs[d] for d in page],
+            "total": len(ranked),
+            "facets": facets,
+        }
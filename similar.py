@@ -0,0 +1,310 @@
+import fcntl
+import hashlib
+import math
+import mmap
+import os
+import struct
+import time
+from collections import Counter
+from collections.abc import Sequence
+
+try:                        # optional — /api/musicians/<id>/similar answers 503 without it
+    import numpy as np
+except ImportError:
+    np = None
+
+from search import tokenize
+
+# ─────────────────────────────────────────────────────────────────
+# SIMILAR MUSICIANS
+# TF-IDF vectors over genre / instrument / known_for / bio in one
+# float32 matrix. Every artist's top-k neighbours are computed up
+# front in batched matrix products, so a lookup is a row read; the
+# matrix only lives for the build — a worker keeps the n × k table.
+# When the catalog changes only the changed rows — and the rows that
+# pointed at them — are recomputed against the rest.
+#
+# With ``shared(path, ...)`` one process builds (under an flock) and
+# writes the table to a file every worker maps, as columnar.py does
+# for the catalog — one matrix per server, one table in the page cache.
+#
+#   header | version + vocabulary | ids (i64) | signatures (u64)
+#   | neighbours (i32, n × k) | scores (f32, n × k) | idf (f32)
+# ─────────────────────────────────────────────────────────────────
+
+# Sharing a genre or an instrument says more than sharing a bio word
+FIELD_WEIGHTS = {"genre": 3.0, "instrument": 2.0, "known_for": 1.5, "bio": 1.0}
+MIN_DF = 2                  # a token in one document can't make two artists similar
+MAX_DF = 0.5                # ... and one in most of them can't tell them apart
+MAX_FEATURES = 1024         # n × MAX_FEATURES float32 during a build — ~400 MB at 100k artists
+BATCH_ROWS = 256            # rows per similarity product (BATCH_ROWS × n scores in memory)
+REBUILD_RATIO = 0.2         # refit the vocabulary once this share of the catalog has changed
+
+MAGIC = b"MUSISIM1"
+_HEADER = struct.Struct("<8sIIIII")         # magic, rows, k, terms, drift, meta bytes
+
+
+def available():
+    return np is not None
+
+
+def _signature(m):
+    """Stable 64-bit digest of the fields that feed the vector — comparable across processes."""
+    fields = tuple(
+        tuple(m.get(f) or ()) if f == "known_for" else (m.get(f) or "")
+        for f in FIELD_WEIGHTS
+    )
+    return int.from_bytes(hashlib.blake2b(repr(fields).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _term_weights(m):
+    """token -> summed field weight for one musician."""
+    weights = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        value = m.get(field) or ""
+        if isinstance(value, (list, tuple)):
+            value = " ".join(value)
+        for token in tokenize(value):
+            weights[token] += weight
+    return weights
+
+
+class SimilarityIndex:
+    """Top-``k`` neighbours for every musician of one catalog version.
+
+    Build with ``SimilarityIndex.build(musicians)``; pass the previous
+    index as ``previous`` to reuse its vocabulary and unaffected rows.
+    """
+
+    def __init__(self, docs, ids, signatures, vocabulary, idf, neighbors, scores, version, drift):
+        self.docs = docs
+        self.ids = ids                          # musician id -> row
+        self.signatures = signatures            # row -> _signature()
+        self.vocabulary = vocabulary            # token -> column
+        self.idf = idf
+        self.neighbors = neighbors              # n × k rows, best first; -1 pads short lists
+        self.scores = scores
+        self.version = version
+        self.drift = drift                      # rows changed since the vocabulary was fitted
+
+    @property
+    def k(self):
+        return self.neighbors.shape[1]
+
+    # ── lookup ──────────────────────────────────────────────────
+    def similar(self, musician_id, limit=None):
+        """[(musician, score)] best first, or None for an unknown id."""
+        row = self.ids.get(musician_id)
+        if row is None:
+            return None
+        limit = self.k if limit is None else min(limit, self.k)
+        return [
+            (self.docs[n], round(float(s), 4))
+            for n, s in zip(self.neighbors[row, :limit].tolist(), self.scores[row, :limit].tolist())
+            if n >= 0 and s > 0
+        ]
+
+    # ── build ───────────────────────────────────────────────────
+    @classmethod
+    def build(cls, musicians, k=10, version=None, previous=None, rebuild_ratio=REBUILD_RATIO):
+        if np is None:
+            raise RuntimeError("numpy is required for similar musicians")
+        started = time.perf_counter()
+        docs = musicians if isinstance(musicians, Sequence) else list(musicians)
+        ids = {m["id"]: row for row, m in enumerate(docs)}
+        signatures = [_signature(m) for m in docs]
+
+        if previous is not None and previous.k == k:
+            changed = [
+                row for row, m in enumerate(docs)
+                if m["id"] not in previous.ids or int(previous.signatures[previous.ids[m["id"]]]) != signatures[row]
+            ]
+            removed = len(previous.ids.keys() - ids.keys())
+            drift = previous.drift + len(changed) + removed
+            if drift <= rebuild_ratio * max(len(docs), 1):
+                index = cls._update(previous, docs, ids, signatures, changed, version, drift)
+                print(f"🧭 Similar musicians: {len(changed)} changed, {removed} removed — "
+                      f"updated in {(time.perf_counter() - started) * 1000:.0f} ms")
+                return index
+
+        terms = [_term_weights(m) for m in docs]
+        vocabulary, idf = cls._fit(terms)
+        matrix = cls._vectorize(terms, vocabulary, idf)
+        neighbors, scores = _top_k(matrix, np.arange(len(docs)), k)
+        print(f"🧭 Similar musicians: {len(docs)} artists, {len(vocabulary)} terms — "
+              f"built in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return cls(docs, ids, signatures, vocabulary, idf, neighbors, scores, version, drift=0)
+
+    @staticmethod
+    def _fit(terms):
+        df = Counter()
+        for weights in terms:
+            df.update(weights.keys())
+        n = len(terms)
+        terms = [t for t, c in df.items() if c >= MIN_DF and c <= MAX_DF * n]
+        terms = sorted(terms, key=lambda t: (-df[t], t))[:MAX_FEATURES]
+        vocabulary = {t: col for col, t in enumerate(terms)}
+        idf = np.array([math.log((1 + n) / (1 + df[t])) + 1.0 for t in terms], dtype=np.float32)
+        return vocabulary, idf
+
+    @staticmethod
+    def _vectorize(terms, vocabulary, idf):
+        """Rows L2-normalised, so a dot product is the cosine."""
+        matrix = np.zeros((len(terms), len(vocabulary)), dtype=np.float32)
+        for row, weights in enumerate(terms):
+            for token, weight in weights.items():
+                col = vocabulary.get(token)
+                if col is not None:
+                    matrix[row, col] = 1.0 + math.log(weight)       # sublinear tf
+        matrix *= idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    @classmethod
+    def _update(cls, previous, docs, ids, signatures, changed, version, drift):
+        """Same vocabulary; recompute only the neighbours the changed rows can affect.
+
+        Re-vectorising is linear in the catalog; the products it saves are not.
+        """
+        k = previous.k
+        n = len(docs)
+        old_rows = np.array([previous.ids.get(m["id"], -1) for m in docs])
+        kept = old_rows >= 0
+        matrix = cls._vectorize([_term_weights(m) for m in docs], previous.vocabulary, previous.idf)
+        changed = np.array(changed, dtype=np.int64)
+
+        # Old neighbour rows → new rows; a removed or changed neighbour invalidates the list
+        old_to_new = np.full(len(previous.signatures), -1, dtype=np.int64)
+        old_to_new[old_rows[kept]] = np.flatnonzero(kept)
+        is_changed = np.zeros(n, dtype=bool)
+        is_changed[changed] = True
+        neighbors = np.full((n, k), -1, dtype=np.int32)
+        scores = np.full((n, k), -np.inf, dtype=np.float32)
+        neighbors[kept] = np.where(previous.neighbors[old_rows[kept]] >= 0,
+                                   old_to_new[previous.neighbors[old_rows[kept]]], -1)
+        scores[kept] = previous.scores[old_rows[kept]]
+        pointed_away = (previous.neighbors[old_rows[kept]] >= 0) & (
+            (neighbors[kept] < 0) | is_changed[np.maximum(neighbors[kept], 0)])
+        stale = np.zeros(n, dtype=bool)
+        stale[np.flatnonzero(kept)[pointed_away.any(axis=1)]] = True
+        stale |= is_changed
+
+        redo = np.flatnonzero(stale)
+        if len(redo):
+            neighbors[redo], scores[redo] = _top_k(matrix, redo, k)
+
+        # Everyone else keeps their list and only checks the changed rows
+        merge = np.flatnonzero(~stale)
+        if len(changed) and len(merge):
+            for start in range(0, len(merge), BATCH_ROWS):
+                rows = merge[start:start + BATCH_ROWS]
+                candidates = np.concatenate([neighbors[rows], np.broadcast_to(changed, (len(rows), len(changed)))], axis=1)
+                candidate_scores = np.concatenate([scores[rows], matrix[rows] @ matrix[changed].T], axis=1)
+                neighbors[rows], scores[rows] = _best(candidates, candidate_scores, k)
+        return cls(docs, ids, signatures, previous.vocabulary, previous.idf, neighbors, scores, version, drift)
+
+    # ── shared file ─────────────────────────────────────────────
+    def save(self, path):
+        """Write the table to ``path`` atomically; mappings of the old file stay valid."""
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        meta = "\0".join([str(self.version), *terms]).encode("utf-8")
+        n = len(self.signatures)
+        ids = np.empty(n, dtype=np.int64)
+        for musician_id, row in self.ids.items():
+            ids[row] = musician_id
+        parts = [
+            _HEADER.pack(MAGIC, n, self.k, len(terms), self.drift, len(meta)), meta,
+            bytes(-(_HEADER.size + len(meta)) % 8),
+            ids.tobytes(), np.asarray(self.signatures, dtype=np.uint64).tobytes(),
+            np.ascontiguousarray(self.neighbors, dtype=np.int32).tobytes(),
+            np.ascontiguousarray(self.scores, dtype=np.float32).tobytes(),
+            np.asarray(self.idf, dtype=np.float32).tobytes(),
+        ]
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            for part in parts:
+                f.write(part)
+        os.replace(tmp, path)
+
+    @classmethod
+    def open(cls, path, docs, version, k):
+        """The table at ``path`` if it holds ``version`` of ``docs`` with this ``k``, else None."""
+        try:
+            with open(path, "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None                 # missing, or empty
+        at = 0
+
+        def section(dtype, count, shape=None):
+            nonlocal at
+            array = np.frombuffer(buffer, dtype=dtype, count=count, offset=at)
+            at += array.nbytes
+            return array if shape is None else array.reshape(shape)
+
+        try:
+            magic, n, file_k, n_terms, drift, meta_len = _HEADER.unpack_from(buffer, 0)
+            file_version, *terms = bytes(buffer[_HEADER.size:_HEADER.size + meta_len]).decode("utf-8").split("\0")
+            if magic != MAGIC or file_version != str(version) or file_k != k or n != len(docs):
+                return None
+            at = _HEADER.size + meta_len + (-(_HEADER.size + meta_len) % 8)
+            ids = section(np.int64, n)
+            signatures = section(np.uint64, n)
+            neighbors = section(np.int32, n * k, (n, k))
+            scores = section(np.float32, n * k, (n, k))
+            idf = section(np.float32, n_terms)
+        except (struct.error, UnicodeDecodeError, ValueError):
+            return None                 # truncated or not ours
+        return cls(docs, dict(zip(ids.tolist(), range(n))), signatures,
+                   {t: col for col, t in enumerate(terms)}, idf, neighbors, scores, version, drift)
+
+
+def shared(path, musicians, k=10, version=None, previous=None):
+    """``SimilarityIndex`` for ``version`` mapped from ``path``, building it there first if needed.
+
+    Processes that find the file current just map it. Otherwise one
+    takes ``path``.lock and builds — the rest wait on the lock, then
+    map what it wrote, so only one n × MAX_FEATURES matrix exists.
+    """
+    index = SimilarityIndex.open(path, musicians, version, k)
+    if index is not None:
+        return index
+    with open(f"{path}.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        index = SimilarityIndex.open(path, musicians, version, k)       # built while we waited
+        if index is None:
+            SimilarityIndex.build(musicians, k=k, version=version, previous=previous).save(path)
+            index = SimilarityIndex.open(path, musicians, version, k)
+    return index
+
+
+def _best(candidates, candidate_scores, k):
+    """Per row, the ``k`` highest-scoring candidates, best first."""
+    width = candidate_scores.shape[1]
+    if width > k:
+        part = np.argpartition(-candidate_scores, k - 1, axis=1)[:, :k]
+        candidates = np.take_along_axis(candidates, part, axis=1)
+        candidate_scores = np.take_along_axis(candidate_scores, part, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind="stable")
+    candidates = np.take_along_axis(candidates, order, axis=1).astype(np.int32)
+    candidate_scores = np.take_along_axis(candidate_scores, order, axis=1)
+    if width < k:
+        pad = k - width
+        candidates = np.pad(candidates, ((0, 0), (0, pad)), constant_values=-1)
+        candidate_scores = np.pad(candidate_scores, ((0, 0), (0, pad)), constant_values=-np.inf)
+    return candidates, candidate_scores
+
+
+def _top_k(matrix, rows, k):
+    """Neighbours of ``rows`` against the whole matrix, BATCH_ROWS at a time."""
+    n = matrix.shape[0]
+    neighbors = np.empty((len(rows), k), dtype=np.int32)
+    scores = np.empty((len(rows), k), dtype=np.float32)
+    for start in range(0, len(rows), BATCH_ROWS):
+        batch = rows[start:start + BATCH_ROWS]
+        sims = matrix[batch] @ matrix.T
+        sims[np.arange(len(batch)), batch] = -np.inf            # never your own neighbour
+        candidates = np.broadcast_to(np.arange(n), sims.shape)
+        neighbors[start:start + len(batch)], scores[start:start + len(batch)] = _best(candidates, sims, k)
+    return neighbors, scores
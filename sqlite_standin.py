@@ -0,0 +1,177 @@
+import re
+import sqlite3
+from datetime import date
+from functools import lru_cache
+
+# ─────────────────────────────────────────────────────────────────
+# SQLITE STAND-IN FOR RDS
+# A pymysql-shaped wrapper around sqlite3 (``%s`` placeholders, dict
+# rows, ping/commit/begin) so benchmarks and tests can exercise the
+# real handlers and pool without a MySQL server.
+# ─────────────────────────────────────────────────────────────────
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS feedback (
+        id         INTEGER PRIMARY KEY AUTOINCREMENT,
+        name       TEXT NOT NULL,
+        email      TEXT NOT NULL,
+        message    TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS idx_feedback_created_at ON feedback (created_at, id);
+    CREATE INDEX IF NOT EXISTS idx_feedback_email ON feedback (email, id);
+    CREATE TABLE IF NOT EXISTS feedback_daily_stats (
+        day         TEXT NOT NULL,
+        hour        INTEGER NOT NULL,
+        slot        INTEGER NOT NULL DEFAULT 0,
+        submissions INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, hour, slot)
+    );
+    CREATE TABLE IF NOT EXISTS feedback_submitter_stats (
+        email       TEXT PRIMARY KEY,
+        submissions INTEGER NOT NULL DEFAULT 0,
+        last_at     TIMESTAMP
+    );
+    CREATE TABLE IF NOT EXISTS musicians (
+        id         INTEGER PRIMARY KEY AUTOINCREMENT,
+        name       TEXT UNIQUE NOT NULL,
+        emoji      TEXT NOT NULL DEFAULT '',
+        genre      TEXT NOT NULL DEFAULT '',
+        era        TEXT NOT NULL DEFAULT '',
+        born       TEXT NOT NULL DEFAULT '',
+        instrument TEXT NOT NULL DEFAULT '',
+        tagline    TEXT NOT NULL DEFAULT '',
+        bio        TEXT NOT NULL DEFAULT '',
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE IF NOT EXISTS musician_known_for (
+        musician_id INTEGER NOT NULL,
+        position    INTEGER NOT NULL,
+        title       TEXT NOT NULL,
+        PRIMARY KEY (musician_id, position)
+    );
+"""
+
+
+# The handful of MySQL idioms the app uses, rewritten for SQLite
+_MYSQL_TO_SQLITE = [
+    (re.compile(r"\bNOW\(\)"), "CURRENT_TIMESTAMP"),
+    (re.compile(r"\bHOUR\(([^()]*)\)"), r"CAST(strftime('%H', \1) AS INTEGER)"),
+    (re.compile(r"\bON DUPLICATE KEY UPDATE\b"), "ON CONFLICT DO UPDATE SET"),
+    (re.compile(r"\bVALUES\((\w+)\)"), r"excluded.\1"),
+    (re.compile(r"\bGREATEST\("), "MAX("),
+]
+
+
+@lru_cache(maxsize=256)
+def _sql(sql):
+    for pattern, replacement in _MYSQL_TO_SQLITE:
+        sql = pattern.sub(replacement, sql)
+    return sql.replace("%s", "?")
+
+
+def _params(args):
+    # MySQL takes dates/datetimes directly; store them as SQLite's TIMESTAMP text
+    return tuple(str(a) if isinstance(a, date) else a for a in (args or ()))
+
+
+def _dict_row(cursor, row):
+    return {d[0]: v for d, v in zip(cursor.description, row)}
+
+
+class Cursor:
+    def __init__(self, conn):
+        self._cur = conn.cursor()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def execute(self, sql, args=()):
+        self._cur.execute(_sql(sql), _params(args))
+        return self._cur.rowcount
+
+    def executemany(self, sql, rows):
+        self._cur.executemany(_sql(sql), [_params(r) for r in rows])
+        return self._cur.rowcount
+
+    def fetchone(self):
+        return self._cur.fetchone()
+
+    def fetchall(self):
+        return self._cur.fetchall()
+
+    def fetchmany(self, size=1000):
+        return self._cur.fetchmany(size)
+
+    def __iter__(self):
+        return iter(self._cur)
+
+    @property
+    def rowcount(self):
+        return self._cur.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cur.lastrowid
+
+    def close(self):
+        self._cur.close()
+
+
+class Connection:
+    def __init__(self, path):
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30,
+                                     isolation_level=None, uri=path.startswith("file:"))
+        self._conn.row_factory = _dict_row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self.queries = 0
+
+    def cursor(self, cursorclass=None):      # cursorclass ignored — SQLite cursors already stream
+        self.queries += 1
+        return Cursor(self._conn)
+
+    def ping(self, reconnect=True):
+        self._conn.execute("SELECT 1")
+
+    def begin(self):
+        if not self._conn.in_transaction:
+            self._conn.execute("BEGIN")
+
+    def commit(self):
+        if self._conn.in_transaction:
+            self._conn.execute("COMMIT")
+
+    def rollback(self):
+        if self._conn.in_transaction:
+            self._conn.execute("ROLLBACK")
+
+    def close(self):
+        self._conn.close()
+
+
+def create_schema(path, musicians=()):
+    """Create the app's tables in ``path`` and load ``musicians`` into them."""
+    conn = Connection(path)
+    conn._conn.executescript(SCHEMA)
+    with conn.cursor() as cursor:
+        for m in musicians:
+            cursor.execute(
+                "INSERT OR IGNORE INTO musicians (name, emoji, genre, era, born, instrument, tagline, bio) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
+                [m.get(f, "") for f in ("name", "emoji", "genre", "era", "born", "instrument", "tagline", "bio")]
+            )
+            musician_id = cursor.lastrowid
+            cursor.executemany(
+                "INSERT OR IGNORE INTO musician_known_for (musician_id, position, title) VALUES (%s, %s, %s)",
+                [(musician_id, pos, title) for pos, title in enumerate(m.get("known_for", []))]
+            )
+    conn.close()
+
+
+def connect_factory(path):
+    """A ``connect()`` callable for ConnectionPool."""
+    return lambda: Connection(path)
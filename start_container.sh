@@ -7,6 +7,17 @@ echo "=== Starting Musician App Container ==="
 echo "Pulling latest Docker image..."
 docker pull $AWS_ACCOUNT_ID.dkr.ecr.$AWS_DEFAULT_REGION.amazonaws.com/$IMAGE_REPO_NAME:latest
 
+# Apply schema migrations once per deploy — the app itself no longer does this at boot
+echo "Running database migrations..."
+docker run --rm \
+  -e DB_HOST=$DB_HOST \
+  -e DB_USER=$DB_USER \
+  -e DB_PASSWORD=$DB_PASSWORD \
+  -e DB_NAME=$DB_NAME \
+  -e TRUSTED_PROXY_COUNT=1 \
+  $AWS_ACCOUNT_ID.dkr.ecr.$AWS_DEFAULT_REGION.amazonaws.com/$IMAGE_REPO_NAME:latest \
+  flask --app app migrate
+
 # Run the container with RDS environment variables
 # These are injected by ECS Task Definition (not hardcoded here!)
 echo "Starting musician-app container..."
@@ -18,6 +29,7 @@ docker run -d \
   -e DB_USER=$DB_USER \
   -e DB_PASSWORD=$DB_PASSWORD \
   -e DB_NAME=$DB_NAME \
+  -e TRUSTED_PROXY_COUNT=1 \
   $AWS_ACCOUNT_ID.dkr.ecr.$AWS_DEFAULT_REGION.amazonaws.com/$IMAGE_REPO_NAME:latest
 
 echo "=== Container started successfully! ==="
@@ -0,0 +1,54 @@
+import gzip
+import hashlib
+
+from flask import Response
+
+try:                        # optional — `pip install brotli` to also serve br
+    import brotli
+except ImportError:
+    brotli = None
+
+# ─────────────────────────────────────────────────────────────────
+# PRE-RENDERED, PRE-COMPRESSED PAGES
+# Rendered once, compressed once, served as bytes with a strong ETag
+# so repeat visitors get a 304 and nobody pays for Jinja per hit.
+# ─────────────────────────────────────────────────────────────────
+
+
+class PrecompressedPage:
+    """Holds identity/gzip/br bytes for one document plus their ETags."""
+
+    def __init__(self, body, content_type="text/html; charset=utf-8", cache_control="no-cache"):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.content_type = content_type
+        self.cache_control = cache_control
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        # Strong ETags must differ per content-coding
+        self.variants = {"identity": (body, digest)}
+        self.variants["gzip"] = (gzip.compress(body, compresslevel=9, mtime=0), digest + "-gz")
+        if brotli is not None:
+            self.variants["br"] = (brotli.compress(body, quality=11), digest + "-br")
+
+    def _negotiate(self, accept_encodings):
+        best, best_q = "identity", 0
+        for coding in ("br", "gzip"):
+            if coding in self.variants:
+                q = accept_encodings[coding]
+                if q > best_q:
+                    best, best_q = coding, q
+        return best
+
+    def response(self, request):
+        coding = self._negotiate(request.accept_encodings)
+        body, etag = self.variants[coding]
+        headers = {"Cache-Control": self.cache_control, "Vary": "Accept-Encoding"}
+        if coding != "identity":
+            headers["Content-Encoding"] = coding
+
+        if request.if_none_match.contains(etag):
+            resp = Response(status=304, headers=headers)
+        else:
+            resp = Response(body, content_type=self.content_type, headers=headers)
+        resp.set_etag(etag)
+        return resp
@@ -0,0 +1,267 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+import app as musicapp
+import sqlite_standin
+from db_pool import ConnectionPool
+from ratelimit import DuplicateFilter, MemoryStorage
+
+
+class SQLiteDB:
+    """App tables in a throwaway SQLite file, served through a real ConnectionPool."""
+
+    def __init__(self, musicians=()):
+        self._tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self._tmp.name, "test.db")
+        sqlite_standin.create_schema(path, musicians)
+        self.connections = []
+
+        def connect():
+            conn = sqlite_standin.Connection(path)
+            self.connections.append(conn)
+            return conn
+        self.pool = ConnectionPool(connect, max_size=4)
+
+    def connection(self, readonly=False):
+        """Drop-in for app.get_db_connection."""
+        return self.pool.connection()
+
+    @property
+    def queries(self):
+        return sum(c.queries for c in self.connections)
+
+    def execute(self, sql, args=()):
+        with self.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, args)
+
+    def executemany(self, sql, rows):
+        with self.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.executemany(sql, rows)
+
+    def close(self):
+        self.pool.close()
+        self._tmp.cleanup()
+
+
+class AppTestCase(unittest.TestCase):
+    def setUp(self):
+        self.db = SQLiteDB()
+        self.addCleanup(self.db.close)
+        self._orig = musicapp.get_db_connection
+        musicapp.get_db_connection = self.db.connection
+        musicapp.invalidate_feedback_cache()
+        musicapp.ip_limiter.storage = musicapp.email_limiter.storage = MemoryStorage()
+        musicapp.feedback_dedupe = DuplicateFilter()
+        self.client = musicapp.app.test_client()
+
+    def tearDown(self):
+        musicapp.get_db_connection = self._orig
+
+    def add_rows(self, n, created_at="2026-01-01 00:00:00"):
+        self.db.executemany(
+            "INSERT INTO feedback (name, email, message, created_at) VALUES (%s, %s, %s, %s)",
+            [(f"user{i}", f"u{i}@x.com", f"msg {i}", created_at) for i in range(n)]
+        )
+
+
+class TestFeedbackRoutes(AppTestCase):
+    def test_submit_requires_all_fields(self):
+        r = self.client.post("/feedback", data={"name": "a", "email": ""})
+        self.assertEqual(r.status_code, 400)
+
+    def test_submit_then_list(self):
+        r = self.client.post("/feedback", data={"name": "Ann", "email": "ann@x.com", "message": "Hi"})
+        self.assertEqual(r.status_code, 200)
+        data = self.client.get("/feedbacks").get_json()
+        self.assertEqual(data["total"], 1)
+        self.assertEqual(data["feedbacks"][0]["name"], "Ann")
+
+    def test_keyset_pagination_walks_all_rows(self):
+        self.add_rows(7)              # identical created_at — id breaks the tie
+        seen, before = [], None
+        while True:
+            url = "/feedbacks?limit=3" + (f"&before={before}" if before else "")
+            data = self.client.get(url).get_json()
+            seen += [f["id"] for f in data["feedbacks"]]
+            before = data["next_cursor"]
+            if not before:
+                break
+        self.assertEqual(seen, sorted(seen, reverse=True))
+        self.assertEqual(len(set(seen)), 7)
+
+    def test_bad_cursor_is_400(self):
+        self.assertEqual(self.client.get("/feedbacks?before=nope").status_code, 400)
+
+    def test_first_page_cached_until_insert(self):
+        self.add_rows(2)
+        self.client.get("/feedbacks")
+        queries = self.db.queries
+        self.client.get("/feedbacks")
+        self.assertEqual(self.db.queries, queries)
+        self.client.post("/feedback", data={"name": "Bo", "email": "bo@x.com", "message": "Yo"})
+        self.assertEqual(self.client.get("/feedbacks").get_json()["total"], 3)
+
+    def test_exact_resubmission_is_409_without_insert(self):
+        form = {"name": "Ann", "email": "ann@x.com", "message": "Hi"}
+        self.assertEqual(self.client.post("/feedback", data=form).status_code, 200)
+        queries = self.db.queries
+        self.assertEqual(self.client.post("/feedback", data={**form, "email": "ANN@x.com "}).status_code, 409)
+        self.assertEqual(self.db.queries, queries)
+
+    def test_search_by_email_pages_newest_first_and_caches(self):
+        self.add_rows(3)
+        self.db.executemany(
+            "INSERT INTO feedback (name, email, message) VALUES (%s, %s, %s)",
+            [("Ann", "ann@x.com", f"note {i}") for i in range(3)]
+        )
+        musicapp.feedback_search_cache.clear()
+        first = self.client.get("/feedbacks/search?email=ann@x.com&limit=2").get_json()
+        self.assertEqual([f["message"] for f in first["feedbacks"]], ["note 2", "note 1"])
+        queries = self.db.queries
+        self.assertEqual(self.client.get("/feedbacks/search?email=ann@x.com&limit=2").get_json(), first)
+        self.assertEqual(self.db.queries, queries)
+        rest = self.client.get(f"/feedbacks/search?email=ann@x.com&limit=2&after={first['next_cursor']}").get_json()
+        self.assertEqual([f["message"] for f in rest["feedbacks"]], ["note 0"])
+        self.assertIsNone(rest["next_cursor"])
+        self.assertEqual(self.client.get("/feedbacks/search").status_code, 400)
+
+    def test_rate_limited_by_email(self):
+        for i in range(int(musicapp.email_limiter.capacity)):
+            r = self.client.post("/feedback", data={"name": "Ann", "email": "ann@x.com", "message": f"m{i}"})
+            self.assertEqual(r.status_code, 200)
+        r = self.client.post("/feedback", data={"name": "Ann", "email": "ann@x.com", "message": "one more"})
+        self.assertEqual(r.status_code, 429)
+        self.assertGreaterEqual(int(r.headers["Retry-After"]), 1)
+
+    def post_from(self, ip, i):
+        return self.client.post("/feedback", data={"name": "Ann", "email": f"ann{i}@x.com", "message": "hi"},
+                                headers={"X-Forwarded-For": ip})
+
+    def test_clients_behind_one_proxy_get_their_own_ip_bucket(self):
+        with mock.patch.object(musicapp, "TRUSTED_PROXY_COUNT", 1), \
+                mock.patch.object(musicapp.app, "wsgi_app", ProxyFix(musicapp.app.wsgi_app, x_for=1)):
+            for i in range(int(musicapp.ip_limiter.capacity)):
+                self.assertEqual(self.post_from("203.0.113.7", i).status_code, 200)
+            self.assertEqual(self.post_from("203.0.113.7", "x").status_code, 429)
+            self.assertEqual(self.post_from("198.51.100.4", "y").status_code, 200)
+
+    def test_no_ip_limit_until_the_proxy_count_is_known(self):
+        with mock.patch.object(musicapp, "TRUSTED_PROXY_COUNT", None):
+            for i in range(int(musicapp.ip_limiter.capacity) + 1):
+                self.assertEqual(self.post_from("203.0.113.7", i).status_code, 200)
+
+
+class TestCacheBackendDown(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        from response_cache import RedisBackend, ResponseCache
+        from test_response_cache import DownRedis
+        for patcher in (mock.patch.object(musicapp, "response_cache", ResponseCache(RedisBackend(DownRedis()))),
+                        mock.patch("builtins.print")):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_reads_are_served_uncached(self):
+        self.assertEqual(self.client.get("/api/musicians?q=jazz").status_code, 200)
+        self.assertEqual(self.client.get("/feedbacks").status_code, 200)
+
+    def test_committed_insert_is_not_reported_as_a_failure(self):
+        r = self.client.post("/feedback", data={"name": "Ann", "email": "ann@x.com", "message": "Hi"})
+        self.assertEqual(r.status_code, 200)
+        with self.db.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT COUNT(*) AS n FROM feedback")
+                self.assertEqual(cursor.fetchone()["n"], 1)
+
+
+class TestFeedbackExport(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.add_rows(5)
+        orig = musicapp.get_export_connection
+        self.addCleanup(setattr, musicapp, "get_export_connection", orig)
+        musicapp.get_export_connection = lambda: self.db.pool._connect()
+        token = mock.patch.object(musicapp, "EXPORT_TOKEN", "s3cret")
+        token.start()
+        self.addCleanup(token.stop)
+        self.client.environ_base["HTTP_AUTHORIZATION"] = "Bearer s3cret"
+
+    def test_not_served_without_a_token_configured(self):
+        with mock.patch.object(musicapp, "EXPORT_TOKEN", None):
+            self.assertEqual(self.client.get("/feedbacks/export").status_code, 404)
+
+    def test_wrong_token(self):
+        r = self.client.get("/feedbacks/export", headers={"Authorization": "Bearer nope"})
+        self.assertEqual(r.status_code, 401)
+
+    def test_ndjson_with_id_watermark(self):
+        r = self.client.get("/feedbacks/export?since_id=2")
+        lines = [json.loads(line) for line in r.data.decode().splitlines()]
+        self.assertEqual(r.mimetype, "application/x-ndjson")
+        self.assertEqual([row["id"] for row in lines], [3, 4, 5])
+
+    def test_csv_has_header(self):
+        r = self.client.get("/feedbacks/export?format=csv")
+        rows = list(csv.reader(io.StringIO(r.data.decode())))
+        self.assertEqual(rows[0], ["id", "name", "email", "message", "created_at"])
+        self.assertEqual(len(rows), 6)
+
+    def test_bad_format(self):
+        self.assertEqual(self.client.get("/feedbacks/export?format=xml").status_code, 400)
+
+    def test_disconnect_closes_the_connection_without_draining_the_cursor(self):
+        events = []
+        row = {"id": 1, "name": "Ann", "email": "ann@x.com", "message": "x" * 1000, "created_at": "2026-01-01"}
+        cursor = mock.Mock(fetchmany=lambda n: [row] * n, close=lambda: events.append("cursor"))
+        conn = mock.Mock(cursor=lambda *_: cursor, close=lambda: events.append("conn"))
+        musicapp.get_export_connection = lambda: conn
+        stream = musicapp.stream_feedback("ndjson")
+        next(stream)                                        # the table never ends
+        stream.close()                                      # client went away
+        self.assertEqual(events, ["conn"])
+
+
+class TestIndexPage(unittest.TestCase):
+    def setUp(self):
+        self.client = musicapp.app.test_client()
+
+    def test_gzip_variant_and_conditional_get(self):
+        r = self.client.get("/", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.headers["Content-Encoding"], "gzip")
+        self.assertIn(b"Soundboard", gzip.decompress(r.data))
+        etag = r.headers["ETag"]
+        r2 = self.client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+        self.assertEqual(r2.status_code, 304)
+        self.assertEqual(r2.data, b"")
+
+    def test_embeds_only_first_page_of_cards(self):
+        orig = musicapp.INDEX_PAGE_SIZE
+        self.addCleanup(setattr, musicapp, "INDEX_PAGE_SIZE", orig)
+        self.addCleanup(setattr, musicapp, "_index_page", None)
+        musicapp.INDEX_PAGE_SIZE = 3
+        musicapp._index_page = None
+        html = self.client.get("/").data.decode()
+        self.assertIn("Miles Davis", html)
+        self.assertNotIn("Johnny Cash", html)        # 12th artist — fetched on scroll
+        self.assertIn(f'<strong id="countDisplay">{len(musicapp.MUSICIANS)}</strong>', html)
+
+    def test_identity_without_accept_encoding(self):
+        r = self.client.get("/")
+        self.assertNotIn("Content-Encoding", r.headers)
+        self.assertIn(b"Miles Davis", r.data)
+        self.assertEqual(r.headers["Vary"], "Accept-Encoding")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+import asyncio
+import json
+import threading
+import unittest
+from unittest import mock
+from urllib.parse import urlencode
+
+try:
+    import asgiref  # noqa: F401 — optional, from requirements-async.txt
+except ImportError:
+    asgiref = None
+
+import app as musicapp
+from test_app import AppTestCase
+from response_cache import LocalBackend, ResponseCache
+
+
+async def call(application, method, path, query=b"", body=b"", content_type=b""):
+    scope = {
+        "type": "http", "method": method, "path": path, "query_string": query,
+        "headers": [(b"content-type", content_type)] if content_type else [],
+        "http_version": "1.1", "scheme": "http", "server": ("test", 80),
+        "client": ("127.0.0.1", 1234), "root_path": "", "raw_path": path.encode(),
+    }
+    sent = [{"type": "http.request", "body": body, "more_body": False}]
+    messages = []
+
+    async def receive():
+        return sent.pop(0) if sent else {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    status = messages[0]["status"]
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return status, body
+
+
+class RecordingBackend(LocalBackend):
+    """Shared-looking backend that notes which threads touch it."""
+
+    shared = True
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        return super().get(key)
+
+    def counter(self, key):
+        self.threads.add(threading.get_ident())
+        return super().counter(key)
+
+
+@unittest.skipIf(asgiref is None, "asgiref not installed")
+class TestAsyncFeedbackApp(unittest.TestCase):
+    def setUp(self):
+        import asgi
+        self.asgi = asgi.AsyncFeedbackApp(musicapp.app)
+        self.client = musicapp.app.test_client()
+
+    def test_missing_fields_match_flask_response(self):
+        form = {"name": "Ann", "email": ""}
+        status, body = asyncio.run(call(
+            self.asgi, "POST", "/feedback", body=urlencode(form).encode(),
+            content_type=b"application/x-www-form-urlencoded",
+        ))
+        expected = self.client.post("/feedback", data=form)
+        self.assertEqual((status, body), (expected.status_code, expected.data))
+
+    def test_bad_cursor_matches_flask_response(self):
+        status, body = asyncio.run(call(self.asgi, "GET", "/feedbacks", query=b"before=nope"))
+        expected = self.client.get("/feedbacks?before=nope")
+        self.assertEqual((status, body), (expected.status_code, expected.data))
+
+    def test_shared_cache_is_read_off_the_event_loop(self):
+        backend = RecordingBackend()
+        cache = ResponseCache(backend)
+        cache.set("feedbacks", musicapp.FEEDBACKS_PAGE_SIZE, b'{"cached":true}\n')
+        backend.threads.clear()
+        with mock.patch.object(musicapp, "response_cache", cache):
+            status, body = asyncio.run(call(self.asgi, "GET", "/feedbacks"))
+        self.assertEqual((status, body), (200, b'{"cached":true}\n'))
+        self.assertTrue(backend.threads)
+        self.assertNotIn(threading.get_ident(), backend.threads)
+
+    def test_other_routes_fall_through_to_flask(self):
+        status, body = asyncio.run(call(self.asgi, "GET", "/api/musicians", query=b"q=jazz"))
+        self.assertEqual(status, 200)
+        self.assertIn(b"Miles Davis", body)
+
+
+class FakeAsyncPool:
+    """aiomysql's pool / connection / cursor surface over the SQLite test database."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def acquire(self):
+        return _AsyncContext(self.db.pool.connection(), FakeAsyncConn)
+
+
+class FakeAsyncConn:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def begin(self):
+        self.conn.begin()
+
+    async def commit(self):
+        self.conn.commit()
+
+    def cursor(self):
+        return _AsyncContext(self.conn.cursor(), FakeAsyncCursor)
+
+
+class FakeAsyncCursor:
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    async def execute(self, sql, args=()):
+        return self.cursor.execute(sql, args)
+
+    async def executemany(self, sql, rows):
+        return self.cursor.executemany(sql, rows)
+
+    async def fetchall(self):
+        return self.cursor.fetchall()
+
+
+class _AsyncContext:
+    def __init__(self, context, wrap):
+        self.context = context
+        self.wrap = wrap
+
+    async def __aenter__(self):
+        return self.wrap(self.context.__enter__())
+
+    async def __aexit__(self, *exc):
+        return self.context.__exit__(*exc)
+
+
+@unittest.skipIf(asgiref is None, "asgiref not installed")
+class TestAsyncDatabasePaths(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        import asgi
+        self.asgi = asgi.AsyncFeedbackApp(musicapp.app)
+        self.asgi.pool = FakeAsyncPool(self.db)
+
+    def post(self, form):
+        return asyncio.run(call(self.asgi, "POST", "/feedback", body=urlencode(form).encode(),
+                                content_type=b"application/x-www-form-urlencoded"))
+
+    def test_insert_matches_flask_and_lands_in_the_table(self):
+        status, body = self.post({"name": "Ann", "email": "ann@x.com", "message": "Async hello"})
+        expected = self.client.post("/feedback", data={"name": "Bob", "email": "bob@x.com", "message": "Sync hello"})
+        self.assertEqual((status, body), (expected.status_code, expected.data))
+        with self.db.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT name, message FROM feedback ORDER BY id")
+                self.assertEqual([(r["name"], r["message"]) for r in cursor.fetchall()],
+                                 [("Ann", "Async hello"), ("Bob", "Sync hello")])
+                cursor.execute("SELECT SUM(submissions) AS n FROM feedback_daily_stats")
+                self.assertEqual(cursor.fetchone()["n"], 2)         # rollups written in the same transaction
+
+    def test_feedbacks_pages_match_flask(self):
+        self.add_rows(7)
+        for query in (b"limit=3", b"limit=3&before=2026-01-01 00:00:00,5"):
+            status, body = asyncio.run(call(self.asgi, "GET", "/feedbacks", query=query))
+            musicapp.invalidate_feedback_cache()
+            expected = self.client.get(f"/feedbacks?{query.decode()}")
+            self.assertEqual((status, body), (expected.status_code, expected.data))
+            self.assertEqual(len(json.loads(body)["feedbacks"]), 3)
+
+    def test_insert_invalidates_the_cached_first_page(self):
+        asyncio.run(call(self.asgi, "GET", "/feedbacks"))
+        self.post({"name": "Ann", "email": "ann@x.com", "message": "New"})
+        status, body = asyncio.run(call(self.asgi, "GET", "/feedbacks"))
+        self.assertEqual([f["message"] for f in json.loads(body)["feedbacks"]], ["New"])
+
+
+class TestDatabaseAddress(unittest.TestCase):
+    def test_host_and_port_parse_the_same_for_both_drivers(self):
+        with mock.patch.dict("os.environ", {"DB_HOST": "db.internal:3307"}):
+            self.assertEqual(musicapp.db_address(), ("db.internal", 3307))
+        self.assertEqual(musicapp.db_address("replica-1"), ("replica-1", 3306))
+
+
+if __name__ == "__main__":
+    unittest.main()
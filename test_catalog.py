@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+
+import catalog
+from test_app import SQLiteDB
+
+SEED = [
+    {"name": "Miles Davis", "emoji": "🎺", "genre": "Jazz", "bio": "Trumpet.", "known_for": ["Kind of Blue"]},
+    {"name": "Nina Simone", "emoji": "🎹", "genre": "Jazz", "bio": "Piano.", "known_for": []},
+]
+
+
+class TestReaders(unittest.TestCase):
+    def test_csv_splits_known_for(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8") as f:
+            f.write("name,genre,known_for\nPrince,Pop/Funk,Purple Rain|When Doves Cry\n")
+        self.addCleanup(os.unlink, f.name)
+        rows = list(catalog.iter_rows(f.name))
+        self.assertEqual(rows[0]["known_for"], ["Purple Rain", "When Doves Cry"])
+
+    def test_jsonl_skips_blank_lines(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False, encoding="utf-8") as f:
+            f.write('{"name": "Prince"}\n\n{"name": "Bach"}\n')
+        self.addCleanup(os.unlink, f.name)
+        self.assertEqual([r["name"] for r in catalog.iter_rows(f.name)], ["Prince", "Bach"])
+
+
+class CollatingDB:
+    """Just enough of MySQL's accent/case-insensitive unique name for ``_flush``."""
+
+    def __init__(self):
+        self.stored = {}                # name_key -> (id, name as first written)
+        self.known_for = []
+        self._result = []
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def begin(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def executemany(self, sql, rows):
+        if sql.startswith("INSERT INTO musicians "):
+            for row in rows:
+                self.stored.setdefault(catalog.name_key(row[0]), (len(self.stored) + 1, row[0]))
+        else:
+            self.known_for.extend(rows)
+
+    def execute(self, sql, args):
+        if sql.startswith("SELECT id, name"):
+            keys = {catalog.name_key(n) for n in args}
+            self._result = [{"id": i, "name": n} for k, (i, n) in self.stored.items() if k in keys]
+
+    def fetchall(self):
+        return self._result
+
+
+class TestImport(unittest.TestCase):
+    def test_names_match_the_way_the_unique_key_collates(self):
+        db = CollatingDB()
+        catalog.import_musicians(db, [{"name": "Björk", "bio": "", "known_for": ["Debut"]}])
+        catalog.import_musicians(db, [{"name": "BJORK", "bio": "", "known_for": ["Homogenic"]}])
+        self.assertEqual(list(db.stored.values()), [(1, "Björk")])
+        self.assertEqual(db.known_for[-1], (1, 0, "Homogenic"))
+
+    def test_batch_dedupes_collation_equal_names(self):
+        db = CollatingDB()
+        rows = [{"name": "Beyoncé", "known_for": ["a"]}, {"name": "beyonce", "known_for": ["b"]}]
+        self.assertEqual(catalog.import_musicians(db, rows), 1)
+        self.assertEqual(db.known_for, [(1, 0, "b")])
+
+
+class TestCatalogCache(unittest.TestCase):
+    def test_falls_back_to_seed_when_db_down(self):
+        def broken():
+            raise ConnectionError("no RDS")
+        cache = catalog.CatalogCache(broken, SEED)
+        current = cache.get()
+        self.assertEqual(current.version, "seed")
+        self.assertEqual([m["id"] for m in current.musicians], [1, 2])
+
+    def test_loads_rows_with_known_for_and_reloads_on_change(self):
+        db = SQLiteDB()
+        self.addCleanup(db.close)
+        db.execute("INSERT INTO musicians (name, genre, bio) VALUES ('Miles Davis', 'Jazz', 'x')")
+        db.execute("INSERT INTO musician_known_for VALUES (1, 0, 'Kind of Blue'), (1, 1, 'Bitches Brew')")
+        cache = catalog.CatalogCache(db.connection, SEED, ttl=0)
+        first = cache.get()
+        self.assertEqual(first.musicians[0]["known_for"], ["Kind of Blue", "Bitches Brew"])
+
+        self.assertIs(cache.get(), first)             # unchanged version → same object
+        db.execute("INSERT INTO musicians (name, genre, bio) VALUES ('Bach', 'Classical', 'y')")
+        second = cache.get()
+        self.assertNotEqual(second.version, first.version)
+        self.assertEqual(len(second.musicians), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
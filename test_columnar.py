@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import app as musicapp
+import catalog
+import columnar
+from search import MusicianIndex
+from test_app import SQLiteDB
+
+ROWS = [
+    {"id": 3, "name": "Björk", "emoji": "🦢", "genre": "Pop", "era": "1990s", "born": "", "instrument": "Vocals",
+     "tagline": "", "bio": "Icelandic singer.", "known_for": ["Homogenic", "Debut"]},
+    {"id": 7, "name": "Nina Simone", "emoji": "🎹", "genre": "Jazz", "era": "1950s–90s", "born": "1933",
+     "instrument": "Piano, Vocals", "tagline": "", "bio": "Pianist.", "known_for": []},
+    {"id": 9, "name": "Miles Davis", "emoji": "🎺", "genre": "Jazz", "era": "1940s–90s", "born": "1926",
+     "instrument": "Trumpet", "tagline": "", "bio": "Trumpeter.", "known_for": ["Kind of Blue"]},
+]
+
+
+class TestColumnarFile(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "catalog.bin")
+
+    def open(self, rows=ROWS, version="3:v1"):
+        columnar.write(self.path, rows, version, catalog.MUSICIAN_FIELDS)
+        shared = columnar.open_version(self.path, version)
+        self.addCleanup(shared.close)
+        return shared
+
+    def test_round_trips_rows(self):
+        shared = self.open()
+        self.assertEqual(len(shared), 3)
+        self.assertEqual(list(shared), ROWS)
+        self.assertEqual(shared[-1]["name"], "Miles Davis")
+        self.assertEqual(shared[1:], ROWS[1:])
+        self.assertEqual(shared.value(0, "known_for"), ["Homogenic", "Debut"])
+        with self.assertRaises(IndexError):
+            shared[3]
+
+    def test_repeated_strings_are_stored_once(self):
+        many = [{**ROWS[1], "id": i, "name": f"n{i}", "bio": "x" * 1000} for i in range(100)]
+        self.open(many)
+        self.assertLess(os.path.getsize(self.path), 10_000)          # not 100 copies of the bio
+
+    def test_other_version_is_not_opened(self):
+        self.open()
+        self.assertIsNone(columnar.open_version(self.path, "4:v2"))
+        self.assertIsNone(columnar.open_version(os.path.join(self._tmp.name, "missing.bin"), "3:v1"))
+
+    def test_search_index_reads_rows_from_the_file(self):
+        index = MusicianIndex(self.open())
+        result = index.search(q="jazz", limit=1)
+        self.assertEqual(result["total"], 2)
+        self.assertEqual(result["results"][0]["name"], "Nina Simone")
+
+
+class TestSharedCatalogCache(unittest.TestCase):
+    def setUp(self):
+        self.db = SQLiteDB(musicapp.MUSICIANS)
+        self.addCleanup(self.db.close)
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "catalog.bin")
+
+    def cache(self):
+        return catalog.CatalogCache(self.db.connection, [], columnar_path=self.path)
+
+    def test_second_worker_maps_the_file_instead_of_loading_rows(self):
+        first = self.cache().get()
+        self.assertIsInstance(first.musicians, columnar.ColumnarCatalog)
+        self.assertEqual(len(first.musicians), len(musicapp.MUSICIANS))
+        with mock.patch.object(catalog, "load_catalog", side_effect=AssertionError("rows loaded")):
+            second = self.cache().get()
+        self.assertEqual(second.musicians[0], first.musicians[0])
+
+    def test_api_serves_the_columnar_catalog(self):
+        with mock.patch.object(musicapp, "catalog_cache", self.cache()):
+            data = musicapp.app.test_client().get("/api/musicians?q=trumpet").get_json()
+        self.assertEqual([m["name"] for m in data["musicians"]], ["Miles Davis"])
+        self.assertEqual(data["musicians"][0]["known_for"], ["Kind of Blue", "Bitches Brew", "Birth of the Cool"])
+
+
+if __name__ == "__main__":
+    unittest.main()
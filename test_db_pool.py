@@ -0,0 +1,102 @@
+import threading
+import unittest
+
+from db_pool import ConnectionPool, PoolTimeout
+
+
+class FakeConn:
+    def __init__(self):
+        self.closed = False
+        self.alive = True
+        self.rolled_back = 0
+
+    def ping(self, reconnect=True):
+        if not self.alive:
+            raise ConnectionError("gone")
+
+    def rollback(self):
+        self.rolled_back += 1
+
+    def close(self):
+        self.closed = True
+
+
+class TestConnectionPool(unittest.TestCase):
+    def make_pool(self, **kw):
+        self.opened = []
+
+        def connect():
+            conn = FakeConn()
+            self.opened.append(conn)
+            return conn
+        return ConnectionPool(connect, **kw)
+
+    def test_reuses_returned_connection(self):
+        pool = self.make_pool(max_size=2)
+        with pool.connection() as a:
+            pass
+        with pool.connection() as b:
+            pass
+        self.assertIs(a, b)
+        self.assertEqual(len(self.opened), 1)
+        self.assertEqual(pool.stats()["reused"], 1)
+
+    def test_dead_connection_replaced_on_checkout(self):
+        pool = self.make_pool(max_size=1)
+        with pool.connection() as a:
+            pass
+        a.alive = False
+        with pool.connection() as b:
+            pass
+        self.assertIsNot(a, b)
+        self.assertTrue(a.closed)
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_times_out_when_exhausted(self):
+        pool = self.make_pool(max_size=1, timeout=0.05)
+        conn = pool.acquire()
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+        pool.release(conn)
+        self.assertEqual(pool.stats()["timeouts"], 1)
+
+    def test_waiter_gets_released_connection(self):
+        pool = self.make_pool(max_size=1, timeout=2)
+        conn = pool.acquire()
+        got = []
+        t = threading.Thread(target=lambda: got.append(pool.acquire()))
+        t.start()
+        pool.release(conn)
+        t.join()
+        self.assertIs(got[0], conn)
+
+    def test_idle_cap_closes_extras(self):
+        pool = self.make_pool(max_size=3, max_idle=1)
+        conns = [pool.acquire() for _ in range(3)]
+        for c in conns:
+            pool.release(c)
+        stats = pool.stats()
+        self.assertEqual(stats["idle"], 1)
+        self.assertEqual(stats["size"], 1)
+        self.assertEqual(sum(c.closed for c in conns), 2)
+
+    def test_error_rolls_back_and_returns(self):
+        pool = self.make_pool(max_size=1)
+        with self.assertRaises(RuntimeError):
+            with pool.connection() as conn:
+                raise RuntimeError("boom")
+        self.assertEqual(conn.rolled_back, 1)
+        self.assertEqual(pool.stats()["idle"], 1)
+
+    def test_connect_failure_frees_slot(self):
+        def connect():
+            raise ConnectionError("refused")
+        pool = ConnectionPool(connect, max_size=1)
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                pool.acquire()
+        self.assertEqual(pool.stats()["size"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
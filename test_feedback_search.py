@@ -0,0 +1,36 @@
+import unittest
+
+from werkzeug.datastructures import MultiDict
+
+import feedback_search as fs
+
+
+class TestFeedbackSearch(unittest.TestCase):
+    def test_boolean_query_requires_every_word_and_drops_operators(self):
+        self.assertEqual(fs.boolean_query('Late  DELIVERY* -"late" of'), "+late +delivery")
+        self.assertEqual(fs.boolean_query("a an"), "")
+
+    def test_parse_args(self):
+        match, email, limit, after = fs.parse_search_args(
+            MultiDict({"q": "broken player", "email": " Ann@X.com", "limit": "500", "after": "1.25,42"}))
+        self.assertEqual((match, email, limit, after), ("+broken +player", "ann@x.com", fs.MAX_PAGE_SIZE, (1.25, 42)))
+        for bad in ({}, {"q": "ab"}, {"email": "a@x.com", "after": "nope"}, {"q": "song", "limit": "x"}):
+            with self.assertRaises(ValueError):
+                fs.parse_search_args(MultiDict(bad))
+
+    def test_keyword_query_keysets_on_score_then_id(self):
+        sql, args = fs.search_query("+song", "a@x.com", 10, after=(2.5, 7))
+        self.assertIn("MATCH(message) AGAINST (%s IN BOOLEAN MODE) AS score", sql)
+        self.assertIn("HAVING score < %s OR (score = %s AND id < %s)", sql)
+        self.assertTrue(sql.endswith("ORDER BY score DESC, id DESC LIMIT %s"))
+        self.assertEqual(args, ("+song", "+song", "a@x.com", 2.5, 2.5, 7, 11))
+
+    def test_cursor_round_trips_the_exact_score(self):
+        rows = [{"id": 9, "score": 0.1 + 0.2}, {"id": 8, "score": 0.3}]
+        cursor = fs.search_payload(rows, 1)["next_cursor"]
+        _, _, _, after = fs.parse_search_args(MultiDict({"q": "song", "after": cursor}))
+        self.assertEqual(after, (0.1 + 0.2, 9))
+
+
+if __name__ == "__main__":
+    unittest.main()
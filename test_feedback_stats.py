@@ -0,0 +1,94 @@
+import unittest
+from datetime import date
+from unittest import mock
+
+import app as musicapp
+import feedback_stats
+from feedback_writer import FeedbackWriter
+from test_app import AppTestCase
+
+
+class TestFeedbackStats(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        musicapp.feedback_stats_cache.clear()
+
+    def stats(self, **args):
+        with self.db.connection() as conn:
+            return feedback_stats.read_stats(conn, **args)
+
+    def test_submit_bumps_rollups_in_the_same_transaction(self):
+        for i, email in enumerate(["ann@x.com", "Ann@X.com", "bo@x.com"]):
+            r = self.client.post("/feedback", data={"name": "n", "email": email, "message": f"m{i}"})
+            self.assertEqual(r.status_code, 200)
+        data = self.client.get("/feedbacks/stats?top=1").get_json()
+        self.assertEqual(data["total"], 3)
+        self.assertEqual(sum(h["submissions"] for h in data["hourly"]), 3)
+        self.assertEqual([(s["email"], s["submissions"]) for s in data["top_submitters"]], [("ann@x.com", 2)])
+        self.assertEqual(self.client.get("/feedbacks/stats?days=x").status_code, 400)
+
+    def test_hour_is_spread_over_slot_rows_and_summed_on_read(self):
+        with mock.patch.object(feedback_stats.random, "randrange", side_effect=[0, 1, 2]):
+            for i in range(3):
+                self.client.post("/feedback", data={"name": "n", "email": f"u{i}@x.com", "message": "m"})
+        with self.db.connection() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) AS n FROM feedback_daily_stats")
+            self.assertEqual(cursor.fetchone()["n"], 3)
+        hourly = self.stats()["hourly"]
+        self.assertEqual([h["submissions"] for h in hourly], [3])
+
+    def test_write_behind_batches_count_once_per_row(self):
+        writer = FeedbackWriter(self.db.connection, batch_size=10, flush_interval=0.05,
+                                before_commit=feedback_stats.record)
+        tickets = [writer.submit(("n", f"u{i % 2}@x.com", f"m{i}")) for i in range(5)]
+        for t in tickets:
+            self.assertTrue(t.wait(2))
+        writer.shutdown()
+        stats = self.stats(top=5)
+        self.assertEqual(stats["total"], 5)
+        self.assertEqual({s["email"]: s["submissions"] for s in stats["top_submitters"]}, {"u0@x.com": 3, "u1@x.com": 2})
+
+    def test_backfill_rebuilds_from_raw_rows_in_batches(self):
+        self.add_rows(5, created_at="2026-01-01 10:15:00")
+        self.add_rows(2, created_at="2026-01-02 23:59:00")
+        self.db.execute("INSERT INTO feedback_daily_stats (day, hour, submissions) VALUES ('2026-01-01', 10, 99)")
+        batches = []
+        with self.db.connection() as conn, self.db.connection() as snapshot_conn:
+            total = feedback_stats.backfill(conn, snapshot_conn, batch_size=3,
+                                            progress=lambda *a: batches.append(a))
+        self.assertEqual(total, 7)
+        self.assertEqual(len(batches), 3)
+        stats = self.stats(days=2, top=1, today=date(2026, 1, 2))
+        self.assertEqual([(d["day"], d["submissions"]) for d in stats["daily"]],
+                         [("2026-01-01", 5), ("2026-01-02", 2)])
+        self.assertEqual([(h["hour"], h["submissions"]) for h in stats["hourly"]], [(10, 5), (23, 2)])
+        self.assertEqual(stats["top_submitters"][0]["submissions"], 2)   # u0/u1 appear in both batches
+
+    def test_row_committed_during_the_backfill_is_counted_once(self):
+        self.add_rows(5, created_at="2026-01-01 10:15:00")
+        self.db.execute("DELETE FROM feedback WHERE id = 3")       # id 3 is still in flight …
+        with self.db.connection() as conn, self.db.connection() as snapshot_conn:
+            commit = conn.commit
+
+            def commit_then_insert():
+                commit()
+                if not inserted:                                   # … and commits, with its live bump,
+                    inserted.append(1)                             # right after the rollups were cleared
+                    with self.db.connection() as other:
+                        other.begin()
+                        with other.cursor() as cursor:
+                            row = ("late", "late@x.com", "m")
+                            cursor.execute("INSERT INTO feedback (id, name, email, message, created_at) "
+                                           "VALUES (3, %s, %s, %s, '2026-01-01 10:20:00')", row)
+                            feedback_stats.record(cursor, [row])
+                        other.commit()
+            inserted = []
+            conn.commit = commit_then_insert
+            self.assertEqual(feedback_stats.backfill(conn, snapshot_conn, batch_size=2), 4)
+            del conn.commit
+        self.assertEqual(self.stats(days=3650, top=10)["total"], 5)
+        self.assertEqual(self.stats(top=10)["top_submitters"][0]["submissions"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import threading
+import time
+import unittest
+from contextlib import contextmanager
+from unittest import mock
+
+from feedback_writer import FeedbackWriter, QueueFull
+
+
+class RecordingDB:
+    def __init__(self, fail_times=0):
+        self.batches = []
+        self.fail_times = fail_times
+        self.gate = threading.Event()
+        self.gate.set()
+
+    @contextmanager
+    def connection(self):
+        self.gate.wait()
+        db = self
+
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def executemany(self, sql, rows):
+                if db.fail_times:
+                    db.fail_times -= 1
+                    raise ConnectionError("lost connection")
+                db.batches.append(list(rows))
+
+        class Conn:
+            def cursor(self):
+                return Cursor()
+
+            def commit(self):
+                pass
+
+        yield Conn()
+
+
+class TestFeedbackWriter(unittest.TestCase):
+    def test_batches_rows_and_resolves_tickets(self):
+        db = RecordingDB()
+        writer = FeedbackWriter(db.connection, batch_size=3, flush_interval=0.05)
+        tickets = [writer.submit((f"n{i}", "e@x.com", "hi")) for i in range(5)]
+        for t in tickets:
+            self.assertTrue(t.wait(2))
+        writer.shutdown()
+        self.assertEqual(sum(len(b) for b in db.batches), 5)
+        self.assertTrue(all(len(b) <= 3 for b in db.batches))
+
+    def test_rejects_when_queue_full(self):
+        db = RecordingDB()
+        db.gate.clear()                      # hold the flusher so the queue fills up
+        writer = FeedbackWriter(db.connection, max_queue=2, batch_size=1, flush_interval=0.01)
+        writer.submit(("a", "a@x.com", "1"))
+        with self.assertRaises(QueueFull):
+            for _ in range(5):
+                writer.submit(("b", "b@x.com", "2"))
+        db.gate.set()
+        writer.shutdown()
+        self.assertGreaterEqual(writer.stats()["rejected"], 1)
+
+    def test_shutdown_drains_pending_rows(self):
+        db = RecordingDB()
+        writer = FeedbackWriter(db.connection, batch_size=100, flush_interval=5)
+        ticket = writer.submit(("a", "a@x.com", "1"))
+        writer.shutdown()
+        self.assertTrue(ticket.done)
+        self.assertEqual(db.batches, [[("a", "a@x.com", "1")]])
+        with self.assertRaises(QueueFull):
+            writer.submit(("b", "b@x.com", "2"))
+
+    def test_retries_then_succeeds(self):
+        db = RecordingDB(fail_times=1)
+        writer = FeedbackWriter(db.connection, batch_size=1, flush_interval=0.01)
+        self.assertTrue(writer.submit(("a", "a@x.com", "1")).wait(3))
+        writer.shutdown()
+
+    def test_failed_batch_goes_to_on_error(self):
+        db, failed = RecordingDB(fail_times=99), []
+        writer = FeedbackWriter(db.connection, batch_size=2, flush_interval=0.01, max_retries=0,
+                                on_error=failed.extend)
+        ticket = writer.submit(("a", "a@x.com", "1"))
+        with self.assertRaises(ConnectionError):
+            ticket.wait(3)
+        writer.shutdown()
+        self.assertEqual(failed, [("a", "a@x.com", "1")])
+
+
+class TestWriteBehindDedupe(unittest.TestCase):
+    def setUp(self):
+        import app as musicapp
+        from ratelimit import DuplicateFilter
+        self.app = musicapp
+        self.db = RecordingDB(fail_times=99)                 # RDS down
+        writer = FeedbackWriter(self.db.connection, flush_interval=0.01, max_retries=0,
+                                on_error=musicapp._release_failed_batch)
+        for name, value in (("feedback_writer", writer), ("feedback_dedupe", DuplicateFilter()),
+                            ("RATE_LIMIT_ENABLED", False)):
+            patcher = mock.patch.object(musicapp, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(writer.shutdown)
+        self.client = musicapp.app.test_client()
+        self.form = {"name": "Ann", "email": "ann@x.com", "message": "Hi"}
+
+    def test_durable_failure_can_be_retried(self):
+        with mock.patch("builtins.print"):
+            self.assertEqual(self.client.post("/feedback?durable=1", data=self.form).status_code, 500)
+            self.assertEqual(self.client.post("/feedback?durable=1", data=self.form).status_code, 500)
+
+    def test_dropped_batch_can_be_resubmitted(self):
+        with mock.patch("builtins.print"):
+            self.assertEqual(self.client.post("/feedback", data=self.form).status_code, 202)
+            deadline = time.monotonic() + 3
+            while self.app.feedback_writer.stats()["failed"] == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(self.client.post("/feedback", data=self.form).status_code, 202)
+
+
+if __name__ == "__main__":
+    unittest.main()
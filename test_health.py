@@ -0,0 +1,58 @@
+import time
+import unittest
+
+import app as musicapp
+from health import DBHealthMonitor
+
+
+class TestDBHealthMonitor(unittest.TestCase):
+    def test_reports_last_result_without_calling_check(self):
+        calls = []
+        monitor = DBHealthMonitor(lambda: calls.append(1), interval=60)
+        self.assertEqual(monitor.status()["db"], "pending")
+        monitor.check_now()
+        for _ in range(3):
+            status = monitor.status()
+        self.assertTrue(status["ok"])
+        self.assertEqual(len(calls), 1)
+
+    def test_failure_and_staleness(self):
+        def broken():
+            raise ConnectionError("RDS down")
+        monitor = DBHealthMonitor(broken, interval=0.01)
+        monitor.check_now()
+        self.assertEqual(monitor.status()["db"], "error: RDS down")
+        monitor._check = lambda: None
+        monitor.check_now()
+        time.sleep(0.05)
+        self.assertFalse(monitor.status()["ok"])
+        self.assertTrue(monitor.status()["db"].startswith("stale"))
+
+
+class TestProbeRoutes(unittest.TestCase):
+    def setUp(self):
+        self.client = musicapp.app.test_client()
+
+    def test_livez_never_touches_db(self):
+        orig = musicapp.get_db_connection
+        musicapp.get_db_connection = lambda: self.fail("liveness hit the DB")
+        try:
+            self.assertEqual(self.client.get("/livez").status_code, 200)
+        finally:
+            musicapp.get_db_connection = orig
+
+    def test_readyz_follows_cached_status(self):
+        def broken():
+            raise ConnectionError("RDS down")
+        orig = musicapp.db_health
+        self.addCleanup(setattr, musicapp, "db_health", orig)
+        for check, code in ((broken, 503), (lambda: None, 200)):
+            musicapp.db_health = DBHealthMonitor(check, interval=60)
+            musicapp.db_health.check_now()
+            r = self.client.get("/readyz")
+            self.assertEqual(r.status_code, code)
+            self.assertIsNotNone(r.get_json()["age_seconds"])
+            musicapp.db_health.stop()
+
+if __name__ == "__main__":
+    unittest.main()
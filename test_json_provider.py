@@ -0,0 +1,42 @@
+import json
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from flask import Flask
+
+import json_provider
+from json_provider import FastJSONProvider
+
+
+class TestFastJSONProvider(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.json = FastJSONProvider(self.app)
+        self.row = {"id": 1, "created_at": datetime(2026, 1, 2, 3, 4, 5), "name": "Zoë"}
+
+    def check(self):
+        with self.app.app_context():
+            resp = self.app.json.response(self.row)
+        self.assertTrue(resp.data.endswith(b"\n"))
+        self.assertEqual(json.loads(resp.data),
+                         {"id": 1, "created_at": "2026-01-02 03:04:05", "name": "Zoë"})
+        self.assertEqual(resp.mimetype, "application/json")
+
+    def test_accelerated_encoder(self):
+        if json_provider.orjson is None:
+            self.skipTest("orjson not installed")
+        self.check()
+
+    def test_stdlib_fallback(self):
+        with mock.patch.object(json_provider, "orjson", None):
+            self.check()
+
+    def test_dumps_matches_response_body(self):
+        with self.app.app_context():
+            body = self.app.json.response(self.row).data
+        self.assertEqual(self.app.json.dumps(self.row, separators=(",", ":")) + "\n", body.decode())
+
+
+if __name__ == "__main__":
+    unittest.main()
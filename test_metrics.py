@@ -0,0 +1,106 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import app as musicapp
+from metrics import Registry
+
+
+class TestRegistry(unittest.TestCase):
+    def test_histogram_buckets_are_cumulative(self):
+        reg = Registry()
+        h = reg.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+        for v in (0.05, 0.5, 5.0):
+            h.observe(v, "/x")
+        text = reg.render()
+        self.assertIn('latency_seconds_bucket{route="/x",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{route="/x",le="1.0"} 2', text)
+        self.assertIn('latency_seconds_bucket{route="/x",le="+Inf"} 3', text)
+        self.assertIn('latency_seconds_count{route="/x"} 3', text)
+
+    def test_counter_and_gauge(self):
+        reg = Registry()
+        c = reg.counter("errors_total", "Errors.", ("route",))
+        c.inc("/a")
+        c.inc("/a", amount=2)
+        reg.gauge("pool", "Pool.", lambda: {("idle",): 3}, ("state",))
+        text = reg.render()
+        self.assertIn('errors_total{route="/a"} 3', text)
+        self.assertIn('pool{state="idle"} 3', text)
+        self.assertIn("# TYPE errors_total counter", text)
+
+    def test_shared_directory_sums_workers(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        reg = Registry()
+        c = reg.counter("errors_total", "Errors.", ("route",))
+        h = reg.histogram("latency_seconds", "Latency.", buckets=(1.0,))
+        reg.gauge("pool", "Pool.", lambda: {("idle",): 3}, ("state",))
+        pid = os.fork()
+        if pid == 0:                                    # another gunicorn worker, since exited
+            c.inc("/a", amount=5)
+            h.observe(0.5)
+            reg.directory = directory
+            reg.flush()
+            os._exit(0)
+        os.waitpid(pid, 0)
+        c.inc("/a", amount=2)
+        h.observe(2.0)
+        reg.share(directory, interval=60)
+        text = reg.render()
+        self.assertIn('errors_total{route="/a"} 7', text)
+        self.assertIn('latency_seconds_bucket{le="1.0"} 1', text)
+        self.assertIn("latency_seconds_count 2", text)
+        self.assertIn(f'pool{{state="idle",pid="{os.getpid()}"}} 3', text)
+        self.assertNotIn(f'pid="{pid}"', text)                # gauges only for live workers
+
+    def test_exited_workers_are_folded_into_the_archive(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        reg = Registry()
+        c = reg.counter("errors_total", "Errors.", ("route",))
+        reg.gauge("pool", "Pool.", lambda: {("idle",): 3}, ("state",))
+        pid = os.fork()
+        if pid == 0:                                    # recycled cleanly: worker_exit → retire()
+            reg.share(directory, interval=60)
+            c.inc("/a", amount=5)
+            reg.retire()
+            os._exit(0)
+        os.waitpid(pid, 0)
+        pid = os.fork()
+        if pid == 0:                                    # SIGKILLed — left its file behind
+            c.inc("/a", amount=3)
+            reg.directory = directory
+            reg.flush()
+            os._exit(0)
+        os.waitpid(pid, 0)
+        with open(os.path.join(directory, f"metrics-{os.getpid()}.json"), "w") as f:
+            f.write('{"errors_total": [[["/a"], 100]]}')    # a dead worker that had our pid
+        c.inc("/a")
+        reg.share(directory, interval=60)
+        self.assertEqual(sorted(f for f in os.listdir(directory) if f.startswith("metrics-")),
+                         [f"metrics-{os.getpid()}.json"])
+        self.assertIn('errors_total{route="/a"} 109', reg.render())
+        reg.retire()
+        self.assertEqual(sorted(f for f in os.listdir(directory) if f.endswith(".json")), ["archive.json"])
+        other = Registry()
+        other.counter("errors_total", "Errors.", ("route",))
+        other.directory = directory
+        self.assertIn('errors_total{route="/a"} 109', other.render())
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+    def test_routes_are_recorded(self):
+        client = musicapp.app.test_client()
+        before = musicapp.REQUEST_SECONDS.count("/api/musicians", "GET", "200")
+        client.get("/api/musicians")
+        self.assertEqual(musicapp.REQUEST_SECONDS.count("/api/musicians", "GET", "200"), before + 1)
+        r = client.get("/metrics")
+        self.assertEqual(r.status_code, 200)
+        self.assertIn(b"http_request_duration_seconds_bucket", r.data)
+        self.assertIn(b"json_serialize_seconds_count", r.data)
+
+
+if __name__ == "__main__":
+    unittest.main()
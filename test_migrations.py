@@ -0,0 +1,70 @@
+import unittest
+
+import migrations
+
+
+class FakeMySQL:
+    """Just enough of a pymysql connection for the migration runner."""
+
+    def __init__(self, lock_granted=True):
+        self.lock_granted = lock_granted
+        self.versions = set()
+        self.statements = []
+        self.commits = 0
+        self._result = []
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, args=()):
+        sql = " ".join(sql.split())
+        self.statements.append(sql)
+        self._result = []
+        if sql.startswith("SELECT GET_LOCK"):
+            self._result = [{"locked": 1 if self.lock_granted else 0}]
+        elif sql.startswith("SELECT version FROM schema_migrations"):
+            self._result = [{"version": v} for v in sorted(self.versions)]
+        elif sql.startswith("INSERT INTO schema_migrations"):
+            self.versions.add(args[0])
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return self._result
+
+    def commit(self):
+        self.commits += 1
+
+
+class TestMigrate(unittest.TestCase):
+    def test_applies_pending_in_order_then_nothing(self):
+        conn = FakeMySQL()
+        done = migrations.migrate(conn)
+        self.assertEqual([m.version for m in done], [m.version for m in migrations.MIGRATIONS])
+        self.assertEqual(conn.commits, len(done))
+        self.assertTrue(any("CREATE TABLE IF NOT EXISTS feedback" in s for s in conn.statements))
+        self.assertTrue(conn.statements[-1].startswith("SELECT RELEASE_LOCK"))
+
+        self.assertEqual(migrations.migrate(conn), [])
+        self.assertTrue(all(applied for _, applied in migrations.status(conn)))
+
+    def test_versions_are_unique_and_ordered(self):
+        versions = [m.version for m in migrations.MIGRATIONS]
+        self.assertEqual(versions, sorted(set(versions)))
+
+    def test_lock_timeout_applies_nothing(self):
+        conn = FakeMySQL(lock_granted=False)
+        with self.assertRaises(migrations.MigrationLockTimeout):
+            migrations.migrate(conn)
+        self.assertEqual(conn.versions, set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+import partitions
+from test_app import AppTestCase
+
+
+class FakeMySQL:
+    """Answers the information_schema lookups partitions.py makes; records everything else."""
+
+    def __init__(self, partitions=(), fulltext=True, oldest=None):
+        self.partitions = list(partitions)
+        self.fulltext = fulltext
+        self.oldest = oldest
+        self.statements = []
+        self._result = []
+
+    def cursor(self, *_):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, args=()):
+        sql = " ".join(sql.split())
+        self._result = []
+        if "information_schema.partitions" in sql:
+            self._result = [{"name": n, "upper": u, "rows": 0} for n, u in self.partitions]
+        elif "information_schema.statistics" in sql:
+            self._result = [{"1": 1}] if self.fulltext else []
+        elif sql.startswith("SELECT MIN(created_at)"):
+            self._result = [{"oldest": self.oldest}]
+        else:
+            self.statements.append(sql)
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return self._result
+
+
+class TestPartitionDDL(unittest.TestCase):
+    def test_month_arithmetic(self):
+        self.assertEqual(partitions.add_months(date(2026, 11, 1), 3), date(2027, 2, 1))
+        self.assertEqual(partitions.add_months(date(2026, 1, 1), -1), date(2025, 12, 1))
+        self.assertEqual(partitions.partition_name(date(2026, 3, 1)), "p202603")
+
+    def test_partition_sql_covers_oldest_month_to_months_ahead(self):
+        sql = partitions.partition_sql(date(2026, 8, 1), 2, today=date(2026, 10, 18))
+        self.assertIn("ADD PRIMARY KEY (id, created_at)", sql)
+        self.assertEqual(sql.count("PARTITION p2026"), 5)             # Aug → Dec
+        self.assertIn("PARTITION p202612 VALUES LESS THAN (UNIX_TIMESTAMP('2027-01-01 00:00:00'))", sql)
+        self.assertTrue(sql.endswith("PARTITION pmax VALUES LESS THAN MAXVALUE\n)"))
+
+    def test_refuses_to_drop_fulltext_implicitly(self):
+        conn = FakeMySQL(fulltext=True)
+        with self.assertRaises(partitions.PartitioningError):
+            partitions.partition_table(conn)
+        self.assertEqual(conn.statements, [])
+
+        conn = FakeMySQL(fulltext=True)
+        partitions.partition_table(conn, months_ahead=1, drop_fulltext=True, today=date(2026, 10, 18))
+        self.assertEqual(conn.statements[0], "ALTER TABLE feedback DROP INDEX ftx_feedback_message")
+        self.assertIn("PARTITION BY RANGE", conn.statements[1])
+
+    def test_future_partitions_split_pmax(self):
+        conn = FakeMySQL([("p202610", date(2026, 11, 1)), ("pmax", None)])
+        created = partitions.ensure_future_partitions(conn, months_ahead=2, today=date(2026, 10, 18))
+        self.assertEqual(created, ["p202611", "p202612"])
+        self.assertTrue(conn.statements[0].startswith("ALTER TABLE feedback REORGANIZE PARTITION pmax INTO"))
+        self.assertEqual(partitions.ensure_future_partitions(
+            FakeMySQL([("p202612", date(2027, 1, 1)), ("pmax", None)]), months_ahead=2, today=date(2026, 10, 18)), [])
+
+
+class TestArchive(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def read_archive(self, path):
+        with gzip.open(path, "rt") as f:
+            return [json.loads(line) for line in f]
+
+    def test_unpartitioned_rows_move_out_in_batches(self):
+        self.add_rows(7, created_at="2025-01-15 12:00:00")
+        self.add_rows(3, created_at="2026-10-01 12:00:00")
+        batches = []
+        with self.db.connection() as conn:
+            total = partitions.archive_rows(conn, self._tmp.name, date(2026, 1, 1), batch_size=3,
+                                            progress=lambda *a: batches.append(a))
+        self.assertEqual(total, 7)
+        self.assertEqual(len(batches), 3)
+        archived = self.read_archive(os.path.join(self._tmp.name, "feedback-before-2026-01-01.ndjson.gz"))
+        self.assertEqual(len({r["id"] for r in archived}), 7)
+        with self.db.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT COUNT(*) AS n FROM feedback")
+                self.assertEqual(cursor.fetchone()["n"], 3)
+
+    def test_rerun_after_a_crash_leaves_a_readable_archive(self):
+        self.add_rows(7, created_at="2025-01-15 12:00:00")
+        path = os.path.join(self._tmp.name, "feedback-before-2026-01-01.ndjson.gz")
+
+        def crash(*_):
+            raise KeyboardInterrupt
+        with self.db.connection() as conn:
+            with self.assertRaises(KeyboardInterrupt):
+                partitions.archive_rows(conn, self._tmp.name, date(2026, 1, 1), batch_size=3, progress=crash)
+        self.assertEqual(len(self.read_archive(path)), 3)          # first batch is a complete member
+        with open(path, "ab") as f:                                 # killed halfway through the next one
+            f.write(gzip.compress(b'{"id": 4}\n' * 50)[:20])
+
+        with self.db.connection() as conn:
+            self.assertEqual(partitions.archive_rows(conn, self._tmp.name, date(2026, 1, 1), batch_size=3), 4)
+        self.assertEqual(sorted(r["id"] for r in self.read_archive(path)), list(range(1, 8)))
+
+    def test_partition_archive_is_written_before_the_drop(self):
+        conn = FakeMySQL([("p202501", date(2025, 2, 1)), ("p202610", date(2026, 11, 1)), ("pmax", None)])
+        rows = [{"id": i, "name": "n", "email": "e@x.com", "message": "m", "created_at": "2025-01-15 12:00:00"}
+                for i in range(4)]
+        stream_conn = mock.Mock()
+        # The SQLite stand-in has no PARTITION clause — feed the rows directly
+        with mock.patch.object(partitions, "_iter_partition", lambda _, name: iter(rows)):
+            done = partitions.archive_partitions(conn, lambda: stream_conn, self._tmp.name, date(2026, 1, 1))
+        self.assertEqual(done, [("p202501", 4)])
+        self.assertEqual(conn.statements, ["ALTER TABLE feedback DROP PARTITION p202501"])
+        self.assertEqual(self.read_archive(os.path.join(self._tmp.name, "feedback-p202501.ndjson.gz")), rows)
+        stream_conn.close.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
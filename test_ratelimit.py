@@ -0,0 +1,44 @@
+import unittest
+from unittest import mock
+
+from ratelimit import DuplicateFilter, MemoryStorage, TokenBucketLimiter, parse_rate, retry_after_header
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("10/60"), (10.0, 10 / 60))
+
+    def test_burst_then_refill(self):
+        clock = [100.0]
+        limiter = TokenBucketLimiter(MemoryStorage(), capacity=2, rate=0.5)
+        with mock.patch("ratelimit.time.monotonic", lambda: clock[0]):
+            self.assertTrue(limiter.hit("ip:a")[0])
+            self.assertTrue(limiter.hit("ip:a")[0])
+            allowed, retry_after = limiter.hit("ip:a")
+            self.assertFalse(allowed)
+            self.assertAlmostEqual(retry_after, 2.0)
+            self.assertTrue(limiter.hit("ip:b")[0])       # keys are independent
+            clock[0] += 2.0
+            self.assertTrue(limiter.hit("ip:a")[0])
+        self.assertEqual(retry_after_header(0.2), "1")
+
+    def test_storage_is_lru_bounded(self):
+        storage = MemoryStorage(max_keys=2)
+        for key in ("a", "b", "c"):
+            storage.take(key, 1, 0.001)
+        self.assertEqual(list(storage._buckets), ["b", "c"])
+        self.assertTrue(storage.take("a", 1, 0.001)[0])    # evicted key starts with a full bucket
+
+
+class TestDuplicateFilter(unittest.TestCase):
+    def test_normalized_repeat_is_rejected_until_forgotten(self):
+        dedupe = DuplicateFilter(window=60)
+        self.assertTrue(dedupe.check_and_mark("Ann@x.com", "Great  show"))
+        self.assertFalse(dedupe.check_and_mark("ann@x.com ", "Great show"))
+        self.assertTrue(dedupe.check_and_mark("ann@x.com", "Different"))
+        dedupe.forget("ann@x.com", "Great show")
+        self.assertTrue(dedupe.check_and_mark("ann@x.com", "Great show"))
+
+
+if __name__ == "__main__":
+    unittest.main()
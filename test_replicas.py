@@ -0,0 +1,101 @@
+import time
+import unittest
+from unittest import mock
+
+import app as musicapp
+from db_pool import ConnectionPool
+from ratelimit import DuplicateFilter, MemoryStorage
+from replicas import Replica, ReplicaRouter
+from test_app import SQLiteDB
+
+
+class FakeConn:
+    def ping(self, reconnect=True):
+        pass
+
+    def close(self):
+        pass
+
+
+def broken_connect():
+    raise ConnectionError("replica unreachable")
+
+
+class TestReplicaRouter(unittest.TestCase):
+    def test_round_robin_alternates(self):
+        router = ReplicaRouter([Replica(h, ConnectionPool(FakeConn)) for h in ("a", "b")])
+        picks = []
+        for _ in range(4):
+            pool, conn = router.checkout()
+            picks.append(next(r.host for r in router.replicas if r.pool is pool))
+            pool.release(conn)
+        self.assertEqual(picks, ["a", "b", "a", "b"])
+
+    def test_failed_replica_sits_out_cooldown_then_all_down_means_primary(self):
+        bad, good = Replica("bad", ConnectionPool(broken_connect)), Replica("good", ConnectionPool(FakeConn))
+        router = ReplicaRouter([bad, good], cooldown=30)
+        with mock.patch("builtins.print"):
+            for _ in range(3):
+                pool, conn = router.checkout()
+                self.assertIs(pool, good.pool)
+                pool.release(conn)
+            self.assertEqual(bad.failures, 1)
+            good.down_until = float("inf")
+            self.assertIsNone(router.checkout())
+        self.assertEqual(router.fallbacks, 1)
+
+    def test_full_replica_pool_falls_through_without_waiting(self):
+        busy = Replica("busy", ConnectionPool(FakeConn, max_size=1, timeout=5))
+        held = busy.pool.acquire()
+        self.addCleanup(busy.pool.release, held)
+        router = ReplicaRouter([busy])
+        start = time.monotonic()
+        self.assertIsNone(router.checkout())
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(busy.failures, 0)                 # busy, not marked down
+
+    def test_least_latency_prefers_the_fastest(self):
+        slow, fast = Replica("slow", ConnectionPool(FakeConn)), Replica("fast", ConnectionPool(FakeConn))
+        slow.latency, fast.latency = 0.050, 0.002
+        router = ReplicaRouter([slow, fast], strategy="least_latency")
+        self.assertEqual([r.host for r in router.candidates()], ["fast", "slow"])
+
+
+class TestReadRouting(unittest.TestCase):
+    """Primary and a lagging (empty) replica as two SQLite files."""
+
+    def setUp(self):
+        self.primary, self.replica = SQLiteDB(), SQLiteDB()
+        self.addCleanup(self.primary.close)
+        self.addCleanup(self.replica.close)
+        self.primary.execute("INSERT INTO feedback (name, email, message) VALUES ('Ann', 'ann@x.com', 'Hi')")
+        patches = {
+            "db_pool": self.primary.pool,
+            "read_router": ReplicaRouter([Replica("replica-1", self.replica.pool)]),
+            "feedback_dedupe": DuplicateFilter(),
+        }
+        for name, value in patches.items():
+            patcher = mock.patch.object(musicapp, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        musicapp.ip_limiter.storage = musicapp.email_limiter.storage = MemoryStorage()
+        musicapp.invalidate_feedback_cache()
+        self.client = musicapp.app.test_client()
+
+    def test_reads_go_to_replica_until_this_client_writes(self):
+        self.assertEqual(self.client.get("/feedbacks").get_json()["total"], 0)   # replica lags
+        r = self.client.post("/feedback", data={"name": "Bo", "email": "bo@x.com", "message": "Yo"})
+        self.assertIn(musicapp.READ_PRIMARY_COOKIE, r.headers["Set-Cookie"])
+        self.assertEqual(self.client.get("/feedbacks").get_json()["total"], 2)   # own write visible
+        other = musicapp.app.test_client()
+        self.assertEqual(other.get("/feedbacks", headers={"X-Read-Primary": "1"}).get_json()["total"], 2)
+
+    def test_unreachable_replica_falls_back_to_primary(self):
+        musicapp.read_router.replicas[0].pool = ConnectionPool(broken_connect)
+        with mock.patch("builtins.print"):
+            self.assertEqual(self.client.get("/feedbacks").get_json()["total"], 1)
+        self.assertFalse(musicapp.read_router.stats()["replicas"][0]["healthy"])
+
+
+if __name__ == "__main__":
+    unittest.main()
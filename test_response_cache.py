@@ -0,0 +1,157 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from response_cache import LocalBackend, MmapBackend, RedisBackend, ResponseCache
+
+
+class FakeRedis:
+    """The slice of redis-py the cache uses, in memory."""
+
+    def __init__(self):
+        self.data = {}
+
+    def _live(self, key):
+        value, expires = self.data.get(key, (None, None))
+        if expires is not None and expires <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def get(self, key):
+        return self._live(key)
+
+    def set(self, key, value, px=None, nx=False):
+        if nx and self._live(key) is not None:
+            return None
+        self.data[key] = (value, None if px is None else time.monotonic() + px / 1000)
+        return True
+
+    def incr(self, key):
+        value = int(self._live(key) or 0) + 1
+        self.data[key] = (str(value).encode(), None)
+        return value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+class DownRedis:
+    """A Redis that can't be reached."""
+
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise ConnectionError("Error 111 connecting to redis:6379. Connection refused.")
+        return fail
+
+
+class BackendContract:
+    def make_backend(self):
+        raise NotImplementedError
+
+    def test_compute_once_then_invalidate(self):
+        cache = ResponseCache(self.make_backend())
+        calls = []
+        compute = lambda: calls.append(1) or f"body{len(calls)}".encode()
+        self.assertEqual(cache.get_or_compute("feedbacks", 50, compute), b"body1")
+        self.assertEqual(cache.get_or_compute("feedbacks", 50, compute), b"body1")
+        cache.invalidate("feedbacks")
+        self.assertEqual(cache.get_or_compute("feedbacks", 50, compute), b"body2")
+        self.assertEqual(cache.stats["hit"], 1)
+
+    def test_value_computed_across_an_invalidation_is_never_served(self):
+        cache = ResponseCache(self.make_backend())
+        generation = cache.generation("feedbacks")
+        cache.invalidate("feedbacks")                 # an insert lands mid-query
+        cache.set("feedbacks", 50, b"stale", generation=generation)
+        self.assertIsNone(cache.get("feedbacks", 50))
+
+
+class TestLocalBackend(BackendContract, unittest.TestCase):
+    def make_backend(self):
+        return LocalBackend()
+
+    def test_concurrent_misses_run_one_computation(self):
+        cache = ResponseCache(self.make_backend())
+        release, calls = threading.Event(), []
+
+        def slow():
+            calls.append(1)
+            release.wait(2)
+            return b"rows"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("m", "k", slow)))
+                   for _ in range(8)]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join(2)
+        self.assertEqual(results, [b"rows"] * 8)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats["coalesced"], 7)
+
+
+class TestMmapBackend(BackendContract, unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "cache")
+
+    def make_backend(self):
+        return MmapBackend(self.path, slots=16, slot_bytes=1024)
+
+    def test_workers_share_entries_and_invalidations(self):
+        worker_a, worker_b = ResponseCache(self.make_backend()), ResponseCache(self.make_backend())
+        worker_a.get_or_compute("feedbacks", 50, lambda: b"page")
+        self.assertEqual(worker_b.get_or_compute("feedbacks", 50, lambda: b"recomputed"), b"page")
+        worker_b.invalidate("feedbacks")
+        self.assertIsNone(worker_a.get("feedbacks", 50))
+
+    def test_oversized_values_are_not_cached(self):
+        backend = self.make_backend()
+        backend.set("big", b"x" * 2000, ttl=10)
+        self.assertIsNone(backend.get("big"))
+
+    def test_waits_for_another_process_holding_the_compute_lock(self):
+        backend = self.make_backend()
+        cache = ResponseCache(backend, lock_ttl=2)
+        key = cache._key("m", cache.generation("m"), "k")
+        backend.add(f"lock:{key}", b"1", 2)           # another worker is computing
+        threading.Timer(0.05, backend.set, (key, b"theirs", 10)).start()
+        self.assertEqual(cache.get_or_compute("m", "k", lambda: b"mine"), b"theirs")
+
+    def test_stops_waiting_when_the_lock_is_released_without_a_value(self):
+        backend = self.make_backend()
+        cache = ResponseCache(backend, lock_ttl=5)
+        key = cache._key("m", cache.generation("m"), "k")
+        backend.add(f"lock:{key}", b"1", 5)           # another worker fails, or its page is too big to cache
+        threading.Timer(0.05, backend.delete, (f"lock:{key}",)).start()
+        started = time.monotonic()
+        self.assertEqual(cache.get_or_compute("m", "k", lambda: b"mine"), b"mine")
+        self.assertLess(time.monotonic() - started, 1)
+
+
+class TestRedisBackend(BackendContract, unittest.TestCase):
+    def make_backend(self):
+        return RedisBackend(FakeRedis())
+
+    def test_unreachable_redis_serves_uncached(self):
+        cache = ResponseCache(RedisBackend(DownRedis()))
+        with mock.patch("builtins.print") as log:
+            self.assertEqual(cache.get_or_compute("m", "k", lambda: b"fresh"), b"fresh")
+            self.assertEqual(cache.get_or_compute("m", "k", lambda: b"again"), b"again")
+            self.assertIsNone(cache.get("m", "k"))
+            cache.set("m", "k", b"x")
+            cache.invalidate("m")
+        self.assertEqual(log.call_count, 1)                 # warned once, not per call
+        self.assertGreater(cache.stats["error"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
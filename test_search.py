@@ -0,0 +1,97 @@
+import unittest
+from unittest import mock
+
+import catalog
+from search import MusicianIndex, tokenize
+
+CATALOG = [
+    {"name": "Miles Davis", "genre": "Jazz", "era": "1940s–90s", "instrument": "Trumpet",
+     "bio": "Pioneered cool jazz.", "known_for": ["Kind of Blue"]},
+    {"name": "Nina Simone", "genre": "Jazz", "era": "1950s–90s", "instrument": "Piano, Vocals",
+     "bio": "Civil rights activist and pianist.", "known_for": ["Feeling Good"]},
+    {"name": "Ludwig van Beethoven", "genre": "Classical", "era": "1800s", "instrument": "Piano, Violin",
+     "bio": "Composed the Ninth Symphony while deaf.", "known_for": ["Symphony No. 9"]},
+    {"name": "Björk", "genre": "Pop", "era": "1990s", "instrument": "Vocals",
+     "bio": "Icelandic singer who loves jazz harmony.", "known_for": ["Homogenic"]},
+]
+
+
+class TestMusicianIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = MusicianIndex(CATALOG)
+
+    def names(self, result):
+        return [m["name"] for m in result["results"]]
+
+    def test_tokenize_folds_accents(self):
+        self.assertEqual(tokenize("Björk, No. 9"), ["bjork", "no", "9"])
+
+    def test_name_and_genre_hits_outrank_bio_hits(self):
+        result = self.index.search(q="jazz")
+        self.assertEqual(result["total"], 3)
+        self.assertEqual(self.names(result)[-1], "Björk")
+
+    def test_prefix_and_all_tokens_required(self):
+        self.assertEqual(self.names(self.index.search(q="beeth")), ["Ludwig van Beethoven"])
+        self.assertEqual(self.names(self.index.search(q="piano civil")), ["Nina Simone"])
+        self.assertEqual(self.index.search(q="piano zzz")["total"], 0)
+
+    def test_facet_filters_and_counts(self):
+        result = self.index.search(instrument="piano")
+        self.assertEqual(set(self.names(result)), {"Nina Simone", "Ludwig van Beethoven"})
+        genres = {f["value"]: f["count"] for f in result["facets"]["genre"]}
+        self.assertEqual(genres, {"Jazz": 1, "Classical": 1})
+        # A facet ignores its own filter so other choices stay visible
+        instruments = {f["value"]: f["count"] for f in result["facets"]["instrument"]}
+        self.assertEqual(instruments["Vocals"], 2)
+
+    def test_pagination(self):
+        page = self.index.search(limit=2, offset=2)
+        self.assertEqual(page["total"], 4)
+        self.assertEqual(self.names(page), ["Ludwig van Beethoven", "Björk"])
+
+    def test_unfiltered_page_is_precomputed(self):
+        page = self.index.search(limit=3)
+        self.assertEqual(self.names(page), ["Miles Davis", "Nina Simone", "Ludwig van Beethoven"])
+        self.assertEqual(page["facets"]["genre"][0], {"value": "Jazz", "count": 2})
+        # Same counts the filtered path computes for an empty filter set
+        self.assertEqual(page["facets"], self.index.search(q="", genre="", limit=3)["facets"])
+
+
+class TestSearchIndexRebuild(unittest.TestCase):
+    def setUp(self):
+        import app as musicapp
+        self.app = musicapp
+        patcher = mock.patch.object(musicapp, "_search_index", MusicianIndex(CATALOG, version="v1"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_previous_version_answers_while_one_thread_rebuilds(self):
+        current = catalog.Catalog(CATALOG[:2], "v2")
+        with mock.patch.object(self.app.catalog_cache, "get", return_value=current), \
+                mock.patch.object(self.app.threading, "Thread") as thread:
+            with self.app._search_lock:                      # a rebuild is already running
+                self.assertEqual(self.app.get_search_index().version, "v1")
+            thread.assert_not_called()
+            self.assertEqual(self.app.get_search_index().version, "v1")
+            thread.assert_called_once()
+            self.app._build_search_index(current)
+            self.assertEqual(self.app.get_search_index().version, "v2")
+
+    def test_landing_page_is_not_cached_under_a_version_it_does_not_show(self):
+        newcomer = {"id": 99, "name": "Arooj Aftab", "genre": "Jazz", "era": "2010s", "instrument": "Vocals",
+                    "bio": "", "known_for": ["Vulture Prince"]}
+        current = catalog.Catalog([newcomer, *CATALOG], "v2")
+        page = lambda: self.app.app.test_client().get("/").data
+        with mock.patch.object(self.app, "_index_page", None), \
+                mock.patch.object(self.app.catalog_cache, "get", return_value=current):
+            with self.app._search_lock:                      # rebuild for v2 still running
+                self.assertNotIn(b"Arooj Aftab", page())
+                self.assertEqual(self.app._index_page[0], "v1")
+            self.app._build_search_index(current)
+            self.assertIn(b"Arooj Aftab", page())
+            self.assertEqual(self.app._index_page[0], "v2")
+
+
+if __name__ == "__main__":
+    unittest.main()
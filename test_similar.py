@@ -0,0 +1,109 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import app as musicapp
+import similar
+from similar import SimilarityIndex
+
+CATALOG = [
+    {"id": 1, "name": "Miles Davis", "genre": "Jazz", "instrument": "Trumpet",
+     "bio": "Pioneered cool jazz and jazz fusion.", "known_for": ["Kind of Blue"]},
+    {"id": 2, "name": "Chet Baker", "genre": "Jazz", "instrument": "Trumpet, Vocals",
+     "bio": "West coast cool jazz trumpeter.", "known_for": ["My Funny Valentine"]},
+    {"id": 3, "name": "Nina Simone", "genre": "Jazz", "instrument": "Piano, Vocals",
+     "bio": "Civil rights activist and pianist.", "known_for": ["Feeling Good"]},
+    {"id": 4, "name": "Ludwig van Beethoven", "genre": "Classical", "instrument": "Piano, Violin",
+     "bio": "Composed the Ninth Symphony while deaf.", "known_for": ["Symphony No. 9"]},
+    {"id": 5, "name": "Clara Schumann", "genre": "Classical", "instrument": "Piano",
+     "bio": "Romantic era pianist and composer.", "known_for": ["Piano Concerto"]},
+    {"id": 6, "name": "Johnny Cash", "genre": "Country", "instrument": "Vocals, Guitar",
+     "bio": "Country singer with a bass-baritone voice.", "known_for": ["Ring of Fire"]},
+]
+
+
+def names(matches):
+    return [m["name"] for m, _ in matches]
+
+
+@unittest.skipIf(similar.np is None, "numpy not installed")
+class TestSimilarityIndex(unittest.TestCase):
+    def test_neighbours_share_genre_and_instrument(self):
+        index = SimilarityIndex.build(CATALOG, k=3)
+        self.assertEqual(names(index.similar(1, 1)), ["Chet Baker"])
+        self.assertEqual(names(index.similar(4, 1)), ["Clara Schumann"])
+        self.assertNotIn("Miles Davis", names(index.similar(1)))
+        self.assertIsNone(index.similar(99))
+
+    def test_incremental_update_matches_a_brute_force_pass(self):
+        index = SimilarityIndex.build(CATALOG, k=3, version="v1")
+        changed = [dict(m) for m in CATALOG if m["id"] != 6]            # Cash leaves …
+        changed[4] = {**changed[4], "genre": "Jazz", "instrument": "Trumpet"}   # … Clara takes up jazz trumpet
+        changed.append({"id": 7, "name": "Bix Beiderbecke", "genre": "Jazz", "instrument": "Cornet",
+                        "bio": "Early jazz cornetist.", "known_for": ["Singin' the Blues"]})
+        updated = SimilarityIndex.build(changed, k=3, version="v2", previous=index, rebuild_ratio=1.0)
+
+        self.assertIs(updated.vocabulary, index.vocabulary)            # updated in place, not refitted
+        self.assertFalse(hasattr(updated, "matrix"))                   # only the neighbour table is kept
+        matrix = SimilarityIndex._vectorize([similar._term_weights(m) for m in changed], updated.vocabulary, updated.idf)
+        expected, expected_scores = similar._top_k(matrix, similar.np.arange(len(changed)), 3)
+        similar.np.testing.assert_allclose(updated.scores, expected_scores, rtol=1e-5)
+        self.assertIn("Clara Schumann", names(updated.similar(1)))
+
+    def test_too_much_drift_refits_the_vocabulary(self):
+        index = SimilarityIndex.build(CATALOG, k=3)
+        rebuilt = SimilarityIndex.build(CATALOG[:2], k=3, previous=index)
+        self.assertIsNot(rebuilt.vocabulary, index.vocabulary)
+        self.assertEqual(rebuilt.drift, 0)
+
+    def test_shared_file_is_built_once_and_mapped(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "similar.bin")
+        built = SimilarityIndex.build(CATALOG, k=3, version="v1")
+        with mock.patch.object(SimilarityIndex, "build", return_value=built) as build:
+            first = similar.shared(path, CATALOG, k=3, version="v1")
+            second = similar.shared(path, CATALOG, k=3, version="v1")        # another worker
+        self.assertEqual(build.call_count, 1)
+        self.assertFalse(second.neighbors.flags.owndata)                   # a view of the mapping
+        self.assertEqual(names(second.similar(1)), names(built.similar(1)))
+        self.assertEqual(names(first.similar(4)), names(built.similar(4)))
+        self.assertIsNone(SimilarityIndex.open(path, CATALOG, "v2", 3))     # stale version
+        self.assertIsNone(SimilarityIndex.open(path, CATALOG, "v1", 5))     # different k
+
+        changed = [dict(m) for m in CATALOG]
+        changed[4] = {**changed[4], "genre": "Jazz", "instrument": "Trumpet"}
+        updated = similar.shared(path, changed, k=3, version="v2", previous=second)
+        self.assertEqual(updated.vocabulary, built.vocabulary)              # updated from the mapped table
+        self.assertEqual(updated.drift, 1)
+        self.assertIn("Clara Schumann", names(updated.similar(1)))
+
+
+class TestSimilarRoute(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        patcher = mock.patch.object(musicapp, "SIMILAR_TABLE_PATH", os.path.join(directory, "similar.bin"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = musicapp.app.test_client()
+
+    @unittest.skipIf(similar.np is None, "numpy not installed")
+    def test_lists_neighbours_with_scores(self):
+        miles = next(m for m in musicapp.catalog_cache.get().musicians if m["name"] == "Miles Davis")
+        data = self.client.get(f"/api/musicians/{miles['id']}/similar?limit=3").get_json()
+        self.assertEqual(len(data["similar"]), 3)
+        self.assertEqual(data["similar"][0]["genre"], "Jazz")
+        self.assertTrue(all(s["score"] > 0 for s in data["similar"]))
+        self.assertEqual(self.client.get("/api/musicians/999999/similar").status_code, 404)
+        self.assertEqual(self.client.get(f"/api/musicians/{miles['id']}/similar?limit=x").status_code, 400)
+
+    @unittest.skipUnless(similar.np is None, "numpy installed")
+    def test_unavailable_without_numpy(self):
+        self.assertEqual(self.client.get("/api/musicians/1/similar").status_code, 503)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,8 @@
+# ─────────────────────────────────────────────────────────────────
+# WSGI ENTRY POINT
+# Production: gunicorn -c gunicorn.conf.py wsgi:application
+# (Local dev can still use `python app.py`.)
+# ─────────────────────────────────────────────────────────────────
+from app import app
+
+application = app